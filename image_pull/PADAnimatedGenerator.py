@@ -4,6 +4,11 @@ import tempfile
 
 from PIL import Image
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 parser = argparse.ArgumentParser(
     description="Generates static frames for animated images.", add_help=False)
@@ -29,6 +34,13 @@ IMAGE_SIZE_NO_PADDING = (640 - 70 * 2, 388 - 35 * 2)
 
 
 def blacken_image(image):
+    if np is not None:
+        pixels = np.array(image)
+        # Completely transparent pixels are set to black
+        pixels[pixels[:, :, 3] == 0] = 0
+        image.paste(Image.fromarray(pixels, image.mode))
+        return
+
     pixel_data = image.load()
     for y in range(image.size[1]):
         for x in range(image.size[0]):
@@ -0,0 +1,227 @@
+"""
+Shared downloader for the P&D asset scripts.
+
+Downloads run on a bounded thread pool, each thread keeping its own keep-alive session.
+Failed requests are retried with exponential backoff, and files are written to a temp file
+and renamed so an interrupted run never leaves a truncated file behind.
+
+If a manifest file is provided, the size, hash, version and validators (ETag/Last-Modified)
+of every downloaded URL are recorded there. On later runs a URL whose version hasn't
+changed and whose file is still intact is skipped, and anything else is requested
+conditionally so unchanged files aren't transferred again.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+
+# Status codes worth retrying; anything else that isn't a 200/304 fails immediately
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+class DownloadError(Exception):
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class DownloadManifest(object):
+    """JSON record of what was downloaded, keyed by URL."""
+
+    def __init__(self, manifest_file):
+        self.manifest_file = manifest_file
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                self.entries = json.load(f)
+
+    def get(self, url):
+        with self.lock:
+            return self.entries.get(url)
+
+    def put(self, url, entry):
+        with self.lock:
+            self.entries[url] = entry
+
+    def is_current(self, url, file_path, version):
+        """True if the file was fetched at this version and still matches the recorded size."""
+        entry = self.get(url)
+        if not entry or version is None or entry.get('version') != version:
+            return False
+        if entry['path'] != file_path or not os.path.exists(file_path):
+            return False
+        return os.path.getsize(file_path) == entry['size']
+
+    def save(self):
+        with self.lock:
+            entries = dict(self.entries)
+        manifest_dir = os.path.dirname(os.path.abspath(self.manifest_file))
+        os.makedirs(manifest_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=manifest_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_file, self.manifest_file)
+
+
+def asset_version(asset):
+    """Version marker for a padtools asset; the extlist sizes change when a file is replaced."""
+    sizes = (getattr(asset, 'compressed_size', None), getattr(asset, 'uncompressed_size', None))
+    if sizes == (None, None):
+        return None
+    return '{}:{}'.format(*sizes)
+
+
+class AssetDownloader(object):
+    def __init__(self, manifest_file=None, workers=8, retries=3, backoff=1.0, timeout=60,
+                 allow_redirects=True):
+        self.manifest = DownloadManifest(manifest_file) if manifest_file else None
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.allow_redirects = allow_redirects
+        self.local = threading.local()
+
+    def _session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _conditional_headers(self, url, file_path):
+        entry = self.manifest.get(url) if self.manifest else None
+        if not entry or entry['path'] != file_path or not os.path.exists(file_path):
+            return {}
+        if os.path.getsize(file_path) != entry['size']:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _fetch(self, url, file_path, headers):
+        """Makes one request, writing the body to file_path unless it was a 304.
+
+        Returns the response and (size, sha1) of the written file, or None if unchanged.
+        """
+        response = self._session().get(url, headers=headers, timeout=self.timeout,
+                                       allow_redirects=self.allow_redirects, stream=True)
+        with response:
+            if response.status_code == 304:
+                return response, None
+            if response.status_code != 200:
+                raise DownloadError('Bad status code {} for {}'.format(response.status_code, url),
+                                    retryable=response.status_code in RETRY_STATUS_CODES)
+
+            file_dir = os.path.dirname(os.path.abspath(file_path))
+            fd, tmp_file = tempfile.mkstemp(dir=file_dir)
+            try:
+                digest = hashlib.sha1()
+                size = 0
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(1 << 16):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+
+                expected_size = response.headers.get('Content-Length')
+                # Only meaningful when the body wasn't content-encoded
+                if expected_size and 'Content-Encoding' not in response.headers:
+                    if int(expected_size) != size:
+                        raise DownloadError('Truncated download of {}: got {} of {} bytes'.format(
+                            url, size, expected_size), retryable=True)
+                os.replace(tmp_file, file_path)
+            except BaseException:
+                os.remove(tmp_file)
+                raise
+        return response, (size, digest.hexdigest())
+
+    def is_stale(self, url, file_path, version):
+        """True if the file is missing, or the manifest recorded it at a different version.
+
+        Files with no manifest entry (e.g. fetched before the manifest existed) are not stale.
+        """
+        if not os.path.exists(file_path):
+            return True
+        entry = self.manifest.get(url) if self.manifest else None
+        return entry is not None and not self.manifest.is_current(url, file_path, version)
+
+    def download(self, url, file_path, version=None):
+        """Downloads url to file_path; returns True if the file was written, False if unchanged."""
+        if self.manifest and self.manifest.is_current(url, file_path, version):
+            return False
+
+        headers = self._conditional_headers(url, file_path)
+        attempt = 0
+        while True:
+            try:
+                response, written = self._fetch(url, file_path, headers)
+                break
+            except (requests.RequestException, DownloadError) as ex:
+                retryable = ex.retryable if isinstance(ex, DownloadError) else True
+                if not retryable or attempt >= self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+
+        if self.manifest and written:
+            size, sha1 = written
+            self.manifest.put(url, {
+                'path': file_path,
+                'size': size,
+                'sha1': sha1,
+                'version': version,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            })
+        elif self.manifest:
+            # Not modified; the validators from the original response still apply
+            entry = dict(self.manifest.get(url))
+            entry['version'] = version
+            self.manifest.put(url, entry)
+        return written is not None
+
+    def download_all(self, jobs):
+        """Runs (url, file_path) or (url, file_path, version) jobs on the worker pool.
+
+        Returns (updated, failed): the jobs whose file was written, and the jobs that failed.
+        Errors are printed as they happen. The manifest is saved once everything has finished.
+        """
+        print_lock = threading.Lock()
+
+        def log(*message):
+            with print_lock:
+                print(*message)
+
+        def run(job):
+            url, file_path = job[0], job[1]
+            version = job[2] if len(job) > 2 else None
+            try:
+                if self.download(url, file_path, version):
+                    log('downloaded', url, 'to', file_path)
+                    return True
+                log('unchanged', url)
+                return False
+            except Exception as ex:
+                log('failed to download', url, ex)
+                return None
+
+        jobs = list(jobs)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(run, jobs))
+        finally:
+            if self.manifest:
+                self.manifest.save()
+        updated = [job for job, result in zip(jobs, results) if result]
+        failed = [job for job, result in zip(jobs, results) if result is None]
+        return updated, failed
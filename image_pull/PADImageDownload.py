@@ -2,7 +2,8 @@ import argparse
 import os
 
 from PIL import Image
-import requests
+
+import PADAssetDownloader
 
 
 parser = argparse.ArgumentParser(
@@ -11,6 +12,8 @@ parser = argparse.ArgumentParser(
 outputGroup = parser.add_argument_group("Output")
 outputGroup.add_argument("--alt_input_dir", help="Optional path to input BC files")
 outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
+outputGroup.add_argument("--download_workers", type=int, default=8,
+                         help="Number of concurrent downloads")
 
 helpGroup = parser.add_argument_group("Help")
 helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
@@ -25,15 +28,6 @@ IMAGE_SIZE = (640, 388)
 IMAGE_SIZE_NO_PADDING = (640 - 70 * 2, 388 - 35 * 2)
 
 
-def download_file(url, file_path):
-    r = requests.get(url, allow_redirects=False)
-    if r.status_code != 200:
-        raise Exception('Bad status code:', r.status_code)
-
-    with open(file_path, "wb") as f:
-        f.write(r.content)
-
-
 def generate_resized_image(source_file, dest_file):
     # Resizes the image so it has the correct padding
     img = Image.open(source_file)
@@ -66,6 +60,11 @@ else:
     corrected_dir = os.path.join(output_dir, 'corrected_data')
 
 
+downloader = PADAssetDownloader.AssetDownloader(workers=args.download_workers,
+                                                allow_redirects=False)
+
+download_jobs = []
+resize_jobs = []
 for file_name in os.listdir(raw_dir):
     if 'mons' not in file_name or 'isanimated' in file_name:
         print('skipping', file_name)
@@ -79,15 +78,23 @@ for file_name in os.listdir(raw_dir):
         print('skipping', corrected_file_path)
         continue
 
-    print('processing', corrected_file_path)
     tmp_corrected_file_path = os.path.join(corrected_dir, 'tmp_' + final_image_name)
+    gungho_url = GUNGHO_TEMPLATE.format(pad_id)
+    download_jobs.append((gungho_url, tmp_corrected_file_path))
+    resize_jobs.append((gungho_url, tmp_corrected_file_path, corrected_file_path))
+
+print('downloading', len(download_jobs), 'files')
+downloader.download_all(download_jobs)
 
+for gungho_url, tmp_corrected_file_path, corrected_file_path in resize_jobs:
+    if not os.path.exists(tmp_corrected_file_path):
+        continue
+
+    print('processing', corrected_file_path)
     try:
-        gungho_url = GUNGHO_TEMPLATE.format(pad_id)
-        download_file(gungho_url, tmp_corrected_file_path)
         generate_resized_image(tmp_corrected_file_path, corrected_file_path)
     except Exception as e:
-        print('failed to download/resize', gungho_url, tmp_corrected_file_path, e)
+        print('failed to resize', gungho_url, tmp_corrected_file_path, e)
 
     if os.path.exists(tmp_corrected_file_path):
         os.remove(tmp_corrected_file_path)
@@ -1,56 +1,37 @@
 import argparse
+from collections import OrderedDict
+import hashlib
 import json
+from multiprocessing import Pool
 import os
+import tempfile
 
 from PIL import Image
 
 
-parser = argparse.ArgumentParser(description="Generates P&D portraits.", add_help=False)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generates P&D portraits.", add_help=False)
 
-inputGroup = parser.add_argument_group("Input")
-inputGroup.add_argument("--input_dir", help="Path to a folder where CARD files are")
-inputGroup.add_argument("--data_dir", required=True, help="Path to processed pad data files")
-inputGroup.add_argument("--server", help="Either na or jp")
-inputGroup.add_argument("--card_templates_file", help="Path to card templates png")
+    inputGroup = parser.add_argument_group("Input")
+    inputGroup.add_argument("--input_dir", help="Path to a folder where CARD files are")
+    inputGroup.add_argument("--data_dir", required=True, help="Path to processed pad data files")
+    inputGroup.add_argument("--server", help="Either na or jp")
+    inputGroup.add_argument("--card_templates_file", help="Path to card templates png")
+    inputGroup.add_argument("--workers", type=int, default=1,
+                            help="Number of processes; each one renders whole CARDS files")
+    inputGroup.add_argument("--state_file",
+                            help="If set, portraits whose inputs are unchanged since the run "
+                                 "that wrote this file are skipped")
 
+    outputGroup = parser.add_argument_group("Output")
+    outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
 
-outputGroup = parser.add_argument_group("Output")
-outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
+    helpGroup = parser.add_argument_group("Help")
+    helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
+    return parser.parse_args()
 
-helpGroup = parser.add_argument_group("Help")
-helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
-args = parser.parse_args()
 
-
-input_dir = args.input_dir
-server = args.server
-cards_file = os.path.join(args.data_dir, '{}_raw_cards.json'.format(server))
-card_templates_file = args.card_templates_file
-output_dir = args.output_dir
-
-templates_img = Image.open(card_templates_file)
-attr_imgs = {}
-sattr_imgs = {}
-for idx, t in enumerate(['r', 'b', 'g', 'l', 'd']):
-    pwidth = 100
-    pheight = 100
-    xstart = idx * (pwidth + 2)
-    ystart = 0
-
-    xend = xstart + pwidth
-    yend = ystart + pheight
-
-    attr_imgs[t] = templates_img.crop(box=(xstart, ystart, xend, yend))
-
-    ystart = ystart + pheight + 5
-    yend = ystart + pheight - 1 - 1  # Stops one short of full height
-
-    sattr_imgs[t] = templates_img.crop(box=(xstart, ystart, xend, yend))
-
-
-card_types = []
-with open(cards_file) as f:
-    card_data = json.load(f)
+ATTRS = ['r', 'b', 'g', 'l', 'd']
 
 attr_map = {
     -1: '',
@@ -61,19 +42,64 @@ attr_map = {
     4: 'd',
 }
 
-for card in card_data:
-    card_id = card['card_id']
 
-    # Prevent loading junk entries (fake enemies) and also limit to data which has
-    # been officially released.
-    if card_id < 9999 and not card['released_status']:
-        continue
+def load_frames(card_templates_file):
+    """Builds the border overlay for every attribute/subattribute combination.
+
+    The subattribute border only overlaps the attribute border where one of them is
+    transparent, so compositing them together up front gives the same pixels as
+    compositing each onto the portrait in turn.
+    """
+    templates_img = Image.open(card_templates_file)
+    attr_imgs = {}
+    sattr_imgs = {}
+    for idx, t in enumerate(ATTRS):
+        pwidth = 100
+        pheight = 100
+        xstart = idx * (pwidth + 2)
+        ystart = 0
+
+        xend = xstart + pwidth
+        yend = ystart + pheight
+
+        attr_imgs[t] = templates_img.crop(box=(xstart, ystart, xend, yend))
+
+        ystart = ystart + pheight + 5
+        yend = ystart + pheight - 1 - 1  # Stops one short of full height
+
+        sattr_imgs[t] = templates_img.crop(box=(xstart, ystart, xend, yend))
+
+    frames = {}
+    for attr, attr_img in attr_imgs.items():
+        frames[(attr, '')] = attr_img
+        for sattr, sattr_img in sattr_imgs.items():
+            # Adjust the subattribute image to the attribute image size
+            new_sattr_img = Image.new("RGBA", attr_img.size)
+            # There's a slight offset needed for the subattribute border
+            new_sattr_img.paste(sattr_img, (0, 1))
+            frames[(attr, sattr)] = Image.alpha_composite(attr_img, new_sattr_img)
+    return frames
+
+
+def load_card_types(cards_file):
+    card_types = []
+    with open(cards_file) as f:
+        card_data = json.load(f)
 
-    card_types.append([
-        card_id,
-        attr_map[card['attr_id']],
-        attr_map[card['sub_attr_id']]
-    ])
+    for card in card_data:
+        card_id = card['card_id']
+
+        # Prevent loading junk entries (fake enemies) and also limit to data which has
+        # been officially released.
+        if card_id < 9999 and not card['released_status']:
+            continue
+
+        card_types.append([
+            card_id,
+            attr_map[card['attr_id']],
+            attr_map[card['sub_attr_id']]
+        ])
+    return card_types
 
 
 def idx_for_id(card_id: int):
@@ -89,18 +115,6 @@ def idx_for_id(card_id: int):
     return (card_file, row, col)
 
 
-card_imgs = {}
-
-
-def get_portraits_img(file_name):
-    if file_name not in card_imgs:
-        file_path = os.path.join(input_dir, file_name)
-        if not os.path.exists(file_path):
-            return None
-        card_imgs[file_name] = Image.open(file_path)
-    return card_imgs[file_name]
-
-
 def get_card_img(portraits, row, col):
     card_dim = 96
     spacer = 6
@@ -116,42 +130,128 @@ def is_entirely_transparent(img):
     return img.getextrema() == ((0, 0), (0, 0), (0, 0), (0, 0))
 
 
-for card_id, card_attr, card_sattr in card_types:
-    card_file, row, col = idx_for_id(card_id)
-    portraits = get_portraits_img(card_file)
-    if portraits is None:
-        # This can happen since JP gets ahead of NA and it's not easy to
-        # confirm that a card is in JP but not NA
-        print('skipping {} because CARDS file does not exist: {}'.format(card_id, card_file))
-        continue
+def hash_file(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Frames for the current process, set up once per worker by init_worker
+_frames = None
 
+
+def init_worker(card_templates_file):
+    global _frames
+    _frames = load_frames(card_templates_file)
+
+
+def render_portrait(portraits, row, col, frame):
+    """Returns the finished portrait, or None if the cell is empty."""
     card_img = get_card_img(portraits, row, col)
     if is_entirely_transparent(card_img):
-        print('skipping {} because it is missing'.format(card_id))
-        continue
+        return None
 
     # Create a grey image to overlay the portrait on, filling in the background
     grey_img = Image.new("RGBA", card_img.size, color=(68, 68, 68, 255))
     card_img = Image.alpha_composite(grey_img, card_img)
 
-    attr_img = attr_imgs[card_attr]
-
     # Adjust the card image to fit the portrait
-    new_card_img = Image.new("RGBA", attr_img.size)
+    new_card_img = Image.new("RGBA", frame.size)
     new_card_img.paste(card_img, (2, 2))
 
-    # Merge the attribute border on to the portrait
-    merged_img = Image.alpha_composite(new_card_img, attr_img)
-
-    if card_sattr:
-        sattr_img = sattr_imgs[card_sattr]
-        # Adjust the subattribute image to the attribute image size
-        new_sattr_img = Image.new("RGBA", attr_img.size)
-        # There's a slight offset needed for the subattribute border
-        new_sattr_img.paste(sattr_img, (0, 1))
-
-        # Merge the subattribute on top
-        merged_img = Image.alpha_composite(merged_img, new_sattr_img)
-
-    # Save
-    merged_img.save(os.path.join(output_dir, '{}.png'.format(card_id)), 'PNG')
+    # Merge the attribute/subattribute borders on to the portrait
+    return Image.alpha_composite(new_card_img, frame)
+
+
+def render_card_file(card_file_path, cards, output_dir):
+    """Renders all the (card_id, row, col, attr, sattr) cards from one CARDS file.
+
+    Returns the ids of the cards that were written.
+    """
+    portraits = Image.open(card_file_path)
+    written = []
+    for card_id, row, col, card_attr, card_sattr in cards:
+        merged_img = render_portrait(portraits, row, col, _frames[(card_attr, card_sattr)])
+        if merged_img is None:
+            print('skipping {} because it is missing'.format(card_id))
+            continue
+
+        # Save
+        merged_img.save(os.path.join(output_dir, '{}.png'.format(card_id)), 'PNG')
+        written.append(card_id)
+    return written
+
+
+def load_state(state_file):
+    if state_file and os.path.exists(state_file):
+        with open(state_file) as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state_file, state):
+    state_dir = os.path.dirname(os.path.abspath(state_file))
+    fd, tmp_file = tempfile.mkstemp(dir=state_dir)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f, sort_keys=True)
+    os.replace(tmp_file, state_file)
+
+
+def main(args):
+    input_dir = args.input_dir
+    output_dir = args.output_dir
+    cards_file = os.path.join(args.data_dir, '{}_raw_cards.json'.format(args.server))
+
+    previous_state = load_state(args.state_file)
+    templates_hash = hash_file(args.card_templates_file)
+    file_hashes = {}
+    state = {}
+
+    # Group the cards by CARDS file, so each file is only loaded by one process
+    cards_by_file = OrderedDict()
+    for card_id, card_attr, card_sattr in load_card_types(cards_file):
+        card_file, row, col = idx_for_id(card_id)
+        card_file_path = os.path.join(input_dir, card_file)
+        if not os.path.exists(card_file_path):
+            # This can happen since JP gets ahead of NA and it's not easy to
+            # confirm that a card is in JP but not NA
+            print('skipping {} because CARDS file does not exist: {}'.format(card_id, card_file))
+            continue
+
+        if card_file not in file_hashes:
+            file_hashes[card_file] = hash_file(card_file_path)
+        inputs_hash = '{}:{}:{}:{}'.format(templates_hash, file_hashes[card_file],
+                                           card_attr, card_sattr)
+        output_file = os.path.join(output_dir, '{}.png'.format(card_id))
+        state[str(card_id)] = inputs_hash
+        if previous_state.get(str(card_id)) == inputs_hash and os.path.exists(output_file):
+            continue
+
+        cards_by_file.setdefault(card_file_path, []).append(
+            (card_id, row, col, card_attr, card_sattr))
+
+    print('rendering', sum(map(len, cards_by_file.values())), 'portraits from',
+          len(cards_by_file), 'CARDS files')
+    jobs = [(card_file_path, cards, output_dir) for card_file_path, cards in cards_by_file.items()]
+    if args.workers > 1:
+        with Pool(args.workers, initializer=init_worker,
+                  initargs=(args.card_templates_file,)) as pool:
+            results = pool.starmap(render_card_file, jobs)
+    else:
+        init_worker(args.card_templates_file)
+        results = [render_card_file(*job) for job in jobs]
+
+    if args.state_file:
+        # Empty cells weren't written; keep retrying them until the card shows up
+        written = set(card_id for card_ids in results for card_id in card_ids)
+        for cards in cards_by_file.values():
+            for card in cards:
+                if card[0] not in written:
+                    state.pop(str(card[0]))
+        save_state(args.state_file, state)
+
+
+if __name__ == '__main__':
+    main(parse_args())
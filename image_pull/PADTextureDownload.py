@@ -1,12 +1,13 @@
 import argparse
 import os
 import re
-import sys
-import urllib.request
 
 from PIL import Image
 import padtools
 
+import PADAssetDownloader
+import PADTextureTool
+
 
 # The 'padtools' package did not work properly out of the box on linux. I had to go in
 # and adjust the __init__.py files like so:
@@ -38,6 +39,8 @@ parser = argparse.ArgumentParser(description="Downloads and extracts P&D texture
 outputGroup = parser.add_argument_group("Output")
 outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
 outputGroup.add_argument("--server", help="One of [NA, JP]")
+outputGroup.add_argument("--download_workers", type=int, default=8,
+                         help="Number of concurrent downloads")
 
 helpGroup = parser.add_argument_group("Help")
 helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
@@ -54,14 +57,6 @@ elif args.server == 'JP':
 output_dir = args.output_dir
 
 
-def download_file(url, file_path):
-    response_object = urllib.request.urlopen(url)
-    with response_object as response:
-        file_data = response.read()
-        with open(file_path, "wb") as f:
-            f.write(file_data)
-
-
 print('Found', len(assets), 'assets total')
 
 
@@ -73,12 +68,21 @@ os.makedirs(raw_dir, exist_ok=True)
 os.makedirs(extract_dir, exist_ok=True)
 os.makedirs(corrected_dir, exist_ok=True)
 
-python_exec = sys.executable
-cur_file_path = os.path.dirname(os.path.realpath(__file__))
-tool_path = os.path.join(cur_file_path, 'PADTextureTool.py')
+# Card files are extracted untrimmed; trimming screws up portrait generation
+tool_settings = PADTextureTool.Settings()
+tool_settings.setOutputDirectory(extract_dir)
+
+card_tool_settings = PADTextureTool.Settings()
+card_tool_settings.setOutputDirectory(extract_dir)
+card_tool_settings.setTrimmingEnabled(False)
+
+downloader = PADAssetDownloader.AssetDownloader(
+    os.path.join(output_dir, 'download_manifest.json'), workers=args.download_workers)
 
 IMAGE_SIZE = (640, 388)
 
+download_jobs = []
+bc_files = []
 for asset in assets:
     asset_url = asset.url
     raw_file_name = os.path.basename(asset_url)
@@ -88,6 +92,7 @@ for asset in assets:
         continue
 
     raw_file_path = os.path.join(raw_dir, raw_file_name)
+    version = PADAssetDownloader.asset_version(asset)
 
     should_always_process = False
     if 'card' in raw_file_path.lower():
@@ -97,34 +102,45 @@ for asset in assets:
             # keep downloading/processing
             should_always_process = True   
 
-    if os.path.exists(raw_file_path) and not should_always_process:
+    if (os.path.exists(raw_file_path) and not should_always_process and
+            not downloader.is_stale(asset_url, raw_file_path, version)):
         # always redownload card files
         print('file exists', raw_file_path)
     else:
-        print('downloading', asset.url, 'to', raw_file_path)
-        download_file(asset_url, raw_file_path)
+        download_jobs.append((asset_url, raw_file_path, version))
+
+    bc_files.append((raw_file_name, raw_file_path, should_always_process))
+
+print('downloading', len(download_jobs), 'files')
+updated_jobs, _ = downloader.download_all(download_jobs)
+updated_files = set(job[1] for job in updated_jobs)
+
+for raw_file_name, raw_file_path, should_always_process in bc_files:
+    if not os.path.exists(raw_file_path):
+        print('Error, download failed:', raw_file_path)
+        continue
+    # Reprocess anything that changed on the server
+    raw_file_updated = raw_file_path in updated_files
 
     extract_file_name = getOutputFileName(raw_file_name).upper().replace('BC', 'PNG')
     extract_file_path = os.path.join(extract_dir, extract_file_name)
 
-    if os.path.exists(extract_file_path) and not should_always_process:
+    if os.path.exists(extract_file_path) and not should_always_process and not raw_file_updated:
         print('skipping existing file', extract_file_path)
     else:
-        # Disable trimming for the card files; screws up portrait generation
-        no_trim = '-nt' if 'card' in extract_file_name.lower() else ''
+        settings = card_tool_settings if 'card' in extract_file_name.lower() else tool_settings
 
         print('processing', raw_file_path, 'to', extract_dir, 'with name', extract_file_name)
-        os.system('{python} {tool} {no_trim} -o={output} {input}'.format(
-            python=python_exec,
-            tool=tool_path,
-            no_trim=no_trim,
-            input=raw_file_path,
-            output=extract_dir))
+        try:
+            PADTextureTool.processFile(raw_file_path, settings)
+        except Exception as ex:
+            print('failed to process', raw_file_path, ex)
+            continue
 
     corrected_file_name = extract_file_name.lower().strip('mons_').strip('0')
     corrected_file_path = os.path.join(corrected_dir, corrected_file_name)
 
-    if os.path.exists(corrected_file_path):
+    if os.path.exists(corrected_file_path) and not raw_file_updated:
         print('skipping existing file', corrected_file_path)
     elif not os.path.exists(extract_file_path):
         # Currently this is happening because of the new animated images, they
@@ -18,6 +18,7 @@ from __future__ import (absolute_import, division, print_function)
 import argparse
 import io
 import itertools
+import multiprocessing
 import os
 from pathlib import Path
 import re
@@ -27,6 +28,11 @@ import zlib
 
 import png
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 # This class represents a packed pixel encoding.
 class Encoding(object):
@@ -66,7 +72,9 @@ class Texture(object):
         self.packedPixels = None
 
         if self.encoding.strideInBits:
-            if self.encoding.strideInBits == 32:
+            if np is not None:
+                self.packedPixels = self.unpackBuffer()
+            elif self.encoding.strideInBits == 32:
                 self.packedPixels = struct.unpack(
                     ">{}L".format(self.width * self.height), self.buffer)
             elif self.encoding.strideInBits == 16:
@@ -86,6 +94,25 @@ class Texture(object):
                         self.packedPixels.append(
                             (byte >> (self.encoding.strideInBits * (pixelsPerByte - i - 1))) & bitMask)
 
+    # NumPy version of the struct/bit-twiddling unpacking above; returns an array of packed pixels.
+    def unpackBuffer(self):
+        pixelCount = self.width * self.height
+        strideInBits = self.encoding.strideInBits
+        if strideInBits == 32:
+            return np.frombuffer(self.buffer, dtype='>u4', count=pixelCount)
+        elif strideInBits == 16:
+            return np.frombuffer(self.buffer, dtype='<u2', count=pixelCount)
+        elif strideInBits == 8:
+            return np.frombuffer(self.buffer, dtype=np.uint8, count=pixelCount)
+        elif strideInBits < 8:
+            packedBytes = np.frombuffer(self.buffer, dtype=np.uint8,
+                                        count=(pixelCount * strideInBits) // 8)
+            bitMask = ((2 ** strideInBits) - 1)
+            pixelsPerByte = (8 // strideInBits)
+            # Most significant bits hold the first pixel
+            shifts = np.arange(pixelsPerByte - 1, -1, -1, dtype=np.uint8) * strideInBits
+            return ((packedBytes[:, np.newaxis] >> shifts) & bitMask).reshape(-1)
+
 # This class writes Texture objects to disk.
 
 
@@ -116,6 +143,18 @@ class TextureWriter(object):
     def trimTransparentEdges(cls, flatPixelArray, width, height, channels):
         channelsPerPixel = len(channels)
 
+        if np is not None:
+            pixels = np.asarray(flatPixelArray, dtype=np.uint8).reshape(height, width, channelsPerPixel)
+            alphaChannel = pixels[:, :, channelsPerPixel - 1]
+            opaqueRows = np.flatnonzero(alphaChannel.any(axis=1))
+            opaqueColumns = np.flatnonzero(alphaChannel.any(axis=0))
+            if opaqueRows.size == 0:
+                return 0, 0, []
+            top, bottom = opaqueRows[0], opaqueRows[-1]
+            left, right = opaqueColumns[0], opaqueColumns[-1]
+            trimmedPixels = pixels[top:bottom + 1, left:right + 1]
+            return int(right - left) + 1, int(bottom - top) + 1, trimmedPixels.reshape(-1)
+
         # Isolate the image's alpha channel
         alphaChannel = flatPixelArray[(channelsPerPixel - 1)::channelsPerPixel]
 
@@ -150,6 +189,11 @@ class TextureWriter(object):
     def blackenTransparentPixels(cls, flatPixelArray, width, height, channels):
         channelsPerPixel = len(channels)
 
+        if np is not None:
+            pixels = np.asarray(flatPixelArray, dtype=np.uint8).reshape(-1, channelsPerPixel)
+            pixels[pixels[:, channelsPerPixel - 1] == 0, :channelsPerPixel - 1] = 0
+            return pixels.reshape(-1)
+
         alphaChannelIndex = (channelsPerPixel - 1)
         for pixelIndex in range(width * height):
             channelIndex = pixelIndex * channelsPerPixel
@@ -170,10 +214,20 @@ class TextureWriter(object):
                             [targetBitDepth] for currentBitCount in bitsPerChannel]
         zippedChannelInfo = list(zip(bitShifts, bitMasks, conversionTables))
 
+        if np is not None:
+            packedPixels = np.asarray(texture.packedPixels)
+            unpackedChannels = [np.array(conversionTable, dtype=np.uint8)[(packedPixels & bitMask) >> bitShift]
+                                for bitShift, bitMask, conversionTable in zippedChannelInfo]
+            return np.stack(unpackedChannels, axis=1).reshape(-1)
+
         return [conversionTable[(packedPixelValue & bitMask) >> bitShift] for packedPixelValue in texture.packedPixels for bitShift, bitMask, conversionTable in zippedChannelInfo]
 
     @classmethod
-    def exportToImageFile(cls, texture, outputFilePath):
+    def exportToImageFile(cls, texture, outputFilePath, trimmingEnabled=None, blackeningEnabled=None):
+        # Per-call settings override the class-wide ones
+        trimmingEnabled = cls.trimmingEnabled if trimmingEnabled is None else trimmingEnabled
+        blackeningEnabled = cls.blackeningEnabled if blackeningEnabled is None else blackeningEnabled
+
         binaryFileData = bytes()
         if texture.encoding == RAW:
             binaryFileData = texture.buffer
@@ -184,13 +238,17 @@ class TextureWriter(object):
             flatPixelArray = cls.unpackPixels(texture, targetBitDepth)
 
             if texture.encoding.hasAlpha:
-                if cls.trimmingEnabled:
+                if trimmingEnabled:
                     width, height, flatPixelArray = cls.trimTransparentEdges(
                         flatPixelArray, width, height, texture.encoding.channels)
-                if cls.blackeningEnabled:
+                if blackeningEnabled:
                     flatPixelArray = cls.blackenTransparentPixels(
                         flatPixelArray, width, height, texture.encoding.channels)
 
+            if np is not None:
+                # The pixel passes above work on arrays; the png writing below wants a list
+                flatPixelArray = np.asarray(flatPixelArray, dtype=np.uint8).tolist()
+
             if any(flatPixelArray):
                 # Create an in-memory stream to which we can write the png data.
                 pngStream = io.BytesIO()
@@ -240,6 +298,68 @@ class TextureWriter(object):
             with open(outputFilePath, 'wb') as outputFileHandle:
                 outputFileHandle.write(binaryFileData)
 
+# These classes give random access to (possibly encrypted and compressed) binary data, using
+# absolute offsets into the decoded data.
+
+
+class BlobBuffer(object):
+    def __init__(self, data):
+        super(BlobBuffer, self).__init__()
+        self.data = data
+        self.base = 0
+
+    def readAll(self):
+        pass
+
+    def hasBytes(self, end):
+        return end <= self.base + len(self.data)
+
+    def discardBefore(self, offset):
+        pass
+
+    def __getitem__(self, key):
+        self.hasBytes(key.stop)
+        return bytes(self.data[key.start - self.base:key.stop - self.base])
+
+
+# Decrypts and inflates the blob a chunk at a time, only as far as the reader needs.
+class InflatingBlobBuffer(BlobBuffer):
+    chunkSize = 1 << 20
+
+    def __init__(self, binaryBlob, headerSize, decryptionKey):
+        super(InflatingBlobBuffer, self).__init__(bytearray())
+        self.source = memoryview(binaryBlob)[headerSize:]
+        self.sourceOffset = 0
+        # XOR every byte with the key, via a translation table instead of a per-byte loop
+        self.decryptionTable = bytes(byte ^ decryptionKey for byte in range(256))
+        self.decompress = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.finished = False
+
+    def inflateChunk(self):
+        if self.sourceOffset < len(self.source):
+            chunk = self.source[self.sourceOffset:self.sourceOffset + self.chunkSize]
+            self.sourceOffset += self.chunkSize
+            self.data += self.decompress.decompress(bytes(chunk).translate(self.decryptionTable))
+        else:
+            self.data += self.decompress.flush()
+            self.finished = True
+
+    def readAll(self):
+        while not self.finished:
+            self.inflateChunk()
+
+    def hasBytes(self, end):
+        while not self.finished and end > self.base + len(self.data):
+            self.inflateChunk()
+        return end <= self.base + len(self.data)
+
+    def discardBefore(self, offset):
+        discardCount = offset - self.base
+        if discardCount > self.chunkSize:
+            del self.data[:discardCount]
+            self.base = offset
+
+
 # This class translates binary data into Texture objects.
 
 
@@ -281,32 +401,32 @@ class TextureReader(object):
     encodings[0xD] = RAW
 
     @classmethod
-    def decryptAndDecompressBinaryBlob(cls, binaryBlob):
+    def openBinaryBlob(cls, binaryBlob):
         magicString, decryptionKey = struct.unpack_from(
             cls.encryptedTextureHeaderFormat, binaryBlob)
 
         if magicString != cls.encryptedTextureMagicString:
-            return binaryBlob
-
-        # XOR each byte using the decryption key
-        binaryBlob = bytearray(byte ^ decryptionKey for byte in bytearray(
-            binaryBlob[cls.encryptedTextureHeaderFormatSize:]))
+            return BlobBuffer(binaryBlob)
 
-        # Inflate
-        decompress = zlib.decompressobj(-zlib.MAX_WBITS)
-        binaryBlob = decompress.decompress(bytes(binaryBlob))
-        binaryBlob += decompress.flush()
+        return InflatingBlobBuffer(binaryBlob, cls.encryptedTextureHeaderFormatSize, decryptionKey)
 
-        return binaryBlob
+    @classmethod
+    def decryptAndDecompressBinaryBlob(cls, binaryBlob):
+        blobBuffer = cls.openBinaryBlob(binaryBlob)
+        blobBuffer.readAll()
+        return bytes(blobBuffer.data)
 
     @classmethod
     def extractTexturesFromBinaryBlob(cls, binaryBlob, outputDirectory):
-        binaryBlob = cls.decryptAndDecompressBinaryBlob(binaryBlob)
+        # Inflated lazily, so textures near the start are found before the whole blob is decoded
+        binaryBlob = cls.openBinaryBlob(binaryBlob)
 
         offset = 0x0
-        while (offset + cls.textureBlockHeaderSize) < len(binaryBlob):
-            magicString, numberOfTexturesInBlock = struct.unpack_from(
-                cls.textureBlockHeaderFormat, binaryBlob, offset)
+        while binaryBlob.hasBytes(offset + cls.textureBlockHeaderSize + 1):
+            # Nothing before the current offset is referenced again
+            binaryBlob.discardBefore(offset)
+            magicString, numberOfTexturesInBlock = struct.unpack(
+                cls.textureBlockHeaderFormat, binaryBlob[offset:offset + cls.textureBlockHeaderSize])
             if magicString == cls.unencryptedTextureMagicString:
                 textureBlockHeaderStart = offset
                 textureBlockHeaderEnd = textureBlockHeaderStart + cls.textureBlockHeaderSize
@@ -453,74 +573,104 @@ def getSettingsFromCommandLine():
     return settings
 
 
-def getOutputFileName(suggestedFileName):
-    outputFileName = suggestedFileName
-    # If the file is a "monster file" then pad the ID out with extra zeroes.
-    try:
-        prefix, id, suffix = getOutputFileName.monsterFileNameRegex.match(
-            suggestedFileName).groups()
-        outputFileName = prefix + id.zfill(5) + suffix
-    except AttributeError:
-        pass
-
-    # If we've already written a file with this name then add a number to the
-    # file name to prevent collisions.
-    try:
-        getOutputFileName.filesWritten[outputFileName] += 1
-        outputFileWithoutExtension, outputFileExtension = os.path.splitext(outputFileName)
-        outputFileName = "{} ({}){}".format(outputFileWithoutExtension,
-                                            getOutputFileName.filesWritten[outputFileName], outputFileExtension)
-    except KeyError:
-        getOutputFileName.filesWritten[outputFileName] = 0
+# This class picks output file names, avoiding collisions with files it has already named.
+class OutputFileNamer(object):
+    monsterFileNameRegex = re.compile(r'^(MONS_)(\d+)(\..+)$', flags=re.IGNORECASE)
 
-    return outputFileName
-
-
-getOutputFileName.filesWritten = dict()
-getOutputFileName.monsterFileNameRegex = re.compile(r'^(MONS_)(\d+)(\..+)$', flags=re.IGNORECASE)
+    def __init__(self):
+        super(OutputFileNamer, self).__init__()
+        self.filesWritten = dict()
+
+    def getOutputFileName(self, suggestedFileName):
+        outputFileName = suggestedFileName
+        # If the file is a "monster file" then pad the ID out with extra zeroes.
+        try:
+            prefix, id, suffix = self.monsterFileNameRegex.match(suggestedFileName).groups()
+            outputFileName = prefix + id.zfill(5) + suffix
+        except AttributeError:
+            pass
+
+        # If we've already written a file with this name then add a number to the
+        # file name to prevent collisions.
+        try:
+            self.filesWritten[outputFileName] += 1
+            outputFileWithoutExtension, outputFileExtension = os.path.splitext(outputFileName)
+            outputFileName = "{} ({}){}".format(outputFileWithoutExtension,
+                                                self.filesWritten[outputFileName], outputFileExtension)
+        except KeyError:
+            self.filesWritten[outputFileName] = 0
+
+        return outputFileName
+
+
+def processFile(inputFilePath, settings, outputFileNamer=None):
+    """Extracts the textures from one file, returning the paths that were written."""
+    outputFileNamer = outputFileNamer or OutputFileNamer()
+    outputDirectoryPath = (settings.outputDirectory or os.path.dirname(inputFilePath))
+
+    if zipfile.is_zipfile(inputFilePath):
+        with zipfile.ZipFile(inputFilePath, 'r') as apkFile:
+            fileContents = apkFile.read('assets/DATA001.BIN')
+
+    else:
+        with open(inputFilePath, 'rb') as binaryFile:
+            fileContents = binaryFile.read()
+
+    print("\nReading {}... ".format(inputFilePath))
+    textures = list(TextureReader.extractTexturesFromBinaryBlob(fileContents, inputFilePath))
+    print("{} texture{} found.\n".format(str(len(textures)) if any(
+        textures) else "No", "" if len(textures) == 1 else "s"))
+
+    if not settings.subtexturesEnabled:
+        if len(textures) > 1 or (textures and '000.PNG' in textures[0].name):
+            print("Skipping; subtextures not enabled")
+            inputFileWithoutExtension, _ = os.path.splitext(inputFilePath)
+            # Create a tag file that marks this as being animated. This is used elsewhere
+            # to determine if we need to extract a video.
+            Path(inputFileWithoutExtension + '.isanimated').touch()
+            return []
+
+    outputFilePaths = []
+    for texture in textures:
+        outputFileName = outputFileNamer.getOutputFileName(texture.name)
+
+        print("  Writing {} ({} x {})...".format(outputFileName, texture.width, texture.height))
+        if texture.encoding in [PVRTC2BPP, PVRTC4BPP]:
+            print("  Warning: {} is encoded using PVR texture compression. This format is not yet supported by the Puzzle & Dragons Texture Tool.".format(
+                outputFileName))
+        print("")
+        outputFilePath = os.path.join(outputDirectoryPath, outputFileName)
+        TextureWriter.exportToImageFile(texture, outputFilePath,
+                                        settings.trimmingEnabled, settings.blackeningEnabled)
+        outputFilePaths.append(outputFilePath)
+
+    return outputFilePaths
+
+
+def _processFileInWorker(inputFilePath, settings):
+    return processFile(inputFilePath, settings)
+
+
+def processFiles(inputFilePaths, settings, workers=1):
+    """Extracts the textures from many files in this process, or across a pool of workers.
+
+    Returns a list with the paths written for each input file, in order. Files containing
+    animated (multi-part) textures are skipped unless subtextures are enabled.
+
+    When run serially, output names are de-duplicated across all the files; each worker
+    process only de-duplicates names within a single file.
+    """
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            return pool.starmap(_processFileInWorker, [(path, settings) for path in inputFilePaths])
+
+    outputFileNamer = OutputFileNamer()
+    return [processFile(path, settings, outputFileNamer) for path in inputFilePaths]
 
 
 def main():
     settings = getSettingsFromCommandLine()
-
-    TextureWriter.enableTrimming(settings.trimmingEnabled)
-    TextureWriter.enableOptimization(settings.blackeningEnabled)
-
-    for inputFilePath in settings.inputFiles:
-        outputDirectoryPath = (settings.outputDirectory or os.path.dirname(inputFilePath))
-
-        if zipfile.is_zipfile(inputFilePath):
-            with zipfile.ZipFile(inputFilePath, 'r') as apkFile:
-                fileContents = apkFile.read('assets/DATA001.BIN')
-
-        else:
-            with open(inputFilePath, 'rb') as binaryFile:
-                fileContents = binaryFile.read()
-
-        print("\nReading {}... ".format(inputFilePath))
-        textures = list(TextureReader.extractTexturesFromBinaryBlob(fileContents, inputFilePath))
-        print("{} texture{} found.\n".format(str(len(textures)) if any(
-            textures) else "No", "" if len(textures) == 1 else "s"))
-
-        if not settings.subtexturesEnabled:
-            if len(textures) > 1 or '000.PNG' in textures[0].name:
-                print("Skipping; subtextures not enabled")
-                inputFileWithoutExtension, _ = os.path.splitext(inputFilePath)
-                # Create a tag file that marks this as being animated. This is used elsewhere
-                # to determine if we need to extract a video.
-                Path(inputFileWithoutExtension + '.isanimated').touch()
-                exit()
-
-        for texture in textures:
-            outputFileName = getOutputFileName(texture.name)
-
-            print("  Writing {} ({} x {})...".format(outputFileName, texture.width, texture.height))
-            if texture.encoding in [PVRTC2BPP, PVRTC4BPP]:
-                print("  Warning: {} is encoded using PVR texture compression. This format is not yet supported by the Puzzle & Dragons Texture Tool.".format(
-                    outputFileName))
-            print("")
-            outputFilePath = os.path.join(outputDirectoryPath, outputFileName)
-            TextureWriter.exportToImageFile(texture, outputFilePath)
+    processFiles(settings.inputFiles, settings)
 
 
 if __name__ == "__main__":
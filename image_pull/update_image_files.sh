@@ -30,6 +30,8 @@ python3 ${RUN_DIR}/PADPortraitsGenerator.py \
   --data_dir=${PROCESSED_DATA_DIR} \
   --card_templates_file=${RUN_DIR}/wide_cards.png \
   --server=na \
+  --workers=4 \
+  --state_file=${IMG_DIR}/na/portrait/generator_state.json \
   --output_dir=${IMG_DIR}/na/portrait/local_tmp
 
 python3 ${RUN_DIR}/PADPortraitsGenerator.py \
@@ -37,6 +39,8 @@ python3 ${RUN_DIR}/PADPortraitsGenerator.py \
   --data_dir=${PROCESSED_DATA_DIR} \
   --card_templates_file=${RUN_DIR}/wide_cards.png \
   --server=jp \
+  --workers=4 \
+  --state_file=${IMG_DIR}/jp/portrait/generator_state.json \
   --output_dir=${IMG_DIR}/jp/portrait/local
 
 python3 ${RUN_DIR}/PADPortraitsCombiner.py \
@@ -3,12 +3,15 @@ import json
 import os
 import re
 import sys
-import urllib.request
 
 from collections import defaultdict
 
 import padtools
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'image_pull'))
+import PADAssetDownloader
+import PADTextureTool
+
 parser = argparse.ArgumentParser(
     description="Downloads P&D Orb Styles (alternate skins)", add_help=False)
 
@@ -18,6 +21,8 @@ inputGroup.add_argument("--data_dir", required=True, help="Path to processed pad
 
 outputGroup = parser.add_argument_group("Output")
 outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
+outputGroup.add_argument("--download_workers", type=int, default=8,
+                         help="Number of concurrent downloads")
 
 helpGroup = parser.add_argument_group("Help")
 helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
@@ -34,13 +39,6 @@ elif args.server == 'jp':
 
 output_dir = args.output_dir
 
-def download_file(url, file_path):
-    response_object = urllib.request.urlopen(url)
-    with response_object as response:
-        file_data = response.read()
-        with open(file_path, "wb") as f:
-            f.write(file_data)
-
 print('Found', len(extras), 'extras total')
 
 raw_dir = os.path.join(output_dir, 'raw')
@@ -53,12 +51,17 @@ extract_dir = os.path.join(extract_dir, server)
 os.makedirs(raw_dir, exist_ok=True)
 os.makedirs(extract_dir, exist_ok=True)
 
-python_exec = sys.executable
-cur_file_path = os.path.dirname(os.path.realpath(__file__))
-tool_path = os.path.join(cur_file_path, '..', 'image_pull', 'PADTextureTool.py')
+tool_settings = PADTextureTool.Settings()
+tool_settings.setOutputDirectory(extract_dir)
 
 should_always_process = False
 
+downloader = PADAssetDownloader.AssetDownloader(
+    os.path.join(output_dir, 'download_manifest_{}.json'.format(server)),
+    workers=args.download_workers)
+
+download_jobs = []
+block_files = []
 for extra in extras:
     raw_file_name = extra.file_name
     if not raw_file_name.startswith('block') or not raw_file_name.endswith('.btex'):
@@ -66,22 +69,33 @@ for extra in extras:
         continue
 
     raw_file_path = os.path.join(raw_dir, raw_file_name)    
-    if os.path.exists(raw_file_path) and not should_always_process:
+    version = PADAssetDownloader.asset_version(extra)
+    if not downloader.is_stale(extra.url, raw_file_path, version) and not should_always_process:
         print('file exists', raw_file_path)
     else:
-        print('downloading', extra.url, 'to', raw_file_path)
-        download_file(extra.url, raw_file_path)
+        download_jobs.append((extra.url, raw_file_path, version))
+
+    block_files.append((raw_file_name, raw_file_path))
+
+print('downloading', len(download_jobs), 'files')
+updated_jobs, _ = downloader.download_all(download_jobs)
+updated_files = set(job[1] for job in updated_jobs)
+
+for raw_file_name, raw_file_path in block_files:
+    if not os.path.exists(raw_file_path):
+        print('Error, download failed:', raw_file_path)
+        continue
 
     extract_file_name = raw_file_name.upper().replace('BTEX', 'PNG')
     extract_file_path = os.path.join(extract_dir, extract_file_name)
 
-    if os.path.exists(extract_file_path) and not should_always_process:
+    if (os.path.exists(extract_file_path) and not should_always_process and
+            raw_file_path not in updated_files):
         print('skipping existing file', extract_file_path)
     else:
         print('processing', raw_file_path, 'to', extract_dir, 'with name', extract_file_name)
-        os.system('{python} {tool} -o={output} {input}'.format(
-            python=python_exec,
-            tool=tool_path,
-            input=raw_file_path,
-            output=extract_dir))
+        try:
+            PADTextureTool.processFile(raw_file_path, tool_settings)
+        except Exception as ex:
+            print('failed to process', raw_file_path, ex)
 print('done')
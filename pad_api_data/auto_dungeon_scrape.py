@@ -2,6 +2,7 @@ import argparse
 import json
 import subprocess
 
+import pad_dungeon_pull
 from pad_etl.data import database
 from pad_etl.processor import active_dungeons
 from pad_etl.storage import db_util
@@ -14,8 +15,12 @@ def parse_args():
     inputGroup = parser.add_argument_group("Input")
     inputGroup.add_argument("--server", required=True, help="na or jp")
     inputGroup.add_argument("--group", required=True, help="guerrilla group (red/blue/green)")
-    inputGroup.add_argument("--user_uuid", required=True, help="Account UUID")
-    inputGroup.add_argument("--user_intid", required=True, help="Account code")
+    inputGroup.add_argument("--user_uuid", required=True, action="append",
+                            help="Account UUID; repeat along with --user_intid for more accounts")
+    inputGroup.add_argument("--user_intid", required=True, action="append",
+                            help="Account code")
+    inputGroup.add_argument("--entry_interval", type=float, default=2,
+                            help="Minimum seconds between entries for each account, at least 1")
 
     outputGroup = parser.add_argument_group("Output")
     outputGroup.add_argument("--doprod", default=False,
@@ -31,6 +36,8 @@ def parse_args():
 
 
 args = parse_args()
+if len(args.user_uuid) != len(args.user_intid):
+    raise Exception('--user_uuid and --user_intid must be provided the same number of times')
 
 
 processed_dir = '/home/tactical0retreat/pad_data/processed'
@@ -72,28 +79,7 @@ db_wrapper = db_util.DbWrapper(dry_run)
 db_wrapper.connect(db_config)
 
 
-def do_dungeon_load(dungeon_id,
-                    floor_id):
-    if not args.doupdates:
-        print('skipping due to dry run')
-        return
-    dungeon_script = '/home/tactical0retreat/rpad-cogs-utils/pad_api_data/pad_dungeon_pull.py'
-    process_args = [
-        'python3',
-        dungeon_script,
-        '--db_config={}'.format(selected_db_config),
-        '--server={}'.format(args.server),
-        '--dungeon_id={}'.format(dungeon_id),
-        '--floor_id={}'.format(floor_id),
-        '--user_uuid={}'.format(args.user_uuid),
-        '--user_intid={}'.format(args.user_intid),
-        '--loop_count=20',
-    ]
-    p = subprocess.run(process_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    print(str(p.stdout))
-    print(str(p.stderr))
-
-
+floors_to_load = []
 for dungeon in current_dungeons:
     dungeon_id = int(dungeon['dungeon_id'])
     print(dungeon['clean_name'], dungeon_id)
@@ -107,8 +93,17 @@ for dungeon in current_dungeons:
         if wave_count >= 20:
             print('skipping')
         else:
-            print('entering', dungeon_id, floor_id)
-            do_dungeon_load(dungeon_id, floor_id)
+            floors_to_load.append((dungeon_id, floor_id))
+
+if not args.doupdates:
+    print('skipping', len(floors_to_load), 'floors due to dry run')
+else:
+    print('entering', len(floors_to_load), 'floors with', len(args.user_uuid), 'accounts')
+    accounts = list(zip(args.user_uuid, args.user_intid))
+    failed_floors = pad_dungeon_pull.scrape_floors(args.server, accounts, floors_to_load, 20,
+                                                   db_wrapper, args.entry_interval)
+    for dungeon_id, floor_id in failed_floors:
+        print('failed to load', dungeon_id, floor_id)
 
 
 def do_dungeon_fill(dungeon_seq):
@@ -0,0 +1,185 @@
+"""
+Checks that DbWrapper.bulk_insert_or_update writes the same rows as insert_or_update.
+
+Each scenario seeds two copies of a table in an in-memory SQLite stand-in for MySQL,
+runs the same items through the per-item path on one and the bulk path on the other,
+then compares the resulting rows and returned keys. Text columns use a collation that,
+like the MySQL defaults, ignores case and trailing spaces.
+"""
+
+import argparse
+import sqlite3
+import sys
+from types import SimpleNamespace
+
+from pad_etl.storage import db_util
+from pad_etl.storage import egg
+from pad_etl.storage import monster
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Checks the bulk upsert path.", add_help=False)
+    inputGroup = parser.add_argument_group("Input")
+    inputGroup.add_argument("--batch_size", type=int, default=500,
+                            help="Batch size passed to bulk_insert_or_update")
+
+    helpGroup = parser.add_argument_group("Help")
+    helpGroup.add_argument("-h", "--help", action="help",
+                           help="Displays this help message and exits.")
+    return parser.parse_args()
+
+
+def _mysql_ci(a, b):
+    a = a.rstrip(' ').lower()
+    b = b.rstrip(' ').lower()
+    return (a > b) - (a < b)
+
+
+class _SqliteCursor(object):
+    """Just enough of a pymysql DictCursor for DbWrapper."""
+
+    def __init__(self, connection):
+        self.cursor = connection.cursor()
+        self.rows = []
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cursor.close()
+
+    def execute(self, sql):
+        self.cursor.execute(sql)
+        if self.cursor.description:
+            cols = [d[0] for d in self.cursor.description]
+            self.rows = [dict(zip(cols, r)) for r in self.cursor.fetchall()]
+            num_rows = len(self.rows)
+        else:
+            self.rows = []
+            num_rows = self.cursor.rowcount
+        self.lastrowid = self.cursor.lastrowid
+        return num_rows
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class _SqliteConnection(object):
+    def __init__(self, schema, seed_rows):
+        self.connection = sqlite3.connect(':memory:', isolation_level=None)
+        self.connection.create_collation('mysql_ci', _mysql_ci)
+        self.connection.execute(schema)
+        for sql in seed_rows:
+            self.connection.execute(sql)
+
+    def cursor(self):
+        return _SqliteCursor(self.connection)
+
+    def dump(self, table, key_col):
+        cursor = self.connection.execute('SELECT * FROM {} ORDER BY {}'.format(table, key_col))
+        cols = [d[0] for d in cursor.description]
+        return [{c: v for c, v in zip(cols, r) if c != 'tstamp'} for r in cursor.fetchall()]
+
+
+def _price_item(monster_no, sell_mp):
+    return monster.MonsterPriceItem(SimpleNamespace(card_id=monster_no, sell_mp=sell_mp))
+
+
+SCENARIOS = [
+    {
+        'name': 'egg title names (alternate key, text columns)',
+        'table': 'egg_title_name_list',
+        'key': 'tetn_seq',
+        'schema': '''
+            CREATE TABLE egg_title_name_list (
+                tetn_seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                tet_seq INTEGER NOT NULL,
+                language TEXT COLLATE mysql_ci NOT NULL,
+                name TEXT COLLATE mysql_ci,
+                del_yn INTEGER NOT NULL,
+                tstamp INTEGER NOT NULL)''',
+        'seed': [
+            "INSERT INTO egg_title_name_list VALUES (1, 1, 'US', 'Godfest', 0, 0)",
+            "INSERT INTO egg_title_name_list VALUES (2, 1, 'JP ', 'Godfest JP', 0, 0)",
+            "INSERT INTO egg_title_name_list VALUES (3, 2, 'us', 'Rare', 0, 0)",
+        ],
+        'items': lambda: [
+            # Differs only in case; no update
+            egg.EggTitleName(language='US', name='GODFEST', tet_seq=1),
+            # Key differs by a trailing space; matches, no insert
+            egg.EggTitleName(language='JP', name='Godfest JP', tet_seq=1),
+            # Key differs by case; matches, name update
+            egg.EggTitleName(language='US', name='Rare Egg', tet_seq=2),
+            # New row, then the same key again in the same batch
+            egg.EggTitleName(language='KR', name='New', tet_seq=1),
+            egg.EggTitleName(language='kr', name='Newer', tet_seq=1),
+        ],
+    },
+    {
+        'name': 'monster prices (FK key, NOT NULL column not updated)',
+        'table': 'monster_price_list',
+        'key': 'monster_no',
+        'schema': '''
+            CREATE TABLE monster_price_list (
+                monster_no INTEGER PRIMARY KEY,
+                buy_price INTEGER NOT NULL,
+                sell_price INTEGER NOT NULL,
+                tstamp INTEGER NOT NULL)''',
+        'seed': [
+            'INSERT INTO monster_price_list VALUES (1, 100, 10, 0)',
+            'INSERT INTO monster_price_list VALUES (2, 200, 20, 0)',
+        ],
+        'items': lambda: [
+            _price_item(1, 10),
+            _price_item(2, 25),
+            _price_item(3, 30),
+        ],
+    },
+]
+
+
+def run_scenario(scenario, batch_size):
+    results = []
+    for bulk in [False, True]:
+        connection = _SqliteConnection(scenario['schema'], scenario['seed'])
+        db_wrapper = db_util.DbWrapper(False)
+        db_wrapper.connection = connection
+
+        items = scenario['items']()
+        if bulk:
+            keys = db_wrapper.bulk_insert_or_update(items, batch_size=batch_size)
+        else:
+            keys = [db_wrapper.insert_or_update(item) for item in items]
+        results.append((keys, connection.dump(scenario['table'], scenario['key'])))
+
+    (slow_keys, slow_rows), (bulk_keys, bulk_rows) = results
+    failures = []
+    if slow_keys != bulk_keys:
+        failures.append('keys differ:\n  single: {}\n  bulk:   {}'.format(slow_keys, bulk_keys))
+    if slow_rows != bulk_rows:
+        failures.append('rows differ:\n  single: {}\n  bulk:   {}'.format(slow_rows, bulk_rows))
+    return failures
+
+
+def run_test(args):
+    fail_count = 0
+    for scenario in SCENARIOS:
+        print('checking', scenario['name'])
+        failures = run_scenario(scenario, args.batch_size)
+        for failure in failures:
+            print(failure)
+        fail_count += len(failures)
+
+    if fail_count:
+        print('encountered', fail_count, 'errors')
+        sys.exit(1)
+    print('bulk and single upserts match')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    run_test(args)
@@ -26,6 +26,9 @@ def parse_args():
                             help="Path to a folder where the input data is")
     inputGroup.add_argument("--es_input_dir", required=True,
                             help="Path to a folder where the enemy skills data is")
+    inputGroup.add_argument("--es_summary_index",
+                            help="Index of the parsed enemy skills data; used if present, "
+                                 "and rewritten after the run")
 
 
     outputGroup = parser.add_argument_group("Output")
@@ -40,6 +43,8 @@ def parse_args():
 
 def run_test(args):
     esd.set_data_dir(args.es_input_dir)
+    if args.es_summary_index and os.path.exists(args.es_summary_index):
+        esd.load_summary_index(args.es_summary_index)
 
     raw_input_dir = os.path.join(args.input_dir, 'raw')
     processed_input_dir = os.path.join(args.input_dir, 'processed')
@@ -100,6 +105,9 @@ def run_test(args):
             with open(os.path.join(file_output_dir, file_name), encoding='utf-8', mode='w') as f:
                 f.write(flatten_data(wave_data, dungeon, db))
 
+    if args.es_summary_index:
+        esd.save_summary_index(args.es_summary_index)
+
 
 def flatten_data(wave_data, dungeon_data, db, limit_floor_id=None):
     output = ''
@@ -1,9 +1,12 @@
 import argparse
 import csv
+from collections import defaultdict
+import gzip
 import json
 import os
 import tempfile
-import zipfile
+
+import pymysql
 
 from pad_etl.storage import db_util
 
@@ -16,6 +19,14 @@ def parse_args():
     inputGroup.add_argument("--db_config", required=True, help="JSON database info")
     inputGroup.add_argument("--processed_dir", required=True,
                             help="Path to a folder where the input data is")
+    inputGroup.add_argument("--chunk_size", type=int, default=100000,
+                            help="Number of wave rows written per part file")
+
+    outputGroup = parser.add_argument_group("Output")
+    outputGroup.add_argument("--wave_dump_dir",
+                             help="If set, exports the full wave_data table here as gzipped csv")
+    outputGroup.add_argument("--partition_by", default='dungeon', choices=['dungeon', 'date'],
+                             help="Splits the wave_data export into a folder per dungeon or day")
 
     helpGroup = parser.add_argument_group("Help")
     helpGroup.add_argument("-h", "--help", action="help",
@@ -35,6 +46,102 @@ def dump_cursor_to_csv(cursor, f):
         writer.writerow([row[c] for c in column_names])
 
 
+class WaveDumpState(object):
+    """Records the last wave id that was fully exported, so the dump can resume from there."""
+
+    def __init__(self, dump_dir, partition_by):
+        self.state_file = os.path.join(dump_dir, 'export_state.json')
+        self.partition_by = partition_by
+        self.last_wave_id = 0
+
+        if os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                state = json.load(f)
+            if state['partition_by'] != partition_by:
+                raise ValueError('existing dump in {} is partitioned by {}'.format(
+                    dump_dir, state['partition_by']))
+            self.last_wave_id = state['last_wave_id']
+
+    def save(self, last_wave_id):
+        self.last_wave_id = last_wave_id
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(self.state_file))
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'partition_by': self.partition_by, 'last_wave_id': last_wave_id}, f)
+        os.replace(tmp_file, self.state_file)
+
+
+def wave_partition(row, partition_by):
+    if partition_by == 'dungeon':
+        return 'dungeon_id={}'.format(row['dungeon_id'])
+    pull_time = row['pull_time']
+    return 'date={}'.format(pull_time.strftime('%Y-%m-%d') if pull_time else 'unknown')
+
+
+def part_file_start_id(file_name):
+    # part-<first wave id>.csv.gz
+    return int(file_name[len('part-'):-len('.csv.gz')])
+
+
+def remove_unfinished_parts(dump_dir, last_wave_id):
+    """Deletes part files from a chunk that was interrupted before the state was saved."""
+    for partition in os.listdir(dump_dir):
+        partition_dir = os.path.join(dump_dir, partition)
+        if not os.path.isdir(partition_dir):
+            continue
+        for file_name in os.listdir(partition_dir):
+            if file_name.startswith('part-') and part_file_start_id(file_name) > last_wave_id:
+                os.remove(os.path.join(partition_dir, file_name))
+
+
+def write_wave_chunk(dump_dir, column_names, rows, partition_by):
+    partitioned_rows = defaultdict(list)
+    for row in rows:
+        partitioned_rows[wave_partition(row, partition_by)].append(row)
+
+    part_name = 'part-{}.csv.gz'.format(rows[0]['id'])
+    for partition, partition_rows in partitioned_rows.items():
+        partition_dir = os.path.join(dump_dir, partition)
+        os.makedirs(partition_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=partition_dir)
+        os.close(fd)
+        with gzip.open(tmp_file, mode='wt', newline='') as f:
+            writer = csv.writer(f,
+                                delimiter=',',
+                                quotechar='"',
+                                quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(column_names)
+            for row in partition_rows:
+                writer.writerow([row[c] for c in column_names])
+        os.replace(tmp_file, os.path.join(partition_dir, part_name))
+
+
+def dump_wave_data(connection, dump_dir, partition_by, chunk_size):
+    """Streams wave_data in id order, writing a part file per chunk into each partition.
+
+    Uses an unbuffered cursor so only one chunk is held in memory; the regular DictCursor
+    loads the entire table client side.
+    """
+    os.makedirs(dump_dir, exist_ok=True)
+    state = WaveDumpState(dump_dir, partition_by)
+    remove_unfinished_parts(dump_dir, state.last_wave_id)
+    print('writing full wave data to', dump_dir, 'after wave id', state.last_wave_id)
+
+    row_count = 0
+    with connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+        cursor.execute('SELECT * FROM wave_data WHERE id > %s ORDER BY id', (state.last_wave_id,))
+        column_names = [i[0] for i in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            write_wave_chunk(dump_dir, column_names, rows, partition_by)
+            state.save(rows[-1]['id'])
+            row_count += len(rows)
+            print('exported', row_count, 'rows, through wave id', state.last_wave_id)
+
+    print('finished full wave data dump')
+
+
 args = parse_args()
 
 with open(args.db_config) as f:
@@ -44,24 +151,8 @@ db_wrapper = db_util.DbWrapper(dry_run=False)
 db_wrapper.connect(db_config)
 
 
-# Full wave data dump disabled for now.
-# It has some non-obvious bug that is sucking up all the memory on the box.
-# SELECT_QUERY = 'SELECT * FROM wave_data'
-# with db_wrapper.connection.cursor() as cursor:
-#     output_file = os.path.join(args.processed_dir, 'wave_data.zip')
-#     print('writing full wave data to', output_file)
-#
-#     with tempfile.NamedTemporaryFile(mode='w', delete=False) as tmp_file:
-#         cursor.execute(SELECT_QUERY)
-#         dump_cursor_to_csv(cursor, tmp_file)
-#         raw_file = tmp_file.name
-#
-#     print('finished dumping to', raw_file)
-#
-#     with zipfile.ZipFile(output_file, mode='w', compression=zipfile.ZIP_DEFLATED) as wave_zip:
-#         wave_zip.write(raw_file, arcname='wave_data.csv')
-#
-#     os.remove(raw_file)
+if args.wave_dump_dir:
+    dump_wave_data(db_wrapper.connection, args.wave_dump_dir, args.partition_by, args.chunk_size)
 
 
 SELECT_QUERY = """
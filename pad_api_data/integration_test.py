@@ -15,6 +15,7 @@ import pathlib
 
 import shutil
 
+from pad_etl.common import pad_util
 from pad_etl.data import database
 from pad_etl.processor import skill_info
 
@@ -92,9 +93,9 @@ def run_test(args):
                 new_row = data[i]
 
                 gold_str = json.dumps(gold_row, indent=4, sort_keys=True,
-                                      default=lambda x: x.__dict__)
+                                      default=pad_util.json_default)
                 new_str = json.dumps(new_row, indent=4, sort_keys=True,
-                                     default=lambda x: x.__dict__)
+                                     default=pad_util.json_default)
 
                 if gold_str != new_str:
                     failures.append([gold_str, new_str])
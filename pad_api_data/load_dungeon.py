@@ -23,6 +23,8 @@ def parse_args():
     inputGroup.add_argument("--db_config", required=True, help="JSON database info")
     inputGroup.add_argument("--raw_input_dir", required=True,
                             help="Path to a folder where the input data is")
+    inputGroup.add_argument("--snapshot_dir", required=False,
+                            help="Caches parsed databases here, reused if the input is unchanged")
 
     outputGroup = parser.add_argument_group("Output")
     outputGroup.add_argument("--doupdates", default=False,
@@ -63,10 +65,10 @@ dungeon = loader.load_dungeon(dungeon_seq)
 
 
 jp_database = database.Database('jp', args.raw_input_dir)
-jp_database.load_database()
+jp_database.load_database(snapshot_dir=args.snapshot_dir)
 
 na_database = database.Database('na', args.raw_input_dir)
-na_database.load_database()
+na_database.load_database(snapshot_dir=args.snapshot_dir)
 
 jp_data = jp_database.dungeons
 na_data = na_database.dungeons
@@ -107,6 +109,8 @@ na_cards = na_database.raw_cards
 # TODO need a cross server enemies list
 na_enemies = na_database.enemies
 
+monster_name_matcher = dungeon_processor.make_monster_name_matcher(cards, na_cards)
+
 waves = db_wrapper.load_multiple_objects(WaveItem, pad_dungeon_id)
 print('loaded', len(waves), 'waves')
 dungeon_processor.populate_dungeon(dungeon, jp_dungeon, na_dungeon,
@@ -114,7 +118,8 @@ dungeon_processor.populate_dungeon(dungeon, jp_dungeon, na_dungeon,
                                    cards=cards,
                                    na_cards=na_cards,
                                    floor_text=floor_text,
-                                   na_enemies=na_enemies)
+                                   na_enemies=na_enemies,
+                                   monster_name_matcher=monster_name_matcher)
 
 # print(dungeon)
 loader.save_dungeon(dungeon)
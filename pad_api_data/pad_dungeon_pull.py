@@ -1,15 +1,25 @@
 """
+Pulls dungeon spawns by repeatedly entering floors, saving the waves to wave_data.
+
+Can be run for a single floor, or used as a library (see scrape_floors) to work through a
+list of floors with several accounts at once.
 """
 import argparse
 import json
 import logging
+import queue
+import threading
 import time
 
 from pad_etl.api import pad_api
 
 from pad_etl.storage.db_util import DbWrapper
+from pad_etl.storage.sql_item import generate_bulk_insert_sql
 from pad_etl.storage.wave import WaveItem
 
+# entry_id is the entry time in whole seconds, so entries have to be at least this far apart
+MIN_ENTRY_INTERVAL = 1
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Extracts PAD dungeon data.", add_help=False)
@@ -22,6 +32,8 @@ def parse_args():
     inputGroup.add_argument("--dungeon_id", required=True, help="Dungeon ID")
     inputGroup.add_argument("--floor_id", required=True, help="Floor ID")
     inputGroup.add_argument("--loop_count", type=int, default=100, help="Number of entry attempts")
+    inputGroup.add_argument("--entry_interval", type=float, default=2,
+                            help="Minimum seconds between entries for an account, at least 1")
 
     outputGroup = parser.add_argument_group("Output")
     outputGroup.add_argument("--db_config", required=True, help="JSON database info")
@@ -35,33 +47,153 @@ def parse_args():
     return parser.parse_args()
 
 
-def pull_data(args):
-    if args.logsql:
-        logging.getLogger('database').setLevel(logging.DEBUG)
-
-    server = args.server.upper()
-    endpoint = None
+def server_endpoint(server: str):
+    server = server.upper()
     if server == 'NA':
-        endpoint = pad_api.ServerEndpoint.NA
+        return pad_api.ServerEndpoint.NA
     elif server == 'JP':
-        endpoint = pad_api.ServerEndpoint.JA
+        return pad_api.ServerEndpoint.JA
     else:
-        raise Exception('unexpected server:' + args.server)
+        raise Exception('unexpected server:' + server)
 
-    api_client = pad_api.PadApiClient(endpoint, args.user_uuid, args.user_intid)
 
-    print('login')
+def connect_account(server: str, user_uuid: str, user_intid: str):
+    """Returns a logged in PadApiClient with its player data loaded."""
+    api_client = pad_api.PadApiClient(server_endpoint(server), user_uuid, user_intid)
+
+    print('login', user_intid)
     api_client.login()
 
-    print('load_player_data')
+    print('load_player_data', user_intid)
     api_client.load_player_data()
+    return api_client
+
+
+def check_entry_interval(entry_interval: float):
+    if entry_interval < MIN_ENTRY_INTERVAL:
+        raise ValueError('entry_interval must be at least {}s, got {}'.format(
+            MIN_ENTRY_INTERVAL, entry_interval))
+
+
+class RateLimiter(object):
+    """Spaces out calls so that they start at least min_interval seconds apart."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.next_time = 0
+
+    def wait(self):
+        now = time.time()
+        if now < self.next_time:
+            time.sleep(self.next_time - now)
+            now = self.next_time
+        self.next_time = now + self.min_interval
+
+
+class WaveWriter(object):
+    """Inserts each dungeon entry's waves as one multi-row insert.
+
+    The connection is shared by all the scraping threads, so writes are serialized.
+    """
 
+    def __init__(self, db_wrapper: DbWrapper):
+        self.db_wrapper = db_wrapper
+        self.lock = threading.Lock()
+
+    def insert_waves(self, wave_items):
+        if not wave_items:
+            return
+        cols = list(wave_items[0]._insert_columns())
+        sql = generate_bulk_insert_sql(WaveItem.TABLE, cols, wave_items)
+        with self.lock:
+            self.db_wrapper.insert_item(sql)
+
+
+def enter_floor(api_client, server: str, dungeon_id, floor_id, pull_id: int, friend_card):
+    """Enters the floor once, returning the spawned waves as WaveItems."""
+    entry_id = int(time.time())
+    entry_json = api_client.enter_dungeon(dungeon_id, floor_id, self_card=friend_card)
+    wave_response = pad_api.extract_wave_response_from_entry(entry_json)
+    leaders = entry_json['entry_leads']
+
+    wave_items = []
+    for stage_idx, floor in enumerate(wave_response.floors):
+        for monster_idx, monster in enumerate(floor.monsters):
+            wave_items.append(WaveItem(pull_id=pull_id, entry_id=entry_id, server=server, dungeon_id=dungeon_id,
+                                       floor_id=floor_id, stage=stage_idx, slot=monster_idx, monster=monster,
+                                       leader_id=leaders[0], friend_id=leaders[1]))
+    return wave_items
+
+
+def pull_floor(api_client, wave_writer: WaveWriter, rate_limiter: RateLimiter,
+               server: str, dungeon_id, floor_id, loop_count: int):
     friend_card = api_client.get_any_card_except_in_cur_deck()
-    dungeon_id = args.dungeon_id
-    floor_id = args.floor_id
-    loop_count = args.loop_count
     pull_id = int(time.time())
 
+    print('entering dungeon', dungeon_id, 'floor', floor_id, loop_count, 'times')
+    for entry_idx in range(loop_count):
+        rate_limiter.wait()
+        print('entering', dungeon_id, floor_id, entry_idx)
+        wave_writer.insert_waves(enter_floor(api_client, server, dungeon_id, floor_id,
+                                             pull_id, friend_card))
+
+
+def scrape_floors(server: str, accounts, floors, loop_count: int,
+                  db_wrapper: DbWrapper, entry_interval: float=2):
+    """Pulls each (dungeon_id, floor_id) in floors, loop_count times.
+
+    accounts is a list of (user_uuid, user_intid). Each account gets a thread that takes
+    floors off a shared queue, so floors are scraped concurrently while every account
+    individually stays under the entry rate limit. Returns the floors that failed.
+    """
+    check_entry_interval(entry_interval)
+    server = server.upper()
+    wave_writer = WaveWriter(db_wrapper)
+    floor_queue = queue.Queue()
+    for floor in floors:
+        floor_queue.put(floor)
+
+    failed_floors = []
+
+    def account_worker(user_uuid, user_intid):
+        try:
+            api_client = connect_account(server, user_uuid, user_intid)
+        except Exception as ex:
+            print('failed to log in', user_intid, ex)
+            return
+        rate_limiter = RateLimiter(entry_interval)
+        while True:
+            try:
+                dungeon_id, floor_id = floor_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                pull_floor(api_client, wave_writer, rate_limiter,
+                           server, dungeon_id, floor_id, loop_count)
+            except Exception as ex:
+                print('failed to pull', dungeon_id, floor_id, ex)
+                failed_floors.append((dungeon_id, floor_id))
+
+    threads = [threading.Thread(target=account_worker, args=account) for account in accounts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Anything left over if every account failed to log in
+    while not floor_queue.empty():
+        failed_floors.append(floor_queue.get_nowait())
+    return failed_floors
+
+
+def pull_data(args):
+    check_entry_interval(args.entry_interval)
+    if args.logsql:
+        logging.getLogger('database').setLevel(logging.DEBUG)
+
+    server = args.server.upper()
+    api_client = connect_account(server, args.user_uuid, args.user_intid)
+
     print('Connecting to database')
     with open(args.db_config) as f:
         db_config = json.load(f)
@@ -70,22 +202,8 @@ def pull_data(args):
     db_wrapper = DbWrapper(dry_run)
     db_wrapper.connect(db_config)
 
-    print('entering dungeon', dungeon_id, 'floor', floor_id, loop_count, 'times')
-    for entry_id in range(loop_count):
-        print('entering', entry_id)
-        entry_id = int(time.time())
-        entry_json = api_client.enter_dungeon(dungeon_id, floor_id, self_card=friend_card)
-        wave_response = pad_api.extract_wave_response_from_entry(entry_json)
-        leaders = entry_json['entry_leads']
-
-        for stage_idx, floor in enumerate(wave_response.floors):
-            for monster_idx, monster in enumerate(floor.monsters):
-                wave_item = WaveItem(pull_id=pull_id, entry_id=entry_id, server=server, dungeon_id=dungeon_id,
-                                     floor_id=floor_id, stage=stage_idx, slot=monster_idx, monster=monster,
-                                     leader_id=leaders[0], friend_id=leaders[1])
-                db_wrapper.insert_item(wave_item.insert_sql())
-
-        time.sleep(2)
+    pull_floor(api_client, WaveWriter(db_wrapper), RateLimiter(args.entry_interval),
+               server, args.dungeon_id, args.floor_id, args.loop_count)
 
 
 if __name__ == '__main__':
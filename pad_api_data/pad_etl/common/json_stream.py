@@ -0,0 +1,94 @@
+"""
+Incremental reader for large JSON files.
+
+The PAD download files are a small object wrapping one huge array (e.g. 'card'). This
+reads the file in chunks and hands back the array elements one at a time, so the whole
+array never has to be held in memory at once.
+"""
+import json
+import re
+from typing import Any, Iterator, TextIO, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class _ChunkReader(object):
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if chunk:
+            self.buf = self.buf[self.pos:] + chunk
+            self.pos = 0
+        else:
+            self.eof = True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                raise ValueError('Unexpected end of JSON input')
+            self._fill()
+
+    def expect(self, c: str):
+        if self.peek() != c:
+            raise ValueError('Expected {!r} at offset {} of the JSON buffer'.format(c, self.pos))
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+                # A number cut off by the end of the buffer still decodes (e.g. '2.' as 2),
+                # so make sure it's followed by something that can't continue it
+                if self.eof or (end < len(self.buf) and self.buf[end] not in _NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_items(f: TextIO, stream_key: str, chunk_size: int=1 << 16) -> Iterator[Tuple[str, Any]]:
+    """Yields the (key, value) pairs of the top-level JSON object in f.
+
+    The value of stream_key must be an array; instead of the array itself, a
+    (stream_key, element) pair is yielded for each of its elements.
+    """
+    reader = _ChunkReader(f, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == stream_key:
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() == ']':
+                        reader.pos += 1
+                        break
+                    reader.expect(',')
+        else:
+            yield key, reader.value()
+
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
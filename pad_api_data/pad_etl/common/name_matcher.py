@@ -0,0 +1,144 @@
+"""
+Finds which of a large set of names appear in a piece of text.
+
+Checking every name with `name in text` costs a scan of the text per name. NameMatcher
+builds an Aho-Corasick automaton over the names once, after which any text is matched
+against all of them in a single pass.
+"""
+from collections import deque
+from typing import Any, Dict, List, Optional, Set
+
+
+class NameMatcher(object):
+    """Maps names to values, and finds the names contained in some text.
+
+    Matching is case sensitive; lowercase the names and the text for case insensitive
+    matching. If a name is added more than once the last value wins, like a dict.
+    """
+
+    def __init__(self, names_to_values: Dict[str, Any]=None):
+        self.names = []  # type: List[str]
+        self.values = []  # type: List[Any]
+        self.name_to_idx = {}  # type: Dict[str, int]
+
+        # Trie nodes; node 0 is the root
+        self.goto = [{}]  # type: List[Dict[str, int]]
+        self.terminal = [-1]  # type: List[int]
+        self.compiled = False
+
+        for name, value in (names_to_values or {}).items():
+            self.add(name, value)
+
+    def add(self, name: str, value: Any):
+        if name in self.name_to_idx:
+            self.values[self.name_to_idx[name]] = value
+            return
+
+        node = 0
+        for c in name:
+            next_node = self.goto[node].get(c)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][c] = next_node
+                self.goto.append({})
+                self.terminal.append(-1)
+            node = next_node
+
+        idx = len(self.names)
+        self.names.append(name)
+        self.values.append(value)
+        self.name_to_idx[name] = idx
+        self.terminal[node] = idx
+        self.compiled = False
+
+    def _compile(self):
+        """Computes the failure links, plus the longest and all names ending at each node."""
+        node_count = len(self.goto)
+        self.fail = [0] * node_count
+        # Longest name that is a suffix of the node's string (the node's own, if it has one)
+        self.longest = list(self.terminal)
+        # Next node down the failure chain that ends a name
+        self.output_link = [-1] * node_count
+
+        queue = deque()
+        for child in self.goto[0].values():
+            queue.append(child)
+            if self.terminal[0] != -1:
+                self.output_link[child] = 0
+            if self.longest[child] == -1:
+                self.longest[child] = self.terminal[0]
+
+        while queue:
+            node = queue.popleft()
+            for c, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while c not in self.goto[fail] and fail != 0:
+                    fail = self.fail[fail]
+                fail = self.goto[fail].get(c, 0)
+                self.fail[child] = fail
+
+                if self.terminal[fail] != -1:
+                    self.output_link[child] = fail
+                else:
+                    self.output_link[child] = self.output_link[fail]
+                if self.longest[child] == -1:
+                    self.longest[child] = self.longest[fail]
+
+        self.compiled = True
+
+    def _scan(self, text: str):
+        """Yields the automaton node after each character of text (and the root first)."""
+        goto = self.goto
+        fail = self.fail
+        node = 0
+        yield node
+        for c in text:
+            while c not in goto[node] and node != 0:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            yield node
+
+    def find_all(self, text: str) -> Set[str]:
+        """Returns every name that occurs in text."""
+        if not self.compiled:
+            self._compile()
+        terminal = self.terminal
+        output_link = self.output_link
+        found = set()
+        for node in self._scan(text):
+            while node != -1:
+                if terminal[node] != -1:
+                    found.add(self.names[terminal[node]])
+                node = output_link[node]
+        return found
+
+    def longest_match(self, text: str) -> Optional[str]:
+        """Returns the longest name that occurs in text, or None.
+
+        Ties go to the name that was added first.
+        """
+        if not self.compiled:
+            self._compile()
+        best_idx = -1
+        best_len = -1
+        longest = self.longest
+        names = self.names
+        for node in self._scan(text):
+            idx = longest[node]
+            if idx == -1:
+                continue
+            name_len = len(names[idx])
+            if name_len > best_len or (name_len == best_len and idx < best_idx):
+                best_idx = idx
+                best_len = name_len
+        return names[best_idx] if best_idx != -1 else None
+
+    def __getitem__(self, name: str):
+        return self.values[self.name_to_idx[name]]
+
+    def __contains__(self, name: str):
+        return name in self.name_to_idx
+
+    def __len__(self):
+        return len(self.names)
@@ -4,9 +4,23 @@ import re
 
 import pytz
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .dungeon_types import DUNGEON_TYPE_COMMENTS
 
 
+def load_json_file(file_path: str):
+    """Decodes a JSON file, with orjson if it's installed (much faster on the big PAD files)."""
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path) as f:
+        return json.load(f)
+
+
 def strip_colors(message: int) -> str:
     return re.sub(r'(?i)[$^][a-f0-9]{6}[$^]', '', message)
 
@@ -113,6 +127,47 @@ class JsonDictEncodable(json.JSONEncoder):
         return str(self.__dict__)
 
 
+# Cache of the slot names for each JsonSlotsEncodable subclass
+_slot_names = {}
+
+
+class JsonSlotsEncodable(object):
+    """Utility parent class for compact models that declare __slots__ instead of a __dict__.
+
+    Use json_default to encode them; the unset slots are skipped, so the output matches
+    what the __dict__ of the equivalent plain object would have contained.
+    """
+    __slots__ = ()
+
+    def to_dict(self) -> dict:
+        cls = type(self)
+        names = _slot_names.get(cls)
+        if names is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                slots = klass.__dict__.get('__slots__', ())
+                names.extend([slots] if isinstance(slots, str) else slots)
+            _slot_names[cls] = names
+
+        result = {}
+        for name in names:
+            try:
+                result[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return result
+
+    def __str__(self):
+        return str(self.to_dict())
+
+
+def json_default(o):
+    """The json.dump default for data objects, whether they use __slots__ or a __dict__."""
+    if isinstance(o, JsonSlotsEncodable):
+        return o.to_dict()
+    return o.__dict__
+
+
 # directly into a dictionary when multiple val's correspond to a single
 # comment, but are unnecessarily delineated
 def get_dungeon_comment(val: int) -> str:
@@ -142,472 +197,602 @@ class Multiplier:
         self.shield = 0.0
 
 
+# Skill type -> function applying that skill type's multipliers, see _skill_multiplier
+_MULTIPLIER_HANDLERS = {}
+
+# (skill type, other_fields, length) -> (hp, atk, rcv, shield)
+_multiplier_cache = {}
+
+
+def _skill_multiplier(*skill_types):
+    """Registers the decorated function as the multiplier parser for these skill types."""
+    def register(handler):
+        for skill_type in skill_types:
+            _MULTIPLIER_HANDLERS[skill_type] = handler
+        return handler
+    return register
+
+
 def parse_skill_multiplier(skill, other_fields, length) -> Multiplier:
+    """Computes the stat multipliers for a skill; results are cached by skill type and args."""
+    try:
+        key = (skill, tuple(other_fields), length)
+        cached = _multiplier_cache.get(key)
+    except TypeError:
+        # Unhashable args, compute it every time
+        key = cached = None
+
     multipliers = Multiplier()
+    if cached is not None:
+        multipliers.hp, multipliers.atk, multipliers.rcv, multipliers.shield = cached
+        return multipliers
+
+    handler = _MULTIPLIER_HANDLERS.get(skill)
+    if handler:
+        handler(multipliers, other_fields, length)
+    if key is not None:
+        _multiplier_cache[key] = (multipliers.hp, multipliers.atk,
+                                  multipliers.rcv, multipliers.shield)
+    return multipliers
 
-    if skill == 3:
-        multipliers.shield = get_last(other_fields)
 
-    # Attack boost only
-    elif skill in [11, 22, 26, 31, 40, 66, 69, 88, 90, 92, 94, 95, 96, 97, 101, 104, 109, 150]:
-        multipliers.atk *= get_last(other_fields)
+@_skill_multiplier(3)
+def _skill_3_multiplier(multipliers, other_fields, length):
+    multipliers.shield = get_last(other_fields)
 
-    # HP boost only
-    elif skill in [23, 30, 48, 107]:
-        multipliers.hp *= get_last(other_fields)
 
-    elif skill in [24, 49, 149]:
+# Attack boost only
+@_skill_multiplier(11, 22, 26, 31, 40, 66, 69, 88, 90, 92, 94, 95, 96, 97, 101, 104, 109, 150)
+def _skill_11_multiplier(multipliers, other_fields, length):
+    multipliers.atk *= get_last(other_fields)
+
+
+# HP boost only
+@_skill_multiplier(23, 30, 48, 107)
+def _skill_23_multiplier(multipliers, other_fields, length):
+    multipliers.hp *= get_last(other_fields)
+
+
+@_skill_multiplier(24, 49, 149)
+def _skill_24_multiplier(multipliers, other_fields, length):
+    multipliers.rcv *= get_last(other_fields)
+
+
+# RCV and ATK
+@_skill_multiplier(28, 64, 75, 79, 103)
+def _skill_28_multiplier(multipliers, other_fields, length):
+    multipliers.atk *= get_last(other_fields)
+    multipliers.rcv *= get_last(other_fields)
+
+
+# All stat boost
+@_skill_multiplier(29, 65, 76, 114)
+def _skill_29_multiplier(multipliers, other_fields, length):
+    multipliers.hp *= get_last(other_fields)
+    multipliers.atk *= get_last(other_fields)
+    multipliers.rcv *= get_last(other_fields)
+
+
+@_skill_multiplier(16, 17, 36, 38, 43)
+def _skill_16_multiplier(multipliers, other_fields, length):
+    multipliers.shield = get_last(other_fields)
+
+
+@_skill_multiplier(39)
+def _skill_39_multiplier(multipliers, other_fields, length):
+    multipliers.atk *= get_last(other_fields)
+    if other_fields[2] == 2:
         multipliers.rcv *= get_last(other_fields)
 
-    # RCV and ATK
-    elif skill in [28, 64, 75, 79, 103]:
+
+@_skill_multiplier(44)
+def _skill_44_multiplier(multipliers, other_fields, length):
+    if other_fields[1] == 1:
+        multipliers.atk *= get_last(other_fields)
+    elif other_fields[1] == 2:
+        multipliers.rcv *= get_last(other_fields)
+    elif other_fields[1] == 3:
         multipliers.atk *= get_last(other_fields)
         multipliers.rcv *= get_last(other_fields)
 
-    # All stat boost
-    elif skill in [29, 65, 76, 114]:
+
+@_skill_multiplier(45, 62, 73, 77, 111)
+def _skill_45_multiplier(multipliers, other_fields, length):
+    multipliers.hp *= get_last(other_fields)
+    multipliers.atk *= get_last(other_fields)
+
+
+@_skill_multiplier(46)
+def _skill_46_multiplier(multipliers, other_fields, length):
+    multipliers.hp *= get_last(other_fields)
+
+
+@_skill_multiplier(50)
+def _skill_50_multiplier(multipliers, other_fields, length):
+    if other_fields[1] == 5:
+        multipliers.rcv *= get_last(other_fields)
+    else:
+        multipliers.atk *= get_last(other_fields)
+
+
+@_skill_multiplier(86)
+def _skill_86_multiplier(multipliers, other_fields, length):
+    if length == 4:
         multipliers.hp *= get_last(other_fields)
+
+
+# rainbow parsing
+@_skill_multiplier(61)
+def _skill_61_multiplier(multipliers, other_fields, length):
+    if length == 3:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 4:
+        r_type = other_fields[0]
+        if r_type == 31:
+            mult = get_second_last(other_fields) + \
+                get_last(other_fields) * (5 - other_fields[1])
+            multipliers.atk *= mult
+        elif r_type % 14 == 0:
+            multipliers.atk *= get_second_last(other_fields) + get_last(other_fields)
+        else:
+            # r_type is 63
+            mult = get_second_last(other_fields) + \
+                (get_last(other_fields)) * (6 - other_fields[1])
+            multipliers.atk *= mult
+    elif length == 5:
+        if other_fields[-1] <= other_fields[1]:
+            if other_fields[0] == 31:
+                multipliers.atk *= get_third_last(other_fields) + (5 - other_fields[1]) * get_second_last(
+                    other_fields)
+            if other_fields[0] == 63:
+                multipliers.atk *= get_third_last(other_fields) + (6 - other_fields[1]) * get_second_last(
+                    other_fields)
+        else:
+            multipliers.atk *= get_third_last(other_fields) + (
+                other_fields[-1] - other_fields[1]) * get_second_last(other_fields)
+
+
+@_skill_multiplier(63, 67)
+def _skill_63_multiplier(multipliers, other_fields, length):
+    multipliers.hp *= get_last(other_fields)
+    multipliers.rcv *= get_last(other_fields)
+
+
+@_skill_multiplier(98)
+def _skill_98_multiplier(multipliers, other_fields, length):
+    if length > 0:
+        multipliers.atk *= get_third_last(other_fields) + (other_fields[3] - other_fields[0]) * get_second_last(
+            other_fields)
+
+
+@_skill_multiplier(100)
+def _skill_100_multiplier(multipliers, other_fields, length):
+    if other_fields[0] != 0:
         multipliers.atk *= get_last(other_fields)
+    if other_fields[1] != 0:
         multipliers.rcv *= get_last(other_fields)
 
-    elif skill in [16, 17, 36, 38, 43]:
-        multipliers.shield = get_last(other_fields)
 
-    elif skill in [39]:
+@_skill_multiplier(105)
+def _skill_105_multiplier(multipliers, other_fields, length):
+    multipliers.atk *= get_last(other_fields)
+    multipliers.rcv *= get_mult(other_fields[0])
+
+
+@_skill_multiplier(106, 108)
+def _skill_106_multiplier(multipliers, other_fields, length):
+    multipliers.atk *= get_last(other_fields)
+    multipliers.hp *= get_mult(other_fields[0])
+
+
+@_skill_multiplier(119, 159)
+def _skill_119_multiplier(multipliers, other_fields, length):
+    if length == 3:
         multipliers.atk *= get_last(other_fields)
-        if other_fields[2] == 2:
-            multipliers.rcv *= get_last(other_fields)
-    elif skill == 44:
-        if other_fields[1] == 1:
-            multipliers.atk *= get_last(other_fields)
-        elif other_fields[1] == 2:
+    elif length == 5:
+        multipliers.atk *= get_third_last(other_fields) + (
+            (other_fields[4] - other_fields[1]) * (get_second_last(other_fields)))
+
+
+@_skill_multiplier(121)
+def _skill_121_multiplier(multipliers, other_fields, length):
+    if length == 3:
+        if get_last(other_fields) != 0:
+            multipliers.hp *= get_last(other_fields)
+    elif length == 4:
+        multipliers.atk *= get_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+    elif length == 5:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields):
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
-        elif other_fields[1] == 3:
-            multipliers.atk *= get_last(other_fields)
+
+
+@_skill_multiplier(122)
+def _skill_122_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.atk = get_last(other_fields)
+    else:
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
 
-    elif skill in [45, 62, 73, 77, 111]:
-        multipliers.hp *= get_last(other_fields)
+
+@_skill_multiplier(123)
+def _skill_123_multiplier(multipliers, other_fields, length):
+    if length == 4:
         multipliers.atk *= get_last(other_fields)
+    elif length == 5:
+        multipliers.atk *= get_second_last(other_fields)
+        multipliers.rcv *= get_last(other_fields)
 
-    elif skill == 46:
-        multipliers.hp *= get_last(other_fields)
 
-    elif skill == 50:
-        if other_fields[1] == 5:
+@_skill_multiplier(124)
+def _skill_124_multiplier(multipliers, other_fields, length):
+    if length == 7:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 8:
+        max_combos = 0
+        for i in range(0, 5):
+            if other_fields[i] != 0:
+                max_combos += 1
+
+        scale = get_last(other_fields)
+        c_count = other_fields[5]
+        multipliers.atk *= get_second_last(other_fields) + scale * (max_combos - c_count)
+
+
+@_skill_multiplier(125)
+def _skill_125_multiplier(multipliers, other_fields, length):
+    if length == 6:
+        if get_last(other_fields) != 0:
+            multipliers.hp *= get_last(other_fields)
+    elif length == 7:
+        multipliers.atk *= get_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+    elif length == 8:
+        if other_fields[-2] != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if other_fields[-1] != 0:
             multipliers.rcv *= get_last(other_fields)
-        else:
-            multipliers.atk *= get_last(other_fields)
+        if other_fields[-3] != 0:
+            multipliers.hp *= get_third_last(other_fields)
 
-    elif skill == 86:
-        if length == 4:
+
+@_skill_multiplier(129)
+def _skill_129_multiplier(multipliers, other_fields, length):
+    if length == 3:
+        if get_last(other_fields) != 0:
             multipliers.hp *= get_last(other_fields)
+    elif length == 4:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        multipliers.atk *= get_last(other_fields)
+    elif length == 5:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
+            multipliers.rcv *= get_last(other_fields)
+    elif length == 7:
+        if get_mult(other_fields[2]) != 0:
+            multipliers.hp *= get_mult(other_fields[2])
+        if get_mult(other_fields[3]) != 0:
+            multipliers.atk *= get_mult(other_fields[3])
+        if get_mult(other_fields[4]) != 0:
+            multipliers.rcv *= get_mult(other_fields[4])
+        if get_last(other_fields) != 0:
+            multipliers.shield = get_last(other_fields)
 
-    # rainbow parsing
-    elif skill == 61:
-        if length == 3:
-            multipliers.atk *= get_last(other_fields)
-        elif length == 4:
-            r_type = other_fields[0]
-            if r_type == 31:
-                mult = get_second_last(other_fields) + \
-                    get_last(other_fields) * (5 - other_fields[1])
-                multipliers.atk *= mult
-            elif r_type % 14 == 0:
-                multipliers.atk *= get_second_last(other_fields) + get_last(other_fields)
-            else:
-                # r_type is 63
-                mult = get_second_last(other_fields) + \
-                    (get_last(other_fields)) * (6 - other_fields[1])
-                multipliers.atk *= mult
-        elif length == 5:
-            if other_fields[-1] <= other_fields[1]:
-                if other_fields[0] == 31:
-                    multipliers.atk *= get_third_last(other_fields) + (5 - other_fields[1]) * get_second_last(
-                        other_fields)
-                if other_fields[0] == 63:
-                    multipliers.atk *= get_third_last(other_fields) + (6 - other_fields[1]) * get_second_last(
-                        other_fields)
-            else:
-                multipliers.atk *= get_third_last(other_fields) + (
-                    other_fields[-1] - other_fields[1]) * get_second_last(other_fields)
-
-    elif skill in [63, 67]:
-        multipliers.hp *= get_last(other_fields)
+
+@_skill_multiplier(130)
+def _skill_130_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 5:
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
+            multipliers.rcv *= get_last(other_fields)
+    elif length == 7:
+        if get_mult(other_fields[2]) != 0:
+            multipliers.hp *= get_mult(other_fields[2])
+        if get_mult(other_fields[3]) != 0:
+            multipliers.atk *= get_mult(other_fields[3])
+        if get_mult(other_fields[4]) != 0:
+            multipliers.rcv *= get_mult(other_fields[4])
+        if get_last(other_fields) != 0:
+            multipliers.shield = get_last(other_fields)
+
+
+@_skill_multiplier(131)
+def _skill_131_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 7:
+        if get_mult(other_fields[2]) != 0:
+            multipliers.hp *= get_mult(other_fields[2])
+        if get_mult(other_fields[3]) != 0:
+            multipliers.atk *= get_mult(other_fields[3])
+        if get_mult(other_fields[4]) != 0:
+            multipliers.rcv *= get_mult(other_fields[4])
+        if get_last(other_fields) != 0:
+            multipliers.shield = get_last(other_fields)
+
+
+@_skill_multiplier(133)
+def _skill_133_multiplier(multipliers, other_fields, length):
+    if length == 3:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 4:
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
         multipliers.rcv *= get_last(other_fields)
 
-    elif skill == 98:
-        if length > 0:
-            multipliers.atk *= get_third_last(other_fields) + (other_fields[3] - other_fields[0]) * get_second_last(
-                other_fields)
 
-    elif skill == 100:
-        if other_fields[0] != 0:
-            multipliers.atk *= get_last(other_fields)
+@_skill_multiplier(136)
+def _skill_136_multiplier(multipliers, other_fields, length):
+    if length == 6:
+        multipliers.atk *= get_mult(other_fields[2])
+        if get_last(other_fields) > 1:
+            multipliers.hp *= get_last(other_fields)
+    elif length == 7:
+        multipliers.atk *= get_mult(other_fields[2]) * get_last(other_fields)
+    elif length == 8:
+        if get_mult(other_fields[2]) > 1:
+            multipliers.atk *= get_mult(other_fields[2])
+        if get_mult(other_fields[1]) > 1:
+            multipliers.hp *= get_mult(other_fields[1])
+        if get_mult(other_fields[3]) > 1:
+            multipliers.rcv *= get_mult(other_fields[3])
+        if get_second_last(other_fields) > 1:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_third_last(other_fields) > 1:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_last(other_fields) > 1:
+            multipliers.rcv *= get_last(other_fields)
+
+
+@_skill_multiplier(137)
+def _skill_137_multiplier(multipliers, other_fields, length):
+    if length == 6:
+        multipliers.atk *= get_mult(other_fields[2])
+        multipliers.hp *= get_last(other_fields)
+    elif length == 7:
         if other_fields[1] != 0:
+            multipliers.hp *= get_mult(other_fields[1])
+        multipliers.atk *= get_mult(other_fields[2]) * get_last(other_fields)
+        if other_fields[3] != 0:
+            multipliers.rcv *= get_mult(other_fields[3])
+    elif length == 8:
+        if get_mult(other_fields[1]) != 0:
+            multipliers.hp *= get_mult(other_fields[1])
+        if get_mult(other_fields[2]) != 0:
+            multipliers.atk *= get_mult(other_fields[2])
+        if get_mult(other_fields[3]) != 0:
+            multipliers.rcv *= get_mult(other_fields[3])
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
 
-    elif skill == 105:
-        multipliers.atk *= get_last(other_fields)
-        multipliers.rcv *= get_mult(other_fields[0])
 
-    elif skill in [106, 108]:
+@_skill_multiplier(139)
+def _skill_139_multiplier(multipliers, other_fields, length):
+    if length == 5:
         multipliers.atk *= get_last(other_fields)
-        multipliers.hp *= get_mult(other_fields[0])
+    if length == 7 or length == 8:
+        multipliers.atk *= max(get_mult(other_fields[4]), get_last(other_fields))
 
-    elif skill in [119, 159]:
-        if length == 3:
-            multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            multipliers.atk *= get_third_last(other_fields) + (
-                (other_fields[4] - other_fields[1]) * (get_second_last(other_fields)))
 
-    elif skill == 121:
-        if length == 3:
-            if get_last(other_fields) != 0:
-                multipliers.hp *= get_last(other_fields)
-        elif length == 4:
-            multipliers.atk *= get_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-        elif length == 5:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields):
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-
-    elif skill == 122:
-        if length == 4:
-            multipliers.atk = get_last(other_fields)
-        else:
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
+@_skill_multiplier(151)
+def _skill_151_multiplier(multipliers, other_fields, length):
+    if other_fields[0] != 0:
+        multipliers.atk *= get_mult(other_fields[0])
+    multipliers.shield = get_last(other_fields)
 
-    elif skill == 123:
-        if length == 4:
-            multipliers.atk *= get_last(other_fields)
-        elif length == 5:
+
+@_skill_multiplier(155)
+def _skill_155_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        multipliers.atk *= get_last(other_fields)
+    elif length == 5:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
             multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
 
-    elif skill == 124:
-        if length == 7:
-            multipliers.atk *= get_last(other_fields)
-        elif length == 8:
-            max_combos = 0
-            for i in range(0, 5):
-                if other_fields[i] != 0:
-                    max_combos += 1
-
-            scale = get_last(other_fields)
-            c_count = other_fields[5]
-            multipliers.atk *= get_second_last(other_fields) + scale * (max_combos - c_count)
-
-    elif skill == 125:
-        if length == 6:
-            if get_last(other_fields) != 0:
-                multipliers.hp *= get_last(other_fields)
-        elif length == 7:
-            multipliers.atk *= get_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-        elif length == 8:
-            if other_fields[-2] != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if other_fields[-1] != 0:
-                multipliers.rcv *= get_last(other_fields)
-            if other_fields[-3] != 0:
-                multipliers.hp *= get_third_last(other_fields)
-
-    elif skill == 129:
-        if length == 3:
-            if get_last(other_fields) != 0:
-                multipliers.hp *= get_last(other_fields)
-        elif length == 4:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-        elif length == 7:
-            if get_mult(other_fields[2]) != 0:
-                multipliers.hp *= get_mult(other_fields[2])
-            if get_mult(other_fields[3]) != 0:
-                multipliers.atk *= get_mult(other_fields[3])
-            if get_mult(other_fields[4]) != 0:
-                multipliers.rcv *= get_mult(other_fields[4])
-            if get_last(other_fields) != 0:
-                multipliers.shield = get_last(other_fields)
-
-    elif skill == 130:
-        if length == 4:
+
+@_skill_multiplier(156)
+def _skill_156_multiplier(multipliers, other_fields, length):
+    if length > 0:
+        check = other_fields[-2]
+        if check == 2:
             multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-        elif length == 7:
-            if get_mult(other_fields[2]) != 0:
-                multipliers.hp *= get_mult(other_fields[2])
-            if get_mult(other_fields[3]) != 0:
-                multipliers.atk *= get_mult(other_fields[3])
-            if get_mult(other_fields[4]) != 0:
-                multipliers.rcv *= get_mult(other_fields[4])
-            if get_last(other_fields) != 0:
-                multipliers.shield = get_last(other_fields)
-
-    elif skill == 131:
-        if length == 4:
+        if check == 3:
+            multipliers.shield = get_last(other_fields)
+
+
+@_skill_multiplier(157)
+def _skill_157_multiplier(multipliers, other_fields, length):
+    if length == 2:
+        multipliers.atk *= get_last(other_fields) ** 2
+    if length == 4:
+        multipliers.atk *= get_last(other_fields) ** 3
+    if length == 6:
+        multipliers.atk *= get_last(other_fields) ** 3
+
+
+@_skill_multiplier(158)
+def _skill_158_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 5:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.atk *= get_last(other_fields)
-        elif length == 7:
-            if get_mult(other_fields[2]) != 0:
-                multipliers.hp *= get_mult(other_fields[2])
-            if get_mult(other_fields[3]) != 0:
-                multipliers.atk *= get_mult(other_fields[3])
-            if get_mult(other_fields[4]) != 0:
-                multipliers.rcv *= get_mult(other_fields[4])
-            if get_last(other_fields) != 0:
-                multipliers.shield = get_last(other_fields)
-
-    elif skill == 133:
-        if length == 3:
+    elif length == 6:
+        if get_third_last(other_fields) != 0:
+            multipliers.rcv *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.atk *= get_last(other_fields)
-        elif length == 4:
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
+
+
+@_skill_multiplier(163)
+def _skill_163_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        multipliers.atk *= get_last(other_fields)
+    if length == 5:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
+    if length == 6 or length == 7:
+        multipliers.shield = get_last(other_fields)
+
+
+@_skill_multiplier(164)
+def _skill_164_multiplier(multipliers, other_fields, length):
+    if length == 7:
+        multipliers.atk *= get_second_last(other_fields)
+        multipliers.rcv *= get_last(other_fields)
+    if length == 8:
+        multipliers.atk *= get_third_last(other_fields)
+        multipliers.rcv *= get_second_last(other_fields)
+        if other_fields[4] == 1:
+            multipliers.atk += get_last(other_fields)
+            multipliers.rcv += get_last(other_fields)
+        elif other_fields[4] == 2:
+            multipliers.atk += get_last(other_fields)
+
+
+@_skill_multiplier(165)
+def _skill_165_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.atk *= get_second_last(other_fields)
+        multipliers.rcv *= get_last(other_fields)
+    if length == 7:
+        multipliers.atk *= get_mult(other_fields[2]) + \
+            get_third_last(other_fields) * other_fields[-1]
+        multipliers.rcv *= get_mult(other_fields[3]) + \
+            get_second_last(other_fields) * other_fields[-1]
 
-    elif skill == 136:
-        if length == 6:
-            multipliers.atk *= get_mult(other_fields[2])
-            if get_last(other_fields) > 1:
-                multipliers.hp *= get_last(other_fields)
-        elif length == 7:
-            multipliers.atk *= get_mult(other_fields[2]) * get_last(other_fields)
-        elif length == 8:
-            if get_mult(other_fields[2]) > 1:
-                multipliers.atk *= get_mult(other_fields[2])
-            if get_mult(other_fields[1]) > 1:
-                multipliers.hp *= get_mult(other_fields[1])
-            if get_mult(other_fields[3]) > 1:
-                multipliers.rcv *= get_mult(other_fields[3])
-            if get_second_last(other_fields) > 1:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_third_last(other_fields) > 1:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_last(other_fields) > 1:
-                multipliers.rcv *= get_last(other_fields)
-
-    elif skill == 137:
-        if length == 6:
-            multipliers.atk *= get_mult(other_fields[2])
-            multipliers.hp *= get_last(other_fields)
-        elif length == 7:
-            if other_fields[1] != 0:
-                multipliers.hp *= get_mult(other_fields[1])
-            multipliers.atk *= get_mult(other_fields[2]) * get_last(other_fields)
-            if other_fields[3] != 0:
-                multipliers.rcv *= get_mult(other_fields[3])
-        elif length == 8:
-            if get_mult(other_fields[1]) != 0:
-                multipliers.hp *= get_mult(other_fields[1])
-            if get_mult(other_fields[2]) != 0:
-                multipliers.atk *= get_mult(other_fields[2])
-            if get_mult(other_fields[3]) != 0:
-                multipliers.rcv *= get_mult(other_fields[3])
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-
-    elif skill == 139:
-        if length == 5:
-            multipliers.atk *= get_last(other_fields)
-        if length == 7 or length == 8:
-            multipliers.atk *= max(get_mult(other_fields[4]), get_last(other_fields))
 
-    elif skill == 151:
-        if other_fields[0] != 0:
-            multipliers.atk *= get_mult(other_fields[0])
+@_skill_multiplier(166)
+def _skill_166_multiplier(multipliers, other_fields, length):
+    multipliers.atk *= get_mult(other_fields[1]) + (other_fields[-1] - other_fields[0]) * get_third_last(
+        other_fields)
+    multipliers.rcv *= get_mult(other_fields[2]) + (other_fields[-1] - other_fields[0]) * get_second_last(
+        other_fields)
+
+
+@_skill_multiplier(167)
+def _skill_167_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.atk *= get_second_last(other_fields)
+        multipliers.rcv *= get_last(other_fields)
+    elif length == 7:
+        diff = other_fields[-1] - other_fields[1]
+        multipliers.atk *= get_mult(other_fields[2]) + diff * get_third_last(other_fields)
+        multipliers.rcv *= get_mult(other_fields[3]) + diff * get_second_last(other_fields)
+
+
+@_skill_multiplier(169, 170, 171, 182)
+def _skill_169_multiplier(multipliers, other_fields, length):
+    if length > 0:
+        if get_second_last(other_fields) > 1:
+            multipliers.atk *= get_second_last(other_fields)
         multipliers.shield = get_last(other_fields)
 
-    elif skill == 155:
-        if length == 4:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-
-    elif skill == 156:
-        if length > 0:
-            check = other_fields[-2]
-            if check == 2:
-                multipliers.atk *= get_last(other_fields)
-            if check == 3:
-                multipliers.shield = get_last(other_fields)
-
-    elif skill == 157:
-        if length == 2:
-            multipliers.atk *= get_last(other_fields) ** 2
-        if length == 4:
-            multipliers.atk *= get_last(other_fields) ** 3
-        if length == 6:
-            multipliers.atk *= get_last(other_fields) ** 3
-
-    elif skill == 158:
-        if length == 4:
-            multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.atk *= get_last(other_fields)
-        elif length == 6:
-            if get_third_last(other_fields) != 0:
-                multipliers.rcv *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.atk *= get_last(other_fields)
-
-    elif skill == 163:
-        if length == 4:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            multipliers.atk *= get_last(other_fields)
-        if length == 5:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-        if length == 6 or length == 7:
-            multipliers.shield = get_last(other_fields)
 
-    elif skill == 164:
-        if length == 7:
+@_skill_multiplier(175)
+def _skill_175_multiplier(multipliers, other_fields, length):
+    if length == 5:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        multipliers.atk *= get_last(other_fields)
+    if length == 6:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
             multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
-        if length == 8:
-            multipliers.atk *= get_third_last(other_fields)
-            multipliers.rcv *= get_second_last(other_fields)
-            if other_fields[4] == 1:
-                multipliers.atk += get_last(other_fields)
-                multipliers.rcv += get_last(other_fields)
-            elif other_fields[4] == 2:
-                multipliers.atk += get_last(other_fields)
-
-    elif skill == 165:
-        if length == 4:
+
+
+@_skill_multiplier(177)
+def _skill_177_multiplier(multipliers, other_fields, length):
+    if length == 7:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 8:
+        multipliers.atk *= get_second_last(other_fields) + \
+            other_fields[-3] * get_last(other_fields)
+
+
+@_skill_multiplier(178, 185)
+def _skill_178_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        multipliers.hp *= get_last(other_fields)
+    elif length == 5:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        multipliers.atk *= get_last(other_fields)
+    elif length == 6:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
             multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.rcv *= get_last(other_fields)
-        if length == 7:
-            multipliers.atk *= get_mult(other_fields[2]) + \
-                get_third_last(other_fields) * other_fields[-1]
-            multipliers.rcv *= get_mult(other_fields[3]) + \
-                get_second_last(other_fields) * other_fields[-1]
-
-    elif skill == 166:
-        multipliers.atk *= get_mult(other_fields[1]) + (other_fields[-1] - other_fields[0]) * get_third_last(
-            other_fields)
-        multipliers.rcv *= get_mult(other_fields[2]) + (other_fields[-1] - other_fields[0]) * get_second_last(
-            other_fields)
 
-    elif skill == 167:
-        if length == 4:
+
+@_skill_multiplier(183)
+def _skill_183_multiplier(multipliers, other_fields, length):
+    if length == 4 or length == 7:
+        multipliers.atk *= get_last(other_fields)
+    elif length == 5:
+        if get_second_last(other_fields) != 0:
             multipliers.atk *= get_second_last(other_fields)
-            multipliers.rcv *= get_last(other_fields)
-        elif length == 7:
-            diff = other_fields[-1] - other_fields[1]
-            multipliers.atk *= get_mult(other_fields[2]) + diff * get_third_last(other_fields)
-            multipliers.rcv *= get_mult(other_fields[3]) + diff * get_second_last(other_fields)
-
-    elif skill in [169, 170, 171, 182]:
-        if length > 0:
-            if get_second_last(other_fields) > 1:
-                multipliers.atk *= get_second_last(other_fields)
-            multipliers.shield = get_last(other_fields)
+        multipliers.shield = get_last(other_fields)
+    elif length == 8:
+        multipliers.atk *= max(get_mult(other_fields[3]), get_second_last(other_fields))
+        multipliers.rcv *= max(get_mult(other_fields[4]), get_last(other_fields))
 
-    elif skill == 175:
-        if length == 5:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            multipliers.atk *= get_last(other_fields)
-        if length == 6:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-
-    elif skill == 177:
-        if length == 7:
-            multipliers.atk *= get_last(other_fields)
-        elif length == 8:
-            multipliers.atk *= get_second_last(other_fields) + \
-                other_fields[-3] * get_last(other_fields)
 
-    elif skill in [178, 185]:
-        if length == 4:
-            multipliers.hp *= get_last(other_fields)
-        elif length == 5:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            multipliers.atk *= get_last(other_fields)
-        elif length == 6:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-
-    elif skill == 183:
-        if length == 4 or length == 7:
+@_skill_multiplier(186)
+def _skill_186_multiplier(multipliers, other_fields, length):
+    if length == 4:
+        if get_second_last(other_fields) != 0:
+            multipliers.hp *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
             multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            multipliers.shield = get_last(other_fields)
-        elif length == 8:
-            multipliers.atk *= max(get_mult(other_fields[3]), get_second_last(other_fields))
-            multipliers.rcv *= max(get_mult(other_fields[4]), get_last(other_fields))
-
-    elif skill == 186:
-        if length == 4:
-            if get_second_last(other_fields) != 0:
-                multipliers.hp *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.atk *= get_last(other_fields)
-        elif length == 5:
-            if get_third_last(other_fields) != 0:
-                multipliers.hp *= get_third_last(other_fields)
-            if get_second_last(other_fields) != 0:
-                multipliers.atk *= get_second_last(other_fields)
-            if get_last(other_fields) != 0:
-                multipliers.rcv *= get_last(other_fields)
-
-    return multipliers
+    elif length == 5:
+        if get_third_last(other_fields) != 0:
+            multipliers.hp *= get_third_last(other_fields)
+        if get_second_last(other_fields) != 0:
+            multipliers.atk *= get_second_last(other_fields)
+        if get_last(other_fields) != 0:
+            multipliers.rcv *= get_last(other_fields)
 
 
 def get_mult(val):
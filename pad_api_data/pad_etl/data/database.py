@@ -1,15 +1,38 @@
+import hashlib
 import json
 import logging
 import os
+import pickle
+import tempfile
 from typing import List
 
 from . import BookCard, Dungeon, MonsterSkill, EnemySkill, Exchange
 from . import bonus, card, dungeon, skill, exchange, enemy_skill
+from ..common import pad_util
 from ..processor import enemy_skillset as ess
 from ..processor.merged_data import MergedBonus, MergedCard, MergedEnemy
 
 fail_logger = logging.getLogger('processor_failures')
 
+# Bump this whenever the parsed data structures change, to invalidate old snapshots.
+SNAPSHOT_VERSION = 2
+
+# Protocol 5 supports out-of-band buffers; fall back on older interpreters.
+SNAPSHOT_PROTOCOL = min(5, pickle.HIGHEST_PROTOCOL)
+
+
+def _hash_files(file_paths: List[str]) -> str:
+    digest = hashlib.sha256()
+    for file_path in file_paths:
+        digest.update(os.path.basename(file_path).encode('utf-8'))
+        if not os.path.exists(file_path):
+            digest.update(b'missing')
+            continue
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
 
 def _clean_bonuses(pg_server, bonus_sets, dungeons) -> List[MergedBonus]:
     dungeons_by_id = {d.dungeon_id: d for d in dungeons}
@@ -101,7 +124,69 @@ class Database(object):
         self.card_id_to_raw_card = {}
         self.enemy_id_to_enemy = {}
 
-    def load_database(self, skip_skills=False, skip_bonus=False, skip_extra=False):
+    def load_database(self, skip_skills=False, skip_bonus=False, skip_extra=False,
+                      snapshot_dir: str=None):
+        """Parses the raw files for this server.
+
+        If snapshot_dir is provided, the fully cleaned database is cached there, keyed on the
+        content of the raw files, and reused on the next run if nothing has changed.
+        """
+        snapshot_file = None
+        if snapshot_dir:
+            snapshot_file = self._snapshot_file(snapshot_dir, skip_skills, skip_bonus, skip_extra)
+            if os.path.exists(snapshot_file):
+                self._load_snapshot(snapshot_file)
+                return
+
+        self._parse_database(skip_skills, skip_bonus, skip_extra)
+
+        if snapshot_file:
+            self._save_snapshot(snapshot_file)
+
+    def _input_files(self, skip_skills, skip_bonus, skip_extra) -> List[str]:
+        file_names = [card.FILE_NAME, dungeon.FILE_NAME, enemy_skill.FILE_NAME]
+        if not skip_bonus:
+            file_names.extend(bonus.FILE_NAME.format(g) for g in ['red', 'blue', 'green'])
+        if not skip_skills:
+            file_names.append(skill.FILE_NAME)
+        if not skip_extra:
+            file_names.extend([exchange.FILE_NAME, 'egg_machines.json'])
+        return [os.path.join(self.base_dir, f) for f in file_names]
+
+    def _snapshot_file(self, snapshot_dir, skip_skills, skip_bonus, skip_extra):
+        content_hash = _hash_files(self._input_files(skip_skills, skip_bonus, skip_extra))
+        flags = ''.join(str(int(f)) for f in [skip_skills, skip_bonus, skip_extra])
+        file_name = '{}_v{}_{}_{}.pickle'.format(
+            self.pg_server, SNAPSHOT_VERSION, flags, content_hash[:16])
+        return os.path.join(snapshot_dir, file_name)
+
+    def _load_snapshot(self, snapshot_file):
+        with open(snapshot_file, 'rb') as f:
+            self.__dict__.update(pickle.load(f))
+        # Normally set as a side effect of _clean_enemy
+        ess.enemy_skill_map = {s.enemy_skill_id: s for s in self.enemy_skills}
+
+    def _save_snapshot(self, snapshot_file):
+        snapshot_dir = os.path.dirname(snapshot_file)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=snapshot_dir)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=SNAPSHOT_PROTOCOL)
+        os.replace(tmp_file, snapshot_file)
+
+        # Remove snapshots of older raw data (same server/flags) or older snapshot versions
+        current_name = os.path.basename(snapshot_file)
+        same_flags_prefix = current_name[:current_name.rindex('_') + 1]
+        server_prefix = '{}_v'.format(self.pg_server)
+        version_prefix = '{}_v{}_'.format(self.pg_server, SNAPSHOT_VERSION)
+        for file_name in os.listdir(snapshot_dir):
+            if file_name == current_name or not file_name.endswith('.pickle'):
+                continue
+            if file_name.startswith(same_flags_prefix) or (
+                    file_name.startswith(server_prefix) and not file_name.startswith(version_prefix)):
+                os.remove(os.path.join(snapshot_dir, file_name))
+
+    def _parse_database(self, skip_skills, skip_bonus, skip_extra):
         base_dir = self.base_dir
         self.raw_cards = card.load_card_data(data_dir=base_dir)
         self.dungeons = dungeon.load_dungeon_data(data_dir=base_dir)
@@ -114,8 +199,10 @@ class Database(object):
             }
 
         if not skip_skills:
-            self.skills = skill.load_skill_data(data_dir=base_dir)
-            self.raw_skills = skill.load_raw_skill_data(data_dir=base_dir)
+            # Decoded once, shared by both views
+            skill_file = skill.SkillFile(data_dir=base_dir)
+            self.skills = skill_file.skills
+            self.raw_skills = skill_file.raw
         self.enemy_skills = enemy_skill.load_enemy_skill_data(data_dir=base_dir)
 
         if not skip_extra:
@@ -136,9 +223,9 @@ class Database(object):
         output_file = os.path.join(output_dir, '{}_{}.json'.format(self.pg_server, file_name))
         with open(output_file, 'w') as f:
             if pretty:
-                json.dump(obj, f, indent=4, sort_keys=True, default=lambda x: x.__dict__)
+                json.dump(obj, f, indent=4, sort_keys=True, default=pad_util.json_default)
             else:
-                json.dump(obj, f, sort_keys=True, default=lambda x: x.__dict__)
+                json.dump(obj, f, sort_keys=True, default=pad_util.json_default)
 
     def save_all(self, output_dir: str, pretty: bool):
         self.save(output_dir, 'raw_cards', self.raw_cards, pretty)
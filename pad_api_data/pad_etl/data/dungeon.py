@@ -17,8 +17,12 @@ from ..common.dungeon_maps import raw7_map
 FILE_NAME = 'download_dungeon_data.json'
 
 
-class DungeonFloor(pad_util.JsonDictEncodable):
+class DungeonFloor(pad_util.JsonSlotsEncodable):
     """A floor listed once you click into a Dungeon."""
+    __slots__ = ['floor_number', 'raw_name', 'clean_name', 'waves', 'rflags1', 'stamina', 'bgm1',
+                 'bgm2', 'rflags2', 'otherModifier', 'drops', 'dropRarities', 'entryRequirement',
+                 'requiredDungeon', 'modifiers', 'flags', 'remaining_fields', 'modifiers_clean',
+                 'fixed_team', 'score']
 
     def __init__(self, raw: List[Any]):
         self.floor_number = int(raw[0])
@@ -162,8 +166,11 @@ prefix_to_dungeontype = {
 }
 
 
-class Dungeon(pad_util.JsonDictEncodable):
+class Dungeon(pad_util.JsonSlotsEncodable):
     """A top-level dungeon."""
+    __slots__ = ['floors', 'dungeon_id', 'name', 'bitmap_2', 'one_time', 'clean_name',
+                 'alt_dungeon_type', 'dungeon_type', 'dungeon_comment', 'dungeon_comment_value',
+                 'repeat_day', 'prefix']
 
     def __init__(self, raw: List[Any]):
         self.floors = []  # type: List[DungeonFloor]
@@ -202,9 +209,6 @@ class Dungeon(pad_util.JsonDictEncodable):
     #         if len(raw) > 6:
     #             print('unexpected field count: ' + ','.join(raw))
 
-    def __str__(self):
-        return str(self.__dict__)
-
     def __repr__(self):
         return 'Dungeon({} - {})'.format(self.dungeon_id, self.clean_name)
 
@@ -2,7 +2,6 @@
 Parses monster skill (leader/active) data.
 """
 
-import json
 import os
 from typing import List, Any
 
@@ -14,8 +13,11 @@ from ..common.skill_type_maps import SKILL_TYPE
 FILE_NAME = 'download_skill_data.json'
 
 
-class MonsterSkill(pad_util.JsonDictEncodable):
+class MonsterSkill(pad_util.JsonSlotsEncodable):
     """Leader/active skill info for a player-ownable monster."""
+    __slots__ = ['skill_id', 'name', 'description', 'clean_description', 'skill_type', 'levels',
+                 'turn_max', 'turn_min', 'unknown_005', 'other_fields', 'skill_part_1_id',
+                 'skill_part_2_id', 'skill_part_3_id', 'hp_mult', 'atk_mult', 'rcv_mult', 'shield']
 
     def __init__(self, skill_id: int, raw: List[Any]):
         self.skill_id = SkillId(skill_id)
@@ -75,34 +77,46 @@ class MonsterSkill(pad_util.JsonDictEncodable):
         # This gives you the shield as a percent rather than a fraction
         self.shield = multipliers.shield * 100
 
-    def __str__(self):
-        return str(self.__dict__)
-
     def __repr__(self):
         return 'Skill(%s, %r)' % (self.skill_id, self.name)
 
 
-def load_skill_data(data_dir=None, skill_json_file: str = None) -> List[MonsterSkill]:
-    """Load MonsterSkill objects from the PAD json file."""
-    if skill_json_file is None:
-        skill_json_file = os.path.join(data_dir, FILE_NAME)
+class SkillFile(object):
+    """The PAD skill JSON file, decoded once and shared by the skill loaders.
 
-    with open(skill_json_file) as f:
-        skill_json = json.load(f)
+    Both views are built on first access: raw is the decoded JSON, and skills the
+    MonsterSkill objects parsed from it.
+    """
 
-    if skill_json['v'] > 1220:
-        print('Warning! Version of skill file is not tested: {}'.format(skill_json['v']))
+    def __init__(self, data_dir=None, skill_json_file: str = None):
+        if skill_json_file is None:
+            skill_json_file = os.path.join(data_dir, FILE_NAME)
+        self.skill_json_file = skill_json_file
+        self._raw = None
+        self._skills = None
 
-    return [MonsterSkill(i, ms) for i, ms in enumerate(skill_json['skill'])]
+    @property
+    def raw(self) -> dict:
+        if self._raw is None:
+            self._raw = pad_util.load_json_file(self.skill_json_file)
+        return self._raw
 
+    @property
+    def skills(self) -> List[MonsterSkill]:
+        if self._skills is None:
+            skill_json = self.raw
+            if skill_json['v'] > 1220:
+                print('Warning! Version of skill file is not tested: {}'.format(skill_json['v']))
 
-def load_raw_skill_data(data_dir=None, skill_json_file: str = None) -> object:
-    """Load raw PAD json file."""
-    # Temporary hack
-    if skill_json_file is None:
-        skill_json_file = os.path.join(data_dir, FILE_NAME)
+            self._skills = [MonsterSkill(i, ms) for i, ms in enumerate(skill_json['skill'])]
+        return self._skills
 
-    with open(skill_json_file) as f:
-        skill_json = json.load(f)
 
-    return skill_json
+def load_skill_data(data_dir=None, skill_json_file: str = None) -> List[MonsterSkill]:
+    """Load MonsterSkill objects from the PAD json file."""
+    return SkillFile(data_dir, skill_json_file).skills
+
+
+def load_raw_skill_data(data_dir=None, skill_json_file: str = None) -> object:
+    """Load raw PAD json file."""
+    return SkillFile(data_dir, skill_json_file).raw
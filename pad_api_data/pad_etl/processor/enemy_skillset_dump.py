@@ -1,6 +1,9 @@
+from collections import OrderedDict
 from enum import Enum
 from typing import Optional, TextIO, Union
 import os
+import pickle
+import tempfile
 import yaml
 
 from pad_etl.processor import debug_utils
@@ -11,11 +14,15 @@ from .enemy_skillset import *
 
 _DATA_DIR = None
 
+# Bump this whenever EnemySummary or the ES classes change, to invalidate old summary indexes.
+SUMMARY_INDEX_VERSION = 1
+
 def set_data_dir(data_dir: str):
     if not os.path.isdir(data_dir):
         raise ValueError('Not a directory:', data_dir)
     global _DATA_DIR
     _DATA_DIR = data_dir
+    _SUMMARY_CACHE.clear()
 
 
 def data_dir() -> str:
@@ -310,12 +317,124 @@ def flatten_skillset(level: int, skillset: ProcessedSkillset) -> SkillRecordList
     return SkillRecordListing(level=level, records=records)
 
 
+class SummaryCache(object):
+    """Parsed summaries by file path, so each YAML file is only parsed once while unchanged.
+
+    Entries are stamped with the file's mtime and size and dropped when either changes.
+    The least recently used entries are evicted past max_size. Summaries are stored
+    pickled and every lookup returns a fresh copy, since callers modify what they load.
+
+    An index of every summary in a directory can be saved and loaded in one go; entries
+    from it are subject to the same staleness check, and the whole index is ignored if it
+    was written with a different SUMMARY_INDEX_VERSION.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # file name -> (stamp, pickled EnemySummary)
+        self.index = {}  # file name -> (stamp, pickled EnemySummary)
+
+    def get(self, file_path: str, stamp) -> Optional[EnemySummary]:
+        file_name = os.path.basename(file_path)
+        entry = self.entries.get(file_name)
+        if entry and entry[0] == stamp:
+            self.entries.move_to_end(file_name)
+            return pickle.loads(entry[1])
+
+        entry = self.index.get(file_name)
+        if entry and entry[0] == stamp:
+            self._store(file_name, entry)
+            return pickle.loads(entry[1])
+        return None
+
+    def put(self, file_path: str, stamp, summary: EnemySummary):
+        self._store(os.path.basename(file_path), (stamp, pickle.dumps(summary)))
+
+    def _store(self, file_name: str, entry):
+        self.entries[file_name] = entry
+        self.entries.move_to_end(file_name)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def discard(self, file_path: str):
+        file_name = os.path.basename(file_path)
+        self.entries.pop(file_name, None)
+        self.index.pop(file_name, None)
+
+    def clear(self):
+        self.entries.clear()
+        self.index.clear()
+
+    def load_index(self, index_file: str) -> bool:
+        with open(index_file, 'rb') as f:
+            index_data = pickle.load(f)
+        if not isinstance(index_data, dict) or index_data.get('version') != SUMMARY_INDEX_VERSION:
+            print('ignoring summary index from a different version:', index_file)
+            self.index = {}
+            return False
+        self.index = index_data['entries']
+        return True
+
+    def save_index(self, index_file: str, index):
+        index_dir = os.path.dirname(os.path.abspath(index_file))
+        fd, tmp_file = tempfile.mkstemp(dir=index_dir)
+        with os.fdopen(fd, 'wb') as f:
+            index_data = {'version': SUMMARY_INDEX_VERSION, 'entries': index}
+            pickle.dump(index_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, index_file)
+        self.index = index
+
+
+_SUMMARY_CACHE = SummaryCache()
+
+
+def _file_stamp(file_path: str):
+    """The (mtime, size) of the file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def load_summary(monster_id: int) -> Optional[EnemySummary]:
     """Load an EnemySummary from disk, returning None if no data is available (probably an error)."""
     file_path = _file_by_id(monster_id)
-    if not os.path.exists(file_path):
+    stamp = _file_stamp(file_path)
+    if stamp is None:
         return None
 
+    enemy_summary = _SUMMARY_CACHE.get(file_path, stamp)
+    if enemy_summary is None:
+        enemy_summary = _parse_summary_file(file_path)
+        _SUMMARY_CACHE.put(file_path, stamp, enemy_summary)
+    return enemy_summary
+
+
+def load_summary_index(index_file: str) -> bool:
+    """Loads an index written by save_summary_index, to skip parsing the unchanged files.
+
+    Returns False (and loads nothing) if the index is from a different version.
+    """
+    return _SUMMARY_CACHE.load_index(index_file)
+
+
+def save_summary_index(index_file: str):
+    """Parses every summary in the data dir (unless already cached) and saves them to one file."""
+    index = {}
+    for file_name in sorted(os.listdir(data_dir())):
+        if not file_name.endswith('.yaml'):
+            continue
+        file_path = os.path.join(data_dir(), file_name)
+        stamp = _file_stamp(file_path)
+        enemy_summary = _SUMMARY_CACHE.get(file_path, stamp)
+        if enemy_summary is None:
+            enemy_summary = _parse_summary_file(file_path)
+        index[file_name] = (stamp, pickle.dumps(enemy_summary))
+    _SUMMARY_CACHE.save_index(index_file, index)
+
+
+def _parse_summary_file(file_path: str) -> EnemySummary:
     with open(file_path, encoding='utf-8') as f:
         line = _consume_comments(f)
 
@@ -388,6 +507,7 @@ def load_and_merge_summary(enemy_summary: EnemySummary) -> EnemySummary:
 def dump_summary_to_file(card: BookCard, enemy_summary: EnemySummary, enemy_behavior: List[ESAction], unused_behavior: List[ESAction]):
     """Writes the enemy info, actions by level, and enemy behavior to a file."""
     file_path = _file_by_id(enemy_summary.info.monster_id)
+    _SUMMARY_CACHE.discard(file_path)
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write('{}\n'.format(_header('Info')))
         f.write('{}\n'.format(yaml.dump(enemy_summary.info, default_flow_style=False, allow_unicode=True)))
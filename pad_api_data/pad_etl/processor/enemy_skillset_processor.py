@@ -3,7 +3,6 @@ Contains code to convert a list of enemy behavior logic into a flattened structu
 called a ProcessedSkillset.
 """
 import collections
-import copy
 
 from pad_etl.data.card import BookCard
 from .enemy_skillset import *
@@ -15,6 +14,10 @@ ZERO_INDEXED_MONSTERS = [
     565,  # Goemon
 ]
 
+# Number of turns simulated per hp checkpoint. Loop detection is cheap, so this can be
+# raised to capture long-period monsters, but it may move the detected loop boundaries.
+SIMULATED_TURNS = 20
+
 
 class StandardSkillGroup(object):
     """Base class storing a list of skills."""
@@ -104,7 +107,20 @@ class ProcessedSkillset(object):
 
 
 class Context(object):
-    """Represents the game state when running through the simulator."""
+    """Represents the game state when running through the simulator.
+
+    Everything except the turn number is captured by state(), which is hashable and is used
+    as the key when memoizing simulated turns.
+    """
+
+    # Fields captured by state(); 'cards' is stored as a frozenset.
+    STATE_FIELDS = ('is_preemptive', 'do_preemptive', 'flags', 'skill_use', 'counter', 'hp',
+                    'level', 'enemies', 'cards', 'combos', 'enraged', 'damage_shield',
+                    'status_shield', 'combo_shield', 'attribute_shield', 'absorb_shield',
+                    'void_shield', 'time_debuff', 'skill_counter', 'max_skill_counter',
+                    'skill_counter_increment', 'flag_skill_use')
+
+    __slots__ = ('turn',) + STATE_FIELDS
 
     def __init__(self, level: int, max_skill_counter: int, skill_counter_increment: int):
         self.turn = 1
@@ -159,7 +175,19 @@ class Context(object):
         self.is_preemptive = False
 
     def clone(self):
-        return copy.deepcopy(self)
+        # All fields are immutable values apart from the cards set.
+        ctx = Context.__new__(Context)
+        ctx.turn = self.turn
+        ctx.set_state(self.state())
+        return ctx
+
+    def state(self) -> tuple:
+        return tuple(frozenset(self.cards) if f == 'cards' else getattr(self, f)
+                     for f in Context.STATE_FIELDS)
+
+    def set_state(self, state: tuple):
+        for f, value in zip(Context.STATE_FIELDS, state):
+            setattr(self, f, set(value) if f == 'cards' else value)
 
     def turn_event(self, enraged_this_turn: bool):
         self.turn += 1
@@ -312,7 +340,52 @@ def default_attack():
     return ESDefaultAttack()
 
 
-def loop_through(ctx, behaviors: List[Optional[ESBehavior]]) -> List[ESAction]:
+class SimulationMemo(object):
+    """Caches simulated turns for one convert call, across HP and card checkpoints.
+
+    Turns are keyed on the behavior list state (which preemptives have been nulled out) and
+    the Context state. The level is part of that state, so a memo is never shared between
+    levels.
+    """
+
+    def __init__(self):
+        self.turns = {}
+
+
+def nulled_indexes(behaviors: List[Optional[ESBehavior]]) -> Tuple[int, ...]:
+    return tuple(idx for idx, b in enumerate(behaviors) if b is None)
+
+
+def loop_through(ctx: Context, behaviors: List[Optional[ESBehavior]],
+                 memo: SimulationMemo=None) -> List[ESAction]:
+    if memo is None:
+        return simulate_turn(ctx, behaviors, [])
+
+    key = (nulled_indexes(behaviors), ctx.state())
+    cached = memo.turns.get(key)
+    if cached is None:
+        descriptions = []
+        results = simulate_turn(ctx, behaviors, descriptions)
+        memo.turns[key] = (results, ctx.state(), nulled_indexes(behaviors), descriptions)
+    else:
+        # Replay the side effects of the original simulation.
+        results, state, nulled, descriptions = cached
+        ctx.set_state(state)
+        for idx in nulled:
+            behaviors[idx] = None
+        for b, description in descriptions:
+            b.extra_description = description
+
+    # Callers modify the skill lists in place, so never hand out the cached copy.
+    return list(results)
+
+
+def simulate_turn(ctx: Context, behaviors: List[Optional[ESBehavior]],
+                  descriptions: List[Tuple[ESBehavior, str]]) -> List[ESAction]:
+    """Simulates a single turn, probing card and combo branches.
+
+    Any extra descriptions assigned to behaviors are also appended to descriptions.
+    """
     original_ctx = ctx.clone()
     results, card_branches, combo_branches = loop_through_inner(ctx, behaviors)
 
@@ -327,6 +400,7 @@ def loop_through(ctx, behaviors: List[Optional[ESBehavior]]) -> List[ESAction]:
         # Update the description to distinguish
         for nb in new_behaviors:
             nb.extra_description = '(if {} on team)'.format(list(card_ids))
+            descriptions.append((nb, nb.extra_description))
 
         # Some branches set flags to prevent them from triggering again
         ctx.flags |= card_ctx.flags
@@ -347,6 +421,7 @@ def loop_through(ctx, behaviors: List[Optional[ESBehavior]]) -> List[ESAction]:
         # Update the description to distinguish
         for nb in new_behaviors:
             nb.extra_description = '(if >={} combos last turn)'.format(combo_count)
+            descriptions.append((nb, nb.extra_description))
 
         combo_extra_actions.extend(new_behaviors)
 
@@ -631,14 +706,15 @@ def info_from_behaviors(behaviors: List[ESBehavior]):
     return base_abilities, hp_checkpoints, card_checkpoints, has_enemy_remaining_branch, death_actions
 
 
-def extract_preemptives(ctx: Context, behaviors: List[Any], card_checkpoints: Set[Tuple[int]]):
+def extract_preemptives(ctx: Context, behaviors: List[Any], card_checkpoints: Set[Tuple[int]],
+                        memo: SimulationMemo=None):
     """Simulate the initial run through the behaviors looking for preemptives.
 
     If we find a preemptive, continue onwards. If not, roll the context back.
     """
     original_ctx = ctx.clone()
 
-    cur_loop = loop_through(ctx, behaviors)
+    cur_loop = loop_through(ctx, behaviors, memo)
     if not ctx.is_preemptive:
         # Roll back the context.
         return original_ctx, None
@@ -647,58 +723,74 @@ def extract_preemptives(ctx: Context, behaviors: List[Any], card_checkpoints: Se
     return ctx, cur_loop
 
 
-def extract_turn_behaviors(ctx: Context, behaviors: List[ESBehavior], hp_checkpoint: int) -> List[List[ESBehavior]]:
-    """Simulate the first 20 turns at a specific hp checkpoint."""
+def extract_turn_behaviors(ctx: Context, behaviors: List[ESBehavior], hp_checkpoint: int,
+                           memo: SimulationMemo=None) -> List[List[ESBehavior]]:
+    """Simulate the first SIMULATED_TURNS turns at a specific hp checkpoint."""
     hp_ctx = ctx.clone()
     hp_ctx.hp = hp_checkpoint
     turn_data = []
-    for idx in range(0, 20):
+    for idx in range(0, SIMULATED_TURNS):
         started_enraged = hp_ctx.is_enraged()
-        turn_data.append(loop_through(hp_ctx, behaviors))
+        turn_data.append(loop_through(hp_ctx, behaviors, memo))
         enraged_this_turn = not started_enraged and hp_ctx.is_enraged()
         hp_ctx.turn_event(enraged_this_turn)
 
     return turn_data
 
 
-def extract_loop_indexes(turn_data: List[ESBehavior]) -> Tuple[int, int]:
-    """Find loops in the data."""
-    # Loop over every turn
-    for i_idx, check_data in enumerate(turn_data):
-        # Loop over every following turn. If the outer turn matches an inner turn moveset,
-        # we found a loop.
-        possible_loops = []
-        for j_idx in range(i_idx + 1, len(turn_data)):
-            comp_data = turn_data[j_idx]
-            if check_data == comp_data:
-                possible_loops.append((i_idx, j_idx))
-        if len(possible_loops) == 0:
-            continue
+def turn_fingerprints(turn_data: List[List[ESBehavior]]) -> List[int]:
+    """Maps each turn to an int, equal for turns whose skill lists compare equal.
 
-        # Check all possible loops
-        for check_start, check_end in possible_loops.copy():
-            # Now that we found a loop, confirm that it continues
-            loop_behavior = turn_data[check_start:check_end]
-            loop_verified = False
-
-            for j_idx in range(check_end, len(turn_data), len(loop_behavior)):
-                # Check to make sure we don't run over the edge of the array
-                j_loop_end_idx = j_idx + len(loop_behavior)
-                if j_loop_end_idx > len(turn_data):
-                    # We've overlapped the end of the array with no breaks, quit
-                    break
+    Actions compare by enemy_skill_id; anything else (unknown skills) only equals itself.
+    """
+    fingerprint_ids = {}
+    fingerprints = []
+    for skills in turn_data:
+        key = tuple(s.enemy_skill_id if isinstance(s, ESAction) else ('obj', id(s)) for s in skills)
+        fingerprints.append(fingerprint_ids.setdefault(key, len(fingerprint_ids)))
+    return fingerprints
 
-                comp_data = turn_data[j_idx:j_loop_end_idx]
-                loop_verified = loop_behavior == comp_data
-                if not loop_verified:
-                    break
 
-            if not loop_verified:
-                # The loop didn't continue so this is a bad selection, remove
-                possible_loops.remove((check_start, check_end))
+def extract_loop_indexes(turn_data: List[List[ESBehavior]]) -> Tuple[int, int]:
+    """Find loops in the data.
 
-        if len(possible_loops) > 0:
-            return possible_loops[0][0], possible_loops[0][1]
+    Returns the first turn (start, end) pair with matching skills where turns [start, end)
+    repeat in full for every complete block through to the end of the data.
+    """
+    fingerprints = turn_fingerprints(turn_data)
+    turn_count = len(fingerprints)
+
+    # Indexes of every turn with a given fingerprint, in order.
+    fingerprint_indexes = collections.defaultdict(list)
+    for idx, fp in enumerate(fingerprints):
+        fingerprint_indexes[fp].append(idx)
+
+    # For a loop size, the number of consecutive turns from each index that match
+    # the turn one loop later. Computed lazily since most sizes are never checked.
+    match_runs = {}
+
+    def match_run(loop_size: int) -> List[int]:
+        if loop_size not in match_runs:
+            runs = [0] * (turn_count + 1)
+            for idx in range(turn_count - loop_size - 1, -1, -1):
+                if fingerprints[idx] == fingerprints[idx + loop_size]:
+                    runs[idx] = runs[idx + 1] + 1
+            match_runs[loop_size] = runs
+        return match_runs[loop_size]
+
+    for i_idx, fp in enumerate(fingerprints):
+        for j_idx in fingerprint_indexes[fp]:
+            if j_idx <= i_idx:
+                continue
+            loop_size = j_idx - i_idx
+            # The loop must repeat at least once after the first occurrence; a trailing
+            # partial block is ignored.
+            blocks = (turn_count - i_idx) // loop_size
+            if blocks < 2:
+                # Larger loop sizes can't fit either.
+                break
+            if match_run(loop_size)[i_idx] >= loop_size * (blocks - 1):
+                return i_idx, j_idx
 
     raise Exception('No loop found')
 
@@ -718,9 +810,10 @@ def extract_loop_skills(hp: int, turn_data: list, loop_start: int, loop_end: int
     return HpActions(hp, timed_skill_groups, repeating_skill_groups)
 
 
-def compute_enemy_actions(ctx: Context, behaviors: List[ESBehavior], hp_checkpoints: List[int]) -> List[HpActions]:
+def compute_enemy_actions(ctx: Context, behaviors: List[ESBehavior], hp_checkpoints: List[int],
+                          memo: SimulationMemo=None) -> List[HpActions]:
     # Compute turn behaviors for every hp checkpoint
-    hp_to_turn_behaviors = {hp: extract_turn_behaviors(ctx, behaviors, hp) for hp in hp_checkpoints}
+    hp_to_turn_behaviors = {hp: extract_turn_behaviors(ctx, behaviors, hp, memo) for hp in hp_checkpoints}
 
     # Convert turn behaviors into fixed turns and repeating loops.
     hp_to_actions = {}  # type Map[int, HpActions]
@@ -772,6 +865,8 @@ def compute_enemy_actions(ctx: Context, behaviors: List[ESBehavior], hp_checkpoi
 
 
 def convert(card: BookCard, enemy_behavior: List[ESBehavior], level: int):
+    """Computes the skillset for a monster at a level."""
+    memo = SimulationMemo()
     force_one_enemy = int(card.unknown_009) == 5
     enemy_skill_max_counter = card.enemy_skill_max_counter
     enemy_skill_counter_increment = card.enemy_skill_counter_increment
@@ -798,7 +893,7 @@ def convert(card: BookCard, enemy_behavior: List[ESBehavior], level: int):
         ctx.enemies = 1
         has_enemy_remaining_branch = False
 
-    ctx, preemptives = extract_preemptives(ctx, behaviors, card_checkpoints)
+    ctx, preemptives = extract_preemptives(ctx, behaviors, card_checkpoints, memo)
     if ctx is None:
         # Some monsters have no skillset at all
         return skillset
@@ -810,7 +905,7 @@ def convert(card: BookCard, enemy_behavior: List[ESBehavior], level: int):
             return skillset
 
     # Compute the standard action moveset
-    hp_actions = compute_enemy_actions(ctx.clone(), behaviors, hp_checkpoints)
+    hp_actions = compute_enemy_actions(ctx.clone(), behaviors, hp_checkpoints, memo)
     clean_skillset(skillset.moveset, hp_actions)
 
     # Simulate enemies being defeated
@@ -821,7 +916,7 @@ def convert(card: BookCard, enemy_behavior: List[ESBehavior], level: int):
             enemy_moveset = EnemyRemainingMoveset(ecount)
             enemy_ctx = ctx.clone()
             enemy_ctx.enemies = ecount
-            enemy_actions = compute_enemy_actions(enemy_ctx, behaviors, hp_checkpoints)
+            enemy_actions = compute_enemy_actions(enemy_ctx, behaviors, hp_checkpoints, memo)
             clean_skillset(enemy_moveset, enemy_actions)
             enemy_movesets.append(enemy_moveset)
 
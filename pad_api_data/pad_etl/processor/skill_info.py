@@ -4,6 +4,7 @@
 
 from collections import defaultdict
 import json
+from multiprocessing import Pool
 from operator import itemgetter
 import sys
 
@@ -17,6 +18,11 @@ def make_defaultlist(fx, initial=[]):
     df.extend(initial)
     return df
 
+
+def param(x, index):
+    """Raw skill arg at index, defaulting to 0 like make_defaultlist(int, x)[index]."""
+    return x[index] if index < len(x) else 0
+
 # this is used to name the skill ids and their arguments
 
 
@@ -90,21 +96,42 @@ def convert_with_defaults(type_name, args, defaults):
 
 
 def convert(type_name, arguments):
+    """Compiles an argument spec into a converter returning (type_name, args).
+
+    Each spec value is either a constant or an (index, funct) extractor applied to the raw
+    skill args; missing args read as 0.
+    """
+    fields = [(name, t[0], t[1]) if type(t) == tuple else (name, None, t)
+              for name, t in arguments.items()]
+
+    # Slices need the padding behavior of defaultlist; plain indexes can skip building one.
+    needs_defaultlist = any(index is not None and not (type(index) == int and index >= 0)
+                            for _, index, _ in fields)
+
     def i(x):
         args = {}
-        x = make_defaultlist(int, x)
-
-        for name, t in arguments.items():
-            if type(t) == tuple:
-                index, funct = t[0], t[1]
-                value = x[index]
-                args[name] = funct(value)
-            else:
-                args[name] = t
+        if needs_defaultlist:
+            x = make_defaultlist(int, x)
+            for name, index, value in fields:
+                args[name] = value if index is None else value(x[index])
+        else:
+            size = len(x)
+            for name, index, value in fields:
+                if index is None:
+                    args[name] = value
+                else:
+                    args[name] = value(x[index] if index < size else 0)
         return (type_name, args)
     return i
 
 
+def switch_convert(selector, cases, default):
+    """Dispatches to cases[selector(x)], or default if no case matches."""
+    def f(x):
+        return cases.get(selector(x), default)(x)
+    return f
+
+
 def fmt_multiplier_text(hp_mult, atk_mult, rcv_mult):
     if hp_mult == atk_mult and atk_mult == rcv_mult:
         if hp_mult == 1:
@@ -231,10 +258,12 @@ attr_nuke_convert_backups = {'attribute': 0,
 
 
 def attr_nuke_convert(arguments):
+    base_convert = convert_with_defaults('attack_attr_x_atk',
+                                         arguments,
+                                         attr_nuke_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attack_attr_x_atk',
-                                     arguments,
-                                     attr_nuke_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + fmt_mult(c['multiplier']) + 'x ATK ' + ATTRIBUTES[int(
             c['attribute'])] + ' damage to ' + fmt_mass_atk(c['mass_attack'])
         return 'attack_attr_x_atk', c
@@ -248,10 +277,12 @@ fixed_attr_nuke_convert_backups = {'attribute': 0,
 
 
 def fixed_attr_nuke_convert(arguments):
+    base_convert = convert_with_defaults('attack_attr_damage',
+                                         arguments,
+                                         fixed_attr_nuke_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attack_attr_damage',
-                                     arguments,
-                                     fixed_attr_nuke_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + str(c['damage']) + ' ' + ATTRIBUTES[int(
             c['attribute'])] + ' damage to ' + fmt_mass_atk(c['mass_attack'])
         return 'attack_attr_damage', c
@@ -264,10 +295,12 @@ self_att_nuke_convert_backups = {'multiplier': 1,
 
 
 def self_att_nuke_convert(arguments):
+    base_convert = convert_with_defaults('attack_x_atk',
+                                         arguments,
+                                         self_att_nuke_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attack_x_atk',
-                                     arguments,
-                                     self_att_nuke_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + fmt_mult(c['multiplier']) + \
             'x ATK damage to ' + fmt_mass_atk(c['mass_attack'])
         return 'attack_x_atk', c
@@ -280,10 +313,12 @@ shield_convert_backups = {'duration': 1,
 
 
 def shield_convert(arguments):
+    base_convert = convert_with_defaults('damage_shield_buff',
+                                         arguments,
+                                         shield_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('damage_shield_buff',
-                                     arguments,
-                                     shield_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + fmt_reduct_text(c['reduction'])
         return 'damage_shield_buff', c
     return f
@@ -296,10 +331,12 @@ elemental_shield_backups = {'duration': 0,
 
 
 def elemental_shield_convert(arguments):
+    base_convert = convert_with_defaults('elemental_shield',
+                                         arguments,
+                                         elemental_shield_backups)
+
     def f(x):
-        _, c = convert_with_defaults('elemental_shield',
-                                     arguments,
-                                     elemental_shield_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration'])
         if c['reduction'] == 1:
             c['skill_text'] += 'void all ' + ATTRIBUTES[int(c['attribute'])] + ' damage'
@@ -318,10 +355,12 @@ drain_attack_backups = {'atk_multiplier': 0,
 
 
 def drain_attack_convert(arguments):
+    base_convert = convert_with_defaults('drain_attack',
+                                         arguments,
+                                         drain_attack_backups)
+
     def f(x):
-        _, c = convert_with_defaults('drain_attack',
-                                     arguments,
-                                     drain_attack_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + \
             fmt_mult(c['atk_multiplier']) + 'x ATK damage to ' + fmt_mass_atk(c['mass_attack'])
         if c['recover_multiplier'] == 1:
@@ -338,10 +377,12 @@ poison_convert_backups = {'multiplier': 1,
 
 
 def poison_convert(arguments):
+    base_convert = convert_with_defaults('poison',
+                                         arguments,
+                                         poison_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('poison',
-                                     arguments,
-                                     poison_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Poison all enemies (' + fmt_mult(c['multiplier']) + 'x ATK)'
         return 'poison', c
     return f
@@ -352,10 +393,12 @@ ctw_convert_backups = {'duration': 0,
 
 
 def ctw_convert(arguments):
+    base_convert = convert_with_defaults('change_the_world',
+                                         arguments,
+                                         ctw_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('change_the_world',
-                                     arguments,
-                                     ctw_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Freely move orbs for ' + str(c['duration']) + ' seconds'
         return 'change_the_world', c
     return f
@@ -366,10 +409,12 @@ gravity_convert_backups = {'percentage_hp': 0,
 
 
 def gravity_convert(arguments):
+    base_convert = convert_with_defaults('gravity',
+                                         arguments,
+                                         gravity_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('gravity',
-                                     arguments,
-                                     gravity_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Reduce enemies\' HP by ' + fmt_mult(c['percentage_hp'] * 100) + '%'
         return 'gravity', c
     return f
@@ -385,10 +430,12 @@ heal_active_convert_backups = {'hp': 0,
 
 
 def heal_active_convert(arguments):
+    base_convert = convert_with_defaults('heal_active',
+                                         arguments,
+                                         heal_active_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('heal_active',
-                                     arguments,
-                                     heal_active_convert_backups)(x)
+        _, c = base_convert(x)
         rcv_mult = c['rcv_multiplier_as_hp']
         php = c['percentage_max_hp']
         trcv_mult = c['team_rcv_multiplier_as_hp']
@@ -422,10 +469,12 @@ single_orb_change_convert_backups = {'from': 0,
 
 
 def single_orb_change_convert(arguments):
+    base_convert = convert_with_defaults('single_orb_convert',
+                                         arguments,
+                                         single_orb_change_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('single_orb_convert',
-                                     arguments,
-                                     single_orb_change_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Change ' + \
             ATTRIBUTES[int(c['from'])] + ' orbs to ' + ATTRIBUTES[int(c['to'])] + ' orbs'
         return 'single_orb_convert', c
@@ -437,10 +486,12 @@ delay_convert_backups = {'turns': 0,
 
 
 def delay_convert(arguments):
+    base_convert = convert_with_defaults('delay_convert',
+                                         arguments,
+                                         delay_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('delay_convert',
-                                     arguments,
-                                     delay_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Delay enemies for ' + str(c['turns']) + ' turns'
         return 'delay_convert', c
     return f
@@ -452,10 +503,12 @@ defense_reduction_convert_backups = {'duration': 0,
 
 
 def defense_reduction_convert(arguments):
+    base_convert = convert_with_defaults('defense_reduction',
+                                         arguments,
+                                         defense_reduction_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('defense_reduction',
-                                     arguments,
-                                     defense_reduction_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + \
             'reduce enemies\' defense by ' + fmt_mult(c['reduction'] * 100) + '%'
         return 'defense_reduction', c
@@ -470,10 +523,12 @@ double_orb_convert_backups = {'from_1': 0,
 
 
 def double_orb_convert(arguments):
+    base_convert = convert_with_defaults('double_orb_convert',
+                                         arguments,
+                                         double_orb_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('double_orb_convert',
-                                     arguments,
-                                     double_orb_convert_backups)(x)
+        _, c = base_convert(x)
         if c['to_1'] == c['to_2']:
             skill_text = 'Change {}, {} orbs to {} orbs'.format(ATTRIBUTES[int(c['from_1'])],
                                                                 ATTRIBUTES[int(c['from_2'])],
@@ -497,10 +552,12 @@ damage_to_att_enemy_backups = {'enemy_attribute': 0,
 
 
 def damage_to_att_enemy_convert(arguments):
+    base_convert = convert_with_defaults('damage_to_att_enemy',
+                                         arguments,
+                                         damage_to_att_enemy_backups)
+
     def f(x):
-        _, c = convert_with_defaults('damage_to_att_enemy',
-                                     arguments,
-                                     damage_to_att_enemy_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + str(c['damage']) + ' ' + ATTRIBUTES[int(
             c['attack_attribute'])] + ' damage to all ' + ATTRIBUTES[int(c['enemy_attribute'])] + ' Att. enemies'
         return 'damage_to_att_enemy', c
@@ -513,10 +570,12 @@ rcv_boost_backups = {'duration': 0,
 
 
 def rcv_boost_convert(arguments):
+    base_convert = convert_with_defaults('rcv_boost',
+                                         arguments,
+                                         rcv_boost_backups)
+
     def f(x):
-        _, c = convert_with_defaults('rcv_boost',
-                                     arguments,
-                                     rcv_boost_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + fmt_mult(c['multiplier']) + 'x RCV'
         return 'rcv_boost', c
     return f
@@ -529,10 +588,12 @@ attribute_attack_boost_backups = {'duration': 0,
 
 
 def attribute_attack_boost_convert(arguments):
+    base_convert = convert_with_defaults('attribute_attack_boost',
+                                         arguments,
+                                         attribute_attack_boost_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attribute_attack_boost',
-                                     arguments,
-                                     attribute_attack_boost_backups)(x)
+        _, c = base_convert(x)
         skill_text = ''
         if 5 in c['for_attr']:
             c['for_attr'].remove(5)
@@ -550,10 +611,12 @@ mass_attack_backups = {'duration': 0,
 
 
 def mass_attack_convert(arguments):
+    base_convert = convert_with_defaults('mass_attack_buff',
+                                         arguments,
+                                         mass_attack_backups)
+
     def f(x):
-        _, c = convert_with_defaults('mass_attack_buff',
-                                     arguments,
-                                     mass_attack_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + 'all attacks become mass attack'
         return 'mass_attack_buff', c
     return f
@@ -564,10 +627,12 @@ enhance_backups = {'orbs': [],
 
 
 def enhance_convert(arguments):
+    base_convert = convert_with_defaults('enhance_orbs',
+                                         arguments,
+                                         enhance_backups)
+
     def f(x):
-        _, c = convert_with_defaults('enhance_orbs',
-                                     arguments,
-                                     enhance_backups)(x)
+        _, c = base_convert(x)
         for_attr = c['orbs']
         for_skill_text = ''
 
@@ -587,10 +652,12 @@ lock_backups = {'orbs': [],
 
 
 def lock_convert(arguments):
+    base_convert = convert_with_defaults('lock_orbs',
+                                         arguments,
+                                         lock_backups)
+
     def f(x):
-        _, c = convert_with_defaults('lock_orbs',
-                                     arguments,
-                                     lock_backups)(x)
+        _, c = base_convert(x)
         for_attr = c['orbs']
         for_skill_text = ''
 
@@ -608,10 +675,12 @@ laser_backups = {'damage': 0,
 
 
 def laser_convert(arguments):
+    base_convert = convert_with_defaults('laser',
+                                         arguments,
+                                         laser_backups)
+
     def f(x):
-        _, c = convert_with_defaults('laser',
-                                     arguments,
-                                     laser_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + str(c['damage']) + \
             ' fixed damage to ' + fmt_mass_atk(c['mass_attack'])
         return 'laser', c
@@ -623,10 +692,12 @@ no_skyfall_backups = {'duration': 0,
 
 
 def no_skyfall_convert(arguments):
+    base_convert = convert_with_defaults('no_skyfall_buff',
+                                         arguments,
+                                         no_skyfall_backups)
+
     def f(x):
-        _, c = convert_with_defaults('no_skyfall_buff',
-                                     arguments,
-                                     no_skyfall_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + 'no skyfall'
         return 'no_skyfall_buff', c
     return f
@@ -638,10 +709,12 @@ enhance_skyfall_backups = {'duration': 0,
 
 
 def enhance_skyfall_convert(arguments):
+    base_convert = convert_with_defaults('enhance_skyfall_buff',
+                                         arguments,
+                                         enhance_skyfall_backups)
+
     def f(x):
-        _, c = convert_with_defaults('enhance_skyfall_buff',
-                                     arguments,
-                                     enhance_skyfall_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + 'enhanced orbs are more likely to appear by ' + \
             fmt_mult(c['percentage_increase'] * 100) + '%'
         return 'enhance_skyfall_buff', c
@@ -656,10 +729,12 @@ auto_heal_backups = {'duration': 0,
 
 
 def auto_heal_convert(arguments):
+    base_convert = convert_with_defaults('auto_heal',
+                                         arguments,
+                                         auto_heal_backups)
+
     def f(x):
-        _, c = convert_with_defaults('auto_heal',
-                                     arguments,
-                                     auto_heal_backups)(x)
+        _, c = base_convert(x)
         skill_text = ''
         unbind = c['unbind']
         awoken_unbind = c['awoken_unbind']
@@ -688,10 +763,12 @@ absorb_mechanic_void_backups = {'duration': 0,
 
 
 def absorb_mechanic_void_convert(arguments):
+    base_convert = convert_with_defaults('absorb_mechanic_void',
+                                         arguments,
+                                         absorb_mechanic_void_backups)
+
     def f(x):
-        _, c = convert_with_defaults('absorb_mechanic_void',
-                                     arguments,
-                                     absorb_mechanic_void_backups)(x)
+        _, c = base_convert(x)
         if c['attribute_absorb'] and c['damage_absorb']:
             c['skill_text'] += fmt_duration(c['duration']) + \
                 'bypass damage absorb shield and att. absorb shield effects'
@@ -706,10 +783,12 @@ void_mechanic_backups = {'duration': 0,
 			 'skill_text': ''}
 
 def void_mechanic_convert(arguments):
-	def f(x):
-		_, c = convert_with_defaults('void_mechanic',
+	base_convert = convert_with_defaults('void_mechanic',
 					     arguments,
-					     void_mechanic_backups)(x)
+					     void_mechanic_backups)
+
+	def f(x):
+		_, c = base_convert(x)
 		c['skill_text'] += fmt_duration(c['duration']) + 'bypass void damage shield effects'
 		return 'void_mechanic', c
 	return f
@@ -719,10 +798,12 @@ true_gravity_convert_backups = {'percentage_max_hp': 0,
 
 
 def true_gravity_convert(arguments):
+    base_convert = convert_with_defaults('true_gravity',
+                                         arguments,
+                                         true_gravity_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('true_gravity',
-                                     arguments,
-                                     true_gravity_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal damage equal to ' + \
             fmt_mult(c['percentage_max_hp'] * 100) + '% of enemies\' max HP'
         return 'true_gravity', c
@@ -735,10 +816,12 @@ extra_combo_backups = {'duration': 0,
 
 
 def extra_combo_convert(arguments):
+    base_convert = convert_with_defaults('extra_combo',
+                                         arguments,
+                                         extra_combo_backups)
+
     def f(x):
-        _, c = convert_with_defaults('extra_combo',
-                                     arguments,
-                                     extra_combo_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + \
             'increase combo count by ' + str(c['combos'])
         return 'extra_combo', c
@@ -751,10 +834,12 @@ awakening_heal_backups = {'awakenings': [],
 
 
 def awakening_heal_convert(arguments):
+    base_convert = convert_with_defaults('awakening_heal',
+                                         arguments,
+                                         awakening_heal_backups)
+
     def f(x):
-        _, c = convert_with_defaults('awakening_heal',
-                                     arguments,
-                                     awakening_heal_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Recover ' + str(c['amount_per']) + ' HP for each '
         for i in range(0, len(c['awakenings']) - 1):
             if c['awakenings'][i + 1] != 0:
@@ -775,10 +860,12 @@ awakening_attack_boost_backups = {'duration': 0,
 
 
 def awakening_attack_boost_convert(arguments):
+    base_convert = convert_with_defaults('awakening_attack_boost',
+                                         arguments,
+                                         awakening_attack_boost_backups)
+
     def f(x):
-        _, c = convert_with_defaults('awakening_attack_boost',
-                                     arguments,
-                                     awakening_attack_boost_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + 'increase ATK by ' + \
             fmt_mult(c['amount_per'] * 100) + '% for each '
         for i in range(0, len(c['awakenings']) - 1):
@@ -800,10 +887,12 @@ awakening_shield_backups = {'duration': 0,
 
 
 def awakening_shield_convert(arguments):
+    base_convert = convert_with_defaults('awakening_shield',
+                                         arguments,
+                                         awakening_shield_backups)
+
     def f(x):
-        _, c = convert_with_defaults('awakening_shield',
-                                     arguments,
-                                     awakening_shield_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + 'reduce damage taken by ' + \
             fmt_mult(c['amount_per'] * 100) + '% for each '
         for i in range(0, len(c['awakenings']) - 1):
@@ -823,10 +912,12 @@ change_enemies_attribute_backups = {'attribute': 0,
 
 
 def change_enemies_attribute_convert(arguments):
+    base_convert = convert_with_defaults('change_enemies_attribute',
+                                         arguments,
+                                         change_enemies_attribute_backups)
+
     def f(x):
-        _, c = convert_with_defaults('change_enemies_attribute',
-                                     arguments,
-                                     change_enemies_attribute_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Change all enemies to ' + ATTRIBUTES[c['attribute']] + ' Att.'
         return 'change_enemies_attribute', c
     return f
@@ -838,10 +929,12 @@ haste_backups = {'turns': 0,
 
 
 def haste_convert(arguments):
+    base_convert = convert_with_defaults('haste',
+                                         arguments,
+                                         haste_backups)
+
     def f(x):
-        _, c = convert_with_defaults('haste',
-                                     arguments,
-                                     haste_backups)(x)
+        _, c = base_convert(x)
         if c['turns'] == c['max_turns']:
             if c['turns'] > 1:
                 c['skill_text'] += 'Charge allies\' skill by ' + str(c['turns']) + ' turns'
@@ -860,11 +953,12 @@ random_orb_change_backups = {'from': [],
 
 
 def random_orb_change_convert(arguments):
-    def f(x):
+    base_convert = convert_with_defaults('random_orb_change',
+                                         arguments,
+                                         random_orb_change_backups)
 
-        _, c = convert_with_defaults('random_orb_change',
-                                     arguments,
-                                     random_orb_change_backups)(x)
+    def f(x):
+        _, c = base_convert(x)
         c['skill_text'] += 'Change '
         if c['from'] == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]:
             c['skill_text'] += 'all orbs to '
@@ -892,10 +986,12 @@ attack_attr_x_team_atk_backups = {'team_attributes': [],
 
 
 def attack_attr_x_team_atk_convert(arguments):
+    base_convert = convert_with_defaults('attack_attr_x_team_atk',
+                                         arguments,
+                                         attack_attr_x_team_atk_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attack_attr_x_team_atk',
-                                     arguments,
-                                     attack_attr_x_team_atk_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + ATTRIBUTES[c['attack_attribute']] + \
             ' damage equal to ' + fmt_mult(c['multiplier']) + 'x of team\'s total '
         if len(c['team_attributes']) == 1:
@@ -916,10 +1012,12 @@ spawn_orb_backups = {'amount': 0,
 
 
 def spawn_orb_convert(arguments):
+    base_convert = convert_with_defaults('spawn_orb',
+                                         arguments,
+                                         spawn_orb_backups)
+
     def f(x):
-        _, c = convert_with_defaults('spawn_orb',
-                                     arguments,
-                                     spawn_orb_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Create ' + str(c['amount']) + ' '
         if len(c['orbs']) == 1:
             c['skill_text'] += ATTRIBUTES[c['orbs'][0]] + ' orbs'
@@ -949,10 +1047,12 @@ move_time_buff_backups = {'duration': 0,
 
 
 def move_time_buff_convert(arguments):
+    base_convert = convert_with_defaults('move_time_buff',
+                                         arguments,
+                                         move_time_buff_backups)
+
     def f(x):
-        _, c = convert_with_defaults('move_time_buff',
-                                     arguments,
-                                     move_time_buff_backups)(x)
+        _, c = base_convert(x)
         if c['static'] == 0:
             c['skill_text'] += fmt_duration(c['duration']) + \
                 fmt_mult(c['percentage']) + 'x orb move time'
@@ -968,10 +1068,12 @@ row_change_backups = {'rows': [],
 
 
 def row_change_convert(arguments):
+    base_convert = convert_with_defaults('row_change',
+                                         arguments,
+                                         row_change_backups)
+
     def f(x):
-        _, c = convert_with_defaults('row_change',
-                                     arguments,
-                                     row_change_backups)(x)
+        _, c = base_convert(x)
 
         ROW_INDEX = {
             0: 'top row',
@@ -1005,10 +1107,12 @@ column_change_backups = {'columns': [],
 
 
 def column_change_convert(arguments):
+    base_convert = convert_with_defaults('column_change',
+                                         arguments,
+                                         column_change_backups)
+
     def f(x):
-        _, c = convert_with_defaults('column_change',
-                                     arguments,
-                                     column_change_backups)(x)
+        _, c = base_convert(x)
 
         COLUMN_INDEX = {
             0: 'far left column',
@@ -1042,10 +1146,12 @@ change_skyfall_backups = {'orbs': [],
 
 
 def change_skyfall_convert(arguments):
+    base_convert = convert_with_defaults('change_skyfall',
+                                         arguments,
+                                         change_skyfall_backups)
+
     def f(x):
-        _, c = convert_with_defaults('change_skyfall',
-                                     arguments,
-                                     change_skyfall_backups)(x)
+        _, c = base_convert(x)
         skill_text = ''
         skill_text += fmt_duration(c['duration'])
         rate = fmt_mult(c['percentage'] * 100)
@@ -1068,10 +1174,12 @@ random_nuke_backups = {'attribute': 0,
 
 
 def random_nuke_convert(arguments):
+    base_convert = convert_with_defaults('random_nuke',
+                                         arguments,
+                                         random_nuke_backups)
+
     def f(x):
-        _, c = convert_with_defaults('random_nuke',
-                                     arguments,
-                                     random_nuke_backups)(x)
+        _, c = base_convert(x)
         if c['minimum_multiplier'] != c['maximum_multiplier']:
             c['skill_text'] += 'Randomized ' + ATTRIBUTES[c['attribute']] + ' damage to ' + fmt_mass_atk(
                 c['mass_attack']) + '(' + fmt_mult(c['minimum_multiplier']) + '~' + fmt_mult(c['maximum_multiplier']) + 'x)'
@@ -1089,10 +1197,12 @@ counterattack_backups = {'duration': 0,
 
 
 def counterattack_convert(arguments):
+    base_convert = convert_with_defaults('counterattack',
+                                         arguments,
+                                         counterattack_backups)
+
     def f(x):
-        _, c = convert_with_defaults('counterattack',
-                                     arguments,
-                                     counterattack_backups)(x)
+        _, c = base_convert(x)
 
         c['skill_text'] += fmt_duration(c['duration']) + fmt_mult(c['multiplier']) + \
             'x ' + ATTRIBUTES[c['attribute']] + ' counterattack'
@@ -1105,10 +1215,12 @@ board_change_backups = {'attributes': [],
 
 
 def board_change_convert(arguments):
+    base_convert = convert_with_defaults('board_change',
+                                         arguments,
+                                         board_change_backups)
+
     def f(x):
-        _, c = convert_with_defaults('board_change',
-                                     arguments,
-                                     board_change_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Change all orbs to '
         if len(c['attributes']) > 1:
             for i in c['attributes'][:-1]:
@@ -1129,10 +1241,12 @@ suicide_random_nuke_backups = {'attribute': 0,
 
 
 def suicide_random_nuke_convert(arguments):
+    base_convert = convert_with_defaults('suicide_random_nuke',
+                                         arguments,
+                                         suicide_random_nuke_backups)
+
     def f(x):
-        _, c = convert_with_defaults('suicide_random_nuke',
-                                     arguments,
-                                     suicide_random_nuke_backups)(x)
+        _, c = base_convert(x)
         if c['hp_remaining'] == 0:
             c['skill_text'] += 'Reduce HP to 1; '
         else:
@@ -1155,10 +1269,12 @@ suicide_nuke_backups = {'attribute': 0,
 
 
 def suicide_nuke_convert(arguments):
+    base_convert = convert_with_defaults('suicide_nuke',
+                                         arguments,
+                                         suicide_nuke_backups)
+
     def f(x):
-        _, c = convert_with_defaults('suicide_nuke',
-                                     arguments,
-                                     suicide_nuke_backups)(x)
+        _, c = base_convert(x)
         if c['hp_remaining'] == 0:
             c['skill_text'] += 'Reduce HP to 1; '
         else:
@@ -1176,10 +1292,12 @@ suicide_backups = {
 
 
 def suicide_convert(arguments):
+    base_convert = convert_with_defaults('suicide',
+                                         arguments,
+                                         suicide_backups)
+
     def f(x):
-        _, c = convert_with_defaults('suicide',
-                                     arguments,
-                                     suicide_backups)(x)
+        _, c = base_convert(x)
         if c['hp_remaining'] == 0:
             c['skill_text'] += 'Reduce HP to 1'
         else:
@@ -1195,10 +1313,12 @@ type_attack_boost_backups = {'duration': 0,
 
 
 def type_attack_boost_convert(arguments):
+    base_convert = convert_with_defaults('type_attack_boost',
+                                         arguments,
+                                         type_attack_boost_backups)
+
     def f(x):
-        _, c = convert_with_defaults('type_attack_boost',
-                                     arguments,
-                                     type_attack_boost_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_duration(c['duration']) + fmt_mult(c['multiplier']) + 'x ATK for '
         if len(c['types']) > 1:
             for i in c['types'][:-1]:
@@ -1218,10 +1338,12 @@ grudge_strike_backups = {'mass_attack': False,
 
 
 def grudge_strike_convert(arguments):
+    base_convert = convert_with_defaults('grudge_strike',
+                                         arguments,
+                                         grudge_strike_backups)
+
     def f(x):
-        _, c = convert_with_defaults('grudge_strike',
-                                     arguments,
-                                     grudge_strike_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + ATTRIBUTES[c['attribute']] + ' damage to ' + fmt_mass_atk(c['mass_attack']) + ' depending on HP level (' + fmt_mult(
             c['low_multiplier']) + 'x at 1 HP and ' + fmt_mult(c['high_multiplier']) + 'x at 100% HP)'
         return 'grudge_strike', c
@@ -1236,10 +1358,12 @@ drain_attr_attack_backups = {'attribute': 0,
 
 
 def drain_attr_attack_convert(arguments):
+    base_convert = convert_with_defaults('drain_attr_attack',
+                                         arguments,
+                                         drain_attr_attack_backups)
+
     def f(x):
-        _, c = convert_with_defaults('drain_attr_attack',
-                                     arguments,
-                                     drain_attr_attack_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + fmt_mult(c['atk_multiplier']) + 'x ATK ' + \
             ATTRIBUTES[c['attribute']] + ' damage to ' + fmt_mass_atk(c['mass_attack'])
         if c['recover_multiplier'] == 1:
@@ -1257,10 +1381,12 @@ attribute_change_backups = {'duration': 0,
 
 
 def attribute_change_convert(arguments):
+    base_convert = convert_with_defaults('attribute_change',
+                                         arguments,
+                                         attribute_change_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attribute_change',
-                                     arguments,
-                                     attribute_change_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Change own Att. to ' + \
             ATTRIBUTES[c['attribute']] + ' for ' + str(c['duration']) + ' turns'
         return 'attribute_change', c
@@ -1274,10 +1400,12 @@ multi_hit_laser_backups = {'damage': 0,
 
 
 def multi_hit_laser_convert(arguments):
+    base_convert = convert_with_defaults('multi_hit_laser',
+                                         arguments,
+                                         multi_hit_laser_backups)
+
     def f(x):
-        _, c = convert_with_defaults('multi_hit_laser',
-                                     arguments,
-                                     multi_hit_laser_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + str(c['damage']) + ' damage to ' + \
             fmt_mass_atk(c['mass_attack'])
         return 'multi_hit_laser', c
@@ -1291,10 +1419,12 @@ hp_nuke_convert_backups = {'multiplier': 1,
 
 
 def hp_nuke_convert(arguments):
+    base_convert = convert_with_defaults('hp_nuke',
+                                         arguments,
+                                         hp_nuke_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('hp_nuke',
-                                     arguments,
-                                     hp_nuke_convert_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Deal ' + ATTRIBUTES[c['attribute']] + ' damage equal to ' + fmt_mult(c['multiplier']) +\
             'x of team\'s total HP to ' + fmt_mass_atk(c['mass_attack'])
         return 'hp_nuke', c
@@ -1310,10 +1440,12 @@ fixed_pos_convert_backups = {'row_pos_1': [],
                              'skill_text': ''}
 
 def fixed_pos_convert(arguments):
+    base_convert = convert_with_defaults('fixed_pos',
+                                         arguments,
+                                         fixed_pos_convert_backups)
+
     def f(x):
-        _, c = convert_with_defaults('fixed_pos',
-                                     arguments,
-                                     fixed_pos_convert_backups)(x)
+        _, c = base_convert(x)
         ROW_INDEX = {
             0: 'top row',
             1: '2nd row from top',
@@ -1406,10 +1538,12 @@ match_disable_backups = {'duration': 0,
                          'skill_text': ''}
 
 def match_disable_convert(arguments):
+    base_convert = convert_with_defaults('match_disable',
+                                         arguments,
+                                         match_disable_backups)
+
     def f(x):
-        _, c = convert_with_defaults('match_disable',
-                                     arguments,
-                                     match_disable_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] = 'Reduce unable to match orbs effect by {} turns'.format(c['duration'])
         return 'match_disable', c
     return f
@@ -1442,10 +1576,12 @@ passive_stats_backups = {'time': 0, 'for_attr': [], 'for_type': [], 'hp_multipli
 
 
 def passive_stats_convert(arguments):
+    base_convert = convert_with_defaults('passive_stats',
+                                         arguments,
+                                         passive_stats_backups)
+
     def f(x):
-        _, c = convert_with_defaults('passive_stats',
-                                     arguments,
-                                     passive_stats_backups)(x)
+        _, c = base_convert(x)
 
         skill_text = ''
         if c['time'] > 0:
@@ -1471,10 +1607,12 @@ BELOW = False
 
 
 def threshold_stats_convert(above, arguments):
+    base_convert = convert_with_defaults('above_threshold_stats' if above else 'below_threshold_stats',
+                                         arguments,
+                                         threshold_stats_backups)
+
     def f(x):
-        tag, c = convert_with_defaults('above_threshold_stats' if above else 'below_threshold_stats',
-                                       arguments,
-                                       threshold_stats_backups)(x)
+        tag, c = base_convert(x)
         threshold = c['threshold']
         skill_text = fmt_stats_type_attr_bonus(c, reduce_join_txt=' and ', skip_attr_all=True)
         if threshold != 1:
@@ -1495,10 +1633,12 @@ combo_match_backups = {'for_attr': [], 'for_type': [], 'minimum_combos': 0, 'min
 
 
 def combo_match_convert(arguments):
+    base_convert = convert_with_defaults('combo_match',
+                                         arguments,
+                                         combo_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('combo_match',
-                                     arguments,
-                                     combo_match_backups)(x)
+        _, c = base_convert(x)
         skill_text = c['skill_text']
         max_combos = c['maximum_combos']
         min_combos = c['minimum_combos']
@@ -1530,10 +1670,12 @@ attribute_match_backups = {'attributes': [], 'minimum_attributes': 0, 'minimum_a
 
 
 def attribute_match_convert(arguments):
+    base_convert = convert_with_defaults('attribute_match',
+                                         arguments,
+                                         attribute_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('attribute_match',
-                                     arguments,
-                                     attribute_match_backups)(x)
+        _, c = base_convert(x)
         skill_text = c['skill_text']
 
         skill_text += fmt_stats_type_attr_bonus(c, reduce_join_txt=' and ', skip_attr_all=True)
@@ -1594,10 +1736,12 @@ multi_attribute_match_backups = {'attributes': [], 'minimum_match': 0, 'minimum_
 
 
 def multi_attribute_match_convert(arguments):
+    base_convert = convert_with_defaults('multi-attribute_match',
+                                         arguments,
+                                         multi_attribute_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('multi-attribute_match',
-                                     arguments,
-                                     multi_attribute_match_backups)(x)
+        _, c = base_convert(x)
         attributes = c['attributes']
         if not attributes:
             return 'multi-attribute_match', c
@@ -1650,10 +1794,12 @@ mass_match_backups = {'attributes': [], 'minimum_count': 0, 'minimum_atk_multipl
 
 
 def mass_match_convert(arguments):
+    base_convert = convert_with_defaults('mass_match',
+                                         arguments,
+                                         mass_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('mass_match',
-                                     arguments,
-                                     mass_match_backups)(x)
+        _, c = base_convert(x)
         max_count = c['maximum_count']
         min_count = c['minimum_count']
 
@@ -1692,10 +1838,12 @@ after_attack_on_match_backups = {'multiplier': 0,
 
 
 def after_attack_convert(arguments):
+    base_convert = convert_with_defaults('after_attack_on_match',
+                                         arguments,
+                                         after_attack_on_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('after_attack_on_match',
-                                     arguments,
-                                     after_attack_on_match_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['multiplier']) + \
             'x ATK additional damage when matching orbs'
         return 'after_attack_on_match', c
@@ -1706,10 +1854,12 @@ heal_on_match_backups = {'multiplier': 0, 'skill_text': '', 'parameter': [1.0, 1
 
 
 def heal_on_convert(arguments):
+    base_convert = convert_with_defaults('heal_on',
+                                         arguments,
+                                         heal_on_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('heal_on',
-                                     arguments,
-                                     heal_on_match_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['multiplier']) + \
             'x RCV additional heal when matching orbs'
         return 'heal on match', c
@@ -1720,10 +1870,12 @@ resolve_backups = {'threshold': 0, 'skill_text': '', 'parameter': [1.0, 1.0, 1.0
 
 
 def resolve_convert(arguments):
+    base_convert = convert_with_defaults('resolve',
+                                         arguments,
+                                         resolve_backups)
+
     def f(x):
-        _, c = convert_with_defaults('resolve',
-                                     arguments,
-                                     resolve_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'May survive when HP is reduced to 0 (HP>' + str(
             c['threshold'] * 100).rstrip('0').rstrip('.') + '%)'
         return 'resolve', c
@@ -1736,10 +1888,12 @@ bonus_move_time_backups = {'time': 0.0, 'for_attr': [], 'for_type': [],
 
 
 def bonus_time_convert(arguments):
+    base_convert = convert_with_defaults('bonus_move_time',
+                                         arguments,
+                                         bonus_move_time_backups)
+
     def f(x):
-        _, c = convert_with_defaults('bonus_move_time',
-                                     arguments,
-                                     bonus_move_time_backups)(x)
+        _, c = base_convert(x)
         skill_text = fmt_stats_type_attr_bonus(c)
 
         time = c['time']
@@ -1762,10 +1916,12 @@ counter_attack_backups = {'chance': 0, 'multiplier': 0, 'attribute': [],
 
 
 def counter_attack_convert(arguments):
+    base_convert = convert_with_defaults('counter_attack',
+                                         arguments,
+                                         counter_attack_backups)
+
     def f(x):
-        _, c = convert_with_defaults('counter_attack',
-                                     arguments,
-                                     counter_attack_backups)(x)
+        _, c = base_convert(x)
         if c['chance'] == 1:
             c['skill_text'] += fmt_mult(c['multiplier']) + \
                 'x ' + ATTRIBUTES[int(c['attribute'])] + ' counterattack'
@@ -1781,10 +1937,12 @@ egg_drop_backups = {'multiplier': 1.0, 'skill_text': '', 'parameter': [1.0, 1.0,
 
 
 def egg_drop_convert(arguments):
+    base_convert = convert_with_defaults('egg_drop_rate',
+                                         arguments,
+                                         egg_drop_backups)
+
     def f(x):
-        _, c = convert_with_defaults('egg_drop_rate',
-                                     arguments,
-                                     egg_drop_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['multiplier']) + 'x Egg Drop rate'
         return 'egg_drop_rate', c
     return f
@@ -1794,10 +1952,12 @@ coin_drop_backups = {'multiplier': 1.0, 'skill_text': '', 'parameter': [1.0, 1.0
 
 
 def coin_drop_convert(arguments):
+    base_convert = convert_with_defaults('coin_drop_rate',
+                                         arguments,
+                                         coin_drop_backups)
+
     def f(x):
-        _, c = convert_with_defaults('coin_drop_rate',
-                                     arguments,
-                                     coin_drop_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['multiplier']) + 'x Coin Drop rate'
         return 'coin_drop_rate', c
     return f
@@ -1808,10 +1968,12 @@ skill_used_backups = {'for_attr': [], 'for_type': [],
 
 
 def skill_used_convert(arguments):
+    base_convert = convert_with_defaults('skill_used_stats',
+                                         arguments,
+                                         skill_used_backups)
+
     def f(x):
-        _, c = convert_with_defaults('skill_used_stats',
-                                     arguments,
-                                     skill_used_backups)(x)
+        _, c = base_convert(x)
         skill_text = fmt_stats_type_attr_bonus(c, skip_attr_all=True)
         skill_text += ' on the turn a skill is used'
         c['skill_text'] = skill_text
@@ -1827,10 +1989,12 @@ exact_combo_backups = {'combos': 0, 'atk_multiplier': 1,
 
 
 def exact_combo_convert(arguments):
+    base_convert = convert_with_defaults('exact_combo_match',
+                                         arguments,
+                                         exact_combo_backups)
+
     def f(x):
-        _, c = convert_with_defaults('exact_combo_match',
-                                     arguments,
-                                     exact_combo_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['atk_multiplier']) + \
             'x ATK when exactly ' + str(c['combos']) + ' combos'
 
@@ -1845,10 +2009,12 @@ passive_stats_type_atk_all_hp_backups = {'for_type': [],
 
 
 def passive_stats_type_atk_all_hp_convert(arguments):
+    base_convert = convert_with_defaults('passive_stats_type_atk_all_hp',
+                                         arguments,
+                                         passive_stats_type_atk_all_hp_backups)
+
     def f(x):
-        _, c = convert_with_defaults('passive_stats_type_atk_all_hp',
-                                     arguments,
-                                     passive_stats_type_atk_all_hp_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += 'Reduce total HP by ' + \
             fmt_mult((1 - c['hp_multiplier']) * 100) + '%; ' + \
             fmt_mult(c['atk_multiplier']) + 'x ATK for '
@@ -1867,10 +2033,12 @@ team_build_bonus_backups = {'monster_ids': 0, 'hp_multiplier': 1,
 
 
 def team_build_bonus_convert(arguments):
+    base_convert = convert_with_defaults('team_build_bonus',
+                                         arguments,
+                                         team_build_bonus_backups)
+
     def f(x):
-        _, c = convert_with_defaults('team_build_bonus',
-                                     arguments,
-                                     team_build_bonus_backups)(x)
+        _, c = base_convert(x)
         monster_ids = str(c['monster_ids'])
 
         skill_text = fmt_stats_type_attr_bonus(c)
@@ -1888,10 +2056,12 @@ rank_exp_rate_backups = {'multiplier': 1, 'skill_text': '', 'parameter': [1.0, 1
 
 
 def rank_exp_rate_convert(arguments):
+    base_convert = convert_with_defaults('rank_exp_rate',
+                                         arguments,
+                                         rank_exp_rate_backups)
+
     def f(x):
-        _, c = convert_with_defaults('rank_exp_rate',
-                                     arguments,
-                                     rank_exp_rate_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['multiplier']) + 'x Rank EXP'
         c['parameter'][3] = 0.0
         return 'rank_exp_rate', c
@@ -1902,10 +2072,12 @@ heart_tpa_stats_backups = {'rcv_multiplier': 1, 'skill_text': '', 'parameter': [
 
 
 def heart_tpa_stats_convert(arguments):
+    base_convert = convert_with_defaults('heart_tpa_stats',
+                                         arguments,
+                                         heart_tpa_stats_backups)
+
     def f(x):
-        _, c = convert_with_defaults('heart_tpa_stats',
-                                     arguments,
-                                     heart_tpa_stats_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['rcv_multiplier']) + \
             'x RCV when matching 4 Heal orbs'
 
@@ -1920,10 +2092,12 @@ five_orb_one_enhance_backups = {'atk_multiplier': 1,
 
 
 def five_orb_one_enhance_convert(arguments):
+    base_convert = convert_with_defaults('five_orb_one_enhance',
+                                         arguments,
+                                         five_orb_one_enhance_backups)
+
     def f(x):
-        _, c = convert_with_defaults('five_orb_one_enhance',
-                                     arguments,
-                                     five_orb_one_enhance_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] += fmt_mult(c['atk_multiplier']) + \
             'x ATK for matched Att. when matching 5 Orbs with 1+ enhanced'
 
@@ -1940,10 +2114,12 @@ heart_cross_backups = {'atk_multiplier': 1, 'rcv_multiplier': 1,
 
 
 def heart_cross_convert(arguments):
+    base_convert = convert_with_defaults('heart_cross',
+                                         arguments,
+                                         heart_cross_backups)
+
     def f(x):
-        _, c = convert_with_defaults('heart_cross',
-                                     arguments,
-                                     heart_cross_backups)(x)
+        _, c = base_convert(x)
         atk_mult = c['atk_multiplier']
         rcv_mult = c['rcv_multiplier']
         skill_text = c['skill_text']
@@ -1974,10 +2150,12 @@ multi_play_backups = {'for_attr': [], 'for_type': [], 'hp_multiplier': 1.0, 'atk
 
 
 def multi_play_convert(arguments):
+    base_convert = convert_with_defaults('multi_play',
+                                         arguments,
+                                         multi_play_backups)
+
     def f(x):
-        _, c = convert_with_defaults('multi_play',
-                                     arguments,
-                                     multi_play_backups)(x)
+        _, c = base_convert(x)
 
         c['skill_text'] += fmt_stats_type_attr_bonus(c) + ' when in multiplayer mode'
 
@@ -1993,10 +2171,12 @@ dual_passive_stat_backups = {'for_attr_1': [], 'for_type_1': [], 'hp_multiplier_
 
 
 def dual_passive_stat_convert(arguments):
+    base_convert = convert_with_defaults('dual_passive_stat',
+                                         arguments,
+                                         dual_passive_stat_backups)
+
     def f(x):
-        _, c = convert_with_defaults('dual_passive_stat',
-                                     arguments,
-                                     dual_passive_stat_backups)(x)
+        _, c = base_convert(x)
         c1 = {}
         c1['for_attr'] = c['for_attr_1']
         c1['for_type'] = c['for_type_1']
@@ -2035,10 +2215,12 @@ dual_threshold_stats_backups = {'for_attr': [], 'for_type': [],
 
 
 def dual_threshold_stats_convert(arguments):
+    base_convert = convert_with_defaults('dual_threshold_stats',
+                                         arguments,
+                                         dual_threshold_stats_backups)
+
     def f(x):
-        _, c = convert_with_defaults('dual_threshold_stats',
-                                     arguments,
-                                     dual_threshold_stats_backups)(x)
+        _, c = base_convert(x)
         c1 = {}
         c1['for_attr'] = c['for_attr']
         c1['for_type'] = c['for_type']
@@ -2103,10 +2285,12 @@ color_cross_backups = {'crosses': [],
 
 
 def color_cross_convert(arguments):
+    base_convert = convert_with_defaults('color_cross',
+                                         arguments,
+                                         color_cross_backups)
+
     def f(x):
-        _, c = convert_with_defaults('color_cross',
-                                     arguments,
-                                     color_cross_backups)(x)
+        _, c = base_convert(x)
         if len(c['crosses']) == 1:
             c['skill_text'] += fmt_mult(c['crosses'][0]['atk_multiplier']) + 'x ATK for each cross of 5 ' + \
                 ATTRIBUTES[int(c['crosses'][0]['attribute'])] + ' orbs'
@@ -2135,10 +2319,12 @@ minimum_orb_backups = {'minimum_orb': 3, 'for_attr': [], 'for_type': [],
 
 
 def minimum_orb_convert(arguments):
+    base_convert = convert_with_defaults('minimum_orb',
+                                         arguments,
+                                         minimum_orb_backups)
+
     def f(x):
-        _, c = convert_with_defaults('minimum_orb',
-                                     arguments,
-                                     minimum_orb_backups)(x)
+        _, c = base_convert(x)
 
         c['skill_text'] += '[Unable to erase ' + \
             str(c['minimum_orb'] - 1) + ' orbs or less]; ' + fmt_stats_type_attr_bonus(c)
@@ -2157,10 +2343,12 @@ orb_remain_backups = {'orb_count': 0,
 
 
 def orb_remain_convert(arguments):
+    base_convert = convert_with_defaults('orb_remain',
+                                         arguments,
+                                         orb_remain_backups)
+
     def f(x):
-        _, c = convert_with_defaults('orb_remain',
-                                     arguments,
-                                     orb_remain_backups)(x)
+        _, c = base_convert(x)
         c['skill_text'] = '[No skyfall]'
         if c['atk_multiplier']:
             c['skill_text'] += '; ' + fmt_mult(c['atk_multiplier']) + 'x ATK when there are ' + \
@@ -2183,10 +2371,12 @@ collab_bonus_backups = {'collab_id': 0, 'for_attr': [0, 1, 2, 3, 4], 'for_type':
 
 
 def collab_bonus_convert(arguments):
+    base_convert = convert_with_defaults('collab_bonus',
+                                         arguments,
+                                         collab_bonus_backups)
+
     def f(x):
-        _, c = convert_with_defaults('collab_bonus',
-                                     arguments,
-                                     collab_bonus_backups)(x)
+        _, c = base_convert(x)
 
         COLLAB_MAP = {
             0: '',
@@ -2285,10 +2475,12 @@ multi_mass_match_backups = {'for_attr': [],
 
 
 def multi_mass_match_convert(arguments):
+    base_convert = convert_with_defaults('multi_mass_match',
+                                         arguments,
+                                         multi_mass_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('multi_mass_match',
-                                     arguments,
-                                     multi_mass_match_backups)(x)
+        _, c = base_convert(x)
         
         if c['atk_multiplier'] not in [0,1]:
             c['skill_text'] = fmt_multiplier_text(1, c['atk_multiplier'], 1) + ' and increase '
@@ -2312,10 +2504,12 @@ l_match_backups = {'attributes': [],
 
 
 def l_match_convert(arguments):
+    base_convert = convert_with_defaults('l_match',
+                                         arguments,
+                                         l_match_backups)
+
     def f(x):
-        _, c = convert_with_defaults('l_match',
-                                     arguments,
-                                     l_match_backups)(x)
+        _, c = base_convert(x)
         c['parameter'] = fmt_parameter(c)
         atk_mult = c['atk_multiplier']
         rcv_mult = c['rcv_multiplier']
@@ -2345,10 +2539,12 @@ add_combo_att_backups = {'attributes': [],
 
 
 def add_combo_att_convert(arguments):
+    base_convert = convert_with_defaults('add_combo_att_match',
+                                         arguments,
+                                         add_combo_att_backups)
+
     def f(x):
-        _, c = convert_with_defaults('add_combo_att_match',
-                                     arguments,
-                                     add_combo_att_backups)(x)
+        _, c = base_convert(x)
         attr = c['attributes']
         min_attr = c['min_attr']
         c['parameter'] = fmt_parameter(c)
@@ -2374,10 +2570,12 @@ orb_heal_backups = {'heal_amt': 1,
                     'awk_unbind': 0}
 
 def orb_heal_convert(arguments):
+    base_convert = convert_with_defaults('orb_heal_from_match',
+                                         arguments,
+                                         orb_heal_backups)
+
     def f(x):
-        _, c = convert_with_defaults('orb_heal_from_match',
-                                     arguments,
-                                     orb_heal_backups)(x)
+        _, c = base_convert(x)
         skill_text = ''
         c['parameter'] = [1,
                           max(1,c['atk_multiplier']),
@@ -2417,10 +2615,12 @@ rainbow_bonus_damage_backup = {'attributes': [],
                                'bonus_damage': 0}
 
 def rainbow_bonus_damage_convert(arguments):
+    base_convert = convert_with_defaults('rainbow_bonus_damage',
+                                         arguments,
+                                         rainbow_bonus_damage_backup)
+
     def f(x):
-        _, c = convert_with_defaults('rainbow_bonus_damage',
-                                     arguments,
-                                     rainbow_bonus_damage_backup)(x)
+        _, c = base_convert(x)
         c['parameter'] = [1,1,1,0]
         skill_text = '{} additional damage'.format(c['bonus_damage'])
         
@@ -2448,10 +2648,12 @@ mass_match_bonus_damage_backup = {'attributes': [],
                                   'bonus_damage': 0}
 
 def mass_match_bonus_damage_convert(arguments):
+    base_convert = convert_with_defaults('mass_match_bonus_damage',
+                                         arguments,
+                                         mass_match_bonus_damage_backup)
+
     def f(x):
-        _, c = convert_with_defaults('mass_match_bonus_damage',
-                                     arguments,
-                                     mass_match_bonus_damage_backup)(x)
+        _, c = base_convert(x)
         c['parameter'] = [1,1,1,0]
         
         skill_text = '{} additional damage when matching {} or more'.format(c['bonus_damage'], c['minimum_count'])
@@ -2468,10 +2670,9 @@ def mass_match_bonus_damage_convert(arguments):
 
 
 SKILL_TRANSFORM = {
-    0: lambda x:
-    convert('null_skill', {})(x)
-    if make_defaultlist(int, x)[1] == 0 else
-    attr_nuke_convert({'attribute': (0, cc), 'multiplier': (1, multi), 'mass_attack': True})(x),
+    0: switch_convert(lambda x: param(x, 1) == 0,
+                      {True: convert('null_skill', {})},
+                      attr_nuke_convert({'attribute': (0, cc), 'multiplier': (1, multi), 'mass_attack': True})),
     1: fixed_attr_nuke_convert({'attribute': (0, cc), 'damage': (1, cc), 'mass_attack': True}),
     2: self_att_nuke_convert({'multiplier': (0, multi), 'mass_attack': False}),
 
@@ -2490,11 +2691,10 @@ SKILL_TRANSFORM = {
     35: drain_attack_convert({'atk_multiplier': (0, multi), 'recover_multiplier': (1, multi), 'mass_attack': False}),
     37: attr_nuke_convert({'attribute': (0, cc), 'multiplier': (1, multi), 'mass_attack': False}),
     42: damage_to_att_enemy_convert({'enemy_attribute': (0, cc), 'attack_attribute': (1, cc), 'damage': (2, cc)}),
-    50: lambda x:
-    rcv_boost_convert({'duration': (0, cc), 'multiplier': (2, multi)})(x)
-    if make_defaultlist(int, x)[1] == 5 else
-    attribute_attack_boost_convert(
-        {'duration': (0, cc), 'for_attr': (1, listify), 'atk_multiplier': (2, multi)})(x),
+    50: switch_convert(lambda x: param(x, 1) == 5,
+                       {True: rcv_boost_convert({'duration': (0, cc), 'multiplier': (2, multi)})},
+                       attribute_attack_boost_convert(
+                           {'duration': (0, cc), 'for_attr': (1, listify), 'atk_multiplier': (2, multi)})),
     51: mass_attack_convert({'duration': (0, cc)}),
     52: enhance_convert({'orbs': (0, listify)}),
     55: laser_convert({'damage': (0, cc), 'mass_attack': False}),
@@ -2508,15 +2708,13 @@ SKILL_TRANSFORM = {
     86: suicide_nuke_convert({'attribute': (0, cc), 'damage': (1, cc), 'hp_remaining': (3, multi), 'mass_attack': False}),
     87: suicide_nuke_convert({'attribute': (0, cc), 'damage': (1, cc), 'hp_remaining': (3, multi), 'mass_attack': True}),
     88: type_attack_boost_convert({'duration': (0, cc), 'types': (1, listify), 'multiplier': (2, multi)}),
-    90: lambda x:
-    attribute_attack_boost_convert({'duration': (0, cc), 'for_attr': (
-        slice(1, 3), list_con), 'atk_multiplier': (2, ccf)})(x)
-    if len(make_defaultlist(int, x)) == 3 else
-    (attribute_attack_boost_convert({'duration': (0, cc), 'for_attr': (slice(1, 3), list_con), 'atk_multiplier': (3, multi)})(x)
-     if len(make_defaultlist(int, x)) == 4 else
-     (convert('unexpected', {'skill_text': '', 'parameter': [1.0, 1.0, 1.0, 0.0]})(x)
-      if len(make_defaultlist(int, x)) == 0 else
-      (90, x))),
+    90: switch_convert(len,
+                       {3: attribute_attack_boost_convert({'duration': (0, cc), 'for_attr': (
+                           slice(1, 3), list_con), 'atk_multiplier': (2, ccf)}),
+                        4: attribute_attack_boost_convert({'duration': (0, cc), 'for_attr': (slice(1, 3), list_con), 'atk_multiplier': (3, multi)}),
+                        # Built per call so every skill gets its own parameter list
+                        0: lambda x: convert('unexpected', {'skill_text': '', 'parameter': [1.0, 1.0, 1.0, 0.0]})(x)},
+                       lambda x: (90, x)),
     91: enhance_convert({'orbs': (slice(0, 2), list_con)}),
     92: type_attack_boost_convert({'duration': (0, cc), 'types': (slice(1, 3), list_con), 'multiplier': (3, multi)}),
     93: convert('leader_swap', {'skill_text': 'Becomes Team leader, changes back when used again'}),
@@ -2540,16 +2738,12 @@ SKILL_TRANSFORM = {
     152: lock_convert({'orbs': (0, binary_con)}),
     153: change_enemies_attribute_convert({'attribute': (0, cc)}),
     154: random_orb_change_convert({'from': (0, binary_con), 'to': (1, binary_con)}),
-    156: lambda x:
-    awakening_heal_convert({'awakenings': (slice(1, 4), list_con), 'amount_per': (5, cc)})(x)
-    if make_defaultlist(int, x)[4] == 1 else
-    (awakening_attack_boost_convert({'duration': (0, cc), 'awakenings': (slice(1, 4), list_con), 'amount_per': (5, lambda x: (x - 100) / 100)})(x)
-        if make_defaultlist(int, x)[4] == 2 else
-     (awakening_shield_convert({'duration': (0, cc), 'awakenings': (slice(1, 4), list_con), 'amount_per': (5, multi)})(x)
-      if make_defaultlist(int, x)[4] == 3 else
-      (convert('unexpected', {'skill_text': '', 'parameter': [1.0, 1.0, 1.0, 0.0]})(x)
-       if make_defaultlist(int, x)[4] == 0 else
-       (156, x)))),
+    156: switch_convert(lambda x: param(x, 4),
+                        {1: awakening_heal_convert({'awakenings': (slice(1, 4), list_con), 'amount_per': (5, cc)}),
+                         2: awakening_attack_boost_convert({'duration': (0, cc), 'awakenings': (slice(1, 4), list_con), 'amount_per': (5, lambda x: (x - 100) / 100)}),
+                         3: awakening_shield_convert({'duration': (0, cc), 'awakenings': (slice(1, 4), list_con), 'amount_per': (5, multi)}),
+                         0: lambda x: convert('unexpected', {'skill_text': '', 'parameter': [1.0, 1.0, 1.0, 0.0]})(x)},
+                        lambda x: (156, x)),
     160: extra_combo_convert({'duration': (0, cc), 'combos': (1, cc)}),
     161: true_gravity_convert({'percentage_max_hp': (0, multi)}),
     172: convert('unlock', {'skill_text': 'Unlock all orbs'}),
@@ -2681,10 +2875,6 @@ SKILL_TRANSFORM = {
     }
 
 
-MULTI_PART_LS = {}
-MULTI_PART_AS = {}
-
-
 def reformat(in_file_name, out_file_name):
     print('-- Parsing skills --\n')
     with open(in_file_name) as f:
@@ -2730,8 +2920,8 @@ class CalculatedSkill(object):
         self.params = skill_params
 
 
-def reformat_json_info(skill_data):
-    reformatted = reformat_json(skill_data)
+def reformat_json_info(skill_data, workers=1):
+    reformatted = reformat_json(skill_data, workers)
     leader_skills = {}
 
     for sid, info in reformatted['leader_skills'].items():
@@ -2749,68 +2939,105 @@ def reformat_json_info(skill_data):
     return results
 
 
-def reformat_json(skill_data):
-    reformatted = {}
-    reformatted['res'] = skill_data['res']
-    reformatted['version'] = skill_data['v']
-    reformatted['ckey'] = skill_data['ckey']
-    reformatted['active_skills'] = {}
-    reformatted['leader_skills'] = {}
+class SkillReformatContext(object):
+    """State for one reformat_json run.
+
+    The leader pass converts every raw skill and records which skills are parts of combined
+    skills; the active pass then merges the part text into the combined skills.
+    """
+
+    def __init__(self):
+        self.reformatted = {'active_skills': {}, 'leader_skills': {}}
+        # Part skill id (as str) -> ids of the combined leader/active skills using it
+        self.multi_part_ls = {}
+        self.multi_part_as = {}
+
+    def convert_skills(self, skills, start=0):
+        for i, c in enumerate(skills, start):
+            try:
+                self.process_lskill(i, c)
+            except Exception as ex:
+                self.reformatted['leader_skills'][i] = {
+                    'args': {
+                        'skill_text': '',
+                        'params': [0, 0, 0, 0],
+                    },
+                }
+                print('failed to process', i, c, ex)
+
+    def merge(self, other):
+        """Appends the results of a context that converted a later shard of skills."""
+        self.reformatted['leader_skills'].update(other.reformatted['leader_skills'])
+        self.reformatted['active_skills'].update(other.reformatted['active_skills'])
+        for part_id, skill_ids in other.multi_part_ls.items():
+            self.multi_part_ls.setdefault(part_id, []).extend(skill_ids)
+        for part_id, skill_ids in other.multi_part_as.items():
+            self.multi_part_as.setdefault(part_id, []).extend(skill_ids)
+
+    def combine_skills(self, skills):
+        for j, c in enumerate(skills):
+            try:
+                self.process_askill(j, c)
+            except Exception as ex:
+                self.reformatted['active_skills'][j] = {
+                    'args': {'skill_text': ''},
+                }
+                print('failed to process', j, c, ex)
 
-    def process_lskill(i, c):
+    def process_lskill(self, i, c):
         if (c[3] == 0 and c[4] == 0) or (c[2] == 192 and c[3] == 6 and c[4] == 17):  # this distinguishes leader skills from active skills also Kaioh apparently have 6, 17 on part of LS instead of 0, 0
-            reformatted['leader_skills'][i] = {}
-            reformatted['leader_skills'][i]['id'] = i
-            reformatted['leader_skills'][i]['name'] = c[0]
-            reformatted['leader_skills'][i]['card_description'] = c[1]
+            self.reformatted['leader_skills'][i] = {}
+            self.reformatted['leader_skills'][i]['id'] = i
+            self.reformatted['leader_skills'][i]['name'] = c[0]
+            self.reformatted['leader_skills'][i]['card_description'] = c[1]
             if c[2] in SKILL_TRANSFORM:
-                reformatted['leader_skills'][i]['type'], reformatted['leader_skills'][i]['args'] = SKILL_TRANSFORM[c[2]](
+                self.reformatted['leader_skills'][i]['type'], self.reformatted['leader_skills'][i]['args'] = SKILL_TRANSFORM[c[2]](
                     c[6:])
-                if type(reformatted['leader_skills'][i]['args']) == list:
+                if type(self.reformatted['leader_skills'][i]['args']) == list:
                     raise Exception('Unhandled leader skill type: {c2} (skill id: {i})'.format(
                         c2=c[2], i=i))
-                if reformatted['leader_skills'][i]['type'] == 'combine_leader_skills':
-                    for j in range(0, len(reformatted['leader_skills'][i]['args']['skill_ids'])):
-                        if MULTI_PART_LS.get(str(reformatted['leader_skills'][i]['args']['skill_ids'][j])):
-                            MULTI_PART_LS[str(reformatted['leader_skills'][i]
-                                              ['args']['skill_ids'][j])] += [i]
+                if self.reformatted['leader_skills'][i]['type'] == 'combine_leader_skills':
+                    for j in range(0, len(self.reformatted['leader_skills'][i]['args']['skill_ids'])):
+                        if self.multi_part_ls.get(str(self.reformatted['leader_skills'][i]['args']['skill_ids'][j])):
+                            self.multi_part_ls[str(self.reformatted['leader_skills'][i]
+                                                   ['args']['skill_ids'][j])] += [i]
                         else:
-                            MULTI_PART_LS[str(reformatted['leader_skills'][i]
-                                              ['args']['skill_ids'][j])] = [i]
+                            self.multi_part_ls[str(self.reformatted['leader_skills'][i]
+                                                   ['args']['skill_ids'][j])] = [i]
             else:
                 raise Exception('Unexpected leader skill type: {c2} (skill id: {i})'.format(c2=c[2], i=i))
-                #reformatted['leader_skills'][i]['type'] = f'_{c[2]}'
-                #reformatted['leader_skills'][i]['args'] = {f'_{i}':v for i,v in enumerate(c[6:])}
+                #self.reformatted['leader_skills'][i]['type'] = f'_{c[2]}'
+                #self.reformatted['leader_skills'][i]['args'] = {f'_{i}':v for i,v in enumerate(c[6:])}
         else:
-            reformatted['active_skills'][i] = {}
-            reformatted['active_skills'][i]['id'] = i
-            reformatted['active_skills'][i]['name'] = c[0]
-            reformatted['active_skills'][i]['card_description'] = c[1]
-            reformatted['active_skills'][i]['max_skill'] = c[3]
-            reformatted['active_skills'][i]['base_cooldown'] = c[4]
+            self.reformatted['active_skills'][i] = {}
+            self.reformatted['active_skills'][i]['id'] = i
+            self.reformatted['active_skills'][i]['name'] = c[0]
+            self.reformatted['active_skills'][i]['card_description'] = c[1]
+            self.reformatted['active_skills'][i]['max_skill'] = c[3]
+            self.reformatted['active_skills'][i]['base_cooldown'] = c[4]
             if c[2] in SKILL_TRANSFORM:
-                reformatted['active_skills'][i]['type'], reformatted['active_skills'][i]['args'] = SKILL_TRANSFORM[c[2]](
+                self.reformatted['active_skills'][i]['type'], self.reformatted['active_skills'][i]['args'] = SKILL_TRANSFORM[c[2]](
                     c[6:])
-                if type(reformatted['active_skills'][i]['args']) != dict:
+                if type(self.reformatted['active_skills'][i]['args']) != dict:
                     raise Exception('Unhandled active skill type: {c2} (skill id: {i})'.format(c2=c[2], i=i))
-                if reformatted['active_skills'][i]['type'] == 'combine_active_skills':
-                    for j in range(0, len(reformatted['active_skills'][i]['args']['skill_ids'])):
-                        part_id = str(reformatted['active_skills'][i]['args']['skill_ids'][j])
-                        if not part_id in MULTI_PART_AS.keys():
-                            MULTI_PART_AS[part_id] = []
-                        MULTI_PART_AS[part_id].append(reformatted['active_skills'][i]['id'])
+                if self.reformatted['active_skills'][i]['type'] == 'combine_active_skills':
+                    for j in range(0, len(self.reformatted['active_skills'][i]['args']['skill_ids'])):
+                        part_id = str(self.reformatted['active_skills'][i]['args']['skill_ids'][j])
+                        if not part_id in self.multi_part_as.keys():
+                            self.multi_part_as[part_id] = []
+                        self.multi_part_as[part_id].append(self.reformatted['active_skills'][i]['id'])
             else:
                 raise Exception('Unexpected active skill type: {c2} (skill id: {i})'.format(c2=c[2], i=i))
 
-    def process_askill(j, c):
+    def process_askill(self, j, c):
         if c[2] in SKILL_TRANSFORM:
             i_str = str(j)
-            if MULTI_PART_LS.get(i_str):
-                for k in range(0, len(MULTI_PART_LS[i_str])):
+            if self.multi_part_ls.get(i_str):
+                for k in range(0, len(self.multi_part_ls[i_str])):
                     # Generating skill_text
-                    combined_skill_args = reformatted['leader_skills'][j]['args']
-                    cur_skill_id = int(MULTI_PART_LS[i_str][k])
-                    cur_args = reformatted['leader_skills'][cur_skill_id]['args']
+                    combined_skill_args = self.reformatted['leader_skills'][j]['args']
+                    cur_skill_id = int(self.multi_part_ls[i_str][k])
+                    cur_args = self.reformatted['leader_skills'][cur_skill_id]['args']
                     if cur_args['skill_text'] == '' or combined_skill_args['skill_text'].endswith('; '):
                         cur_args['skill_text'] += combined_skill_args['skill_text']
                     else:
@@ -2828,18 +3055,18 @@ def reformat_json(skill_data):
                     reduction = 1 - (1 - reduction) * \
                         (1 - float(combined_skill_args['parameter'][3]))
                     cur_args['parameter'] = [hp_mult, atk_mult, rcv_mult, reduction]
-            elif MULTI_PART_AS.get(str(j)):
-                AS = reformatted['active_skills']
-                LS = reformatted['leader_skills']
+            elif self.multi_part_as.get(str(j)):
+                AS = self.reformatted['active_skills']
+                LS = self.reformatted['leader_skills']
 
-                for repeated_skill in range(0, len(MULTI_PART_AS[str(j)])):
+                for repeated_skill in range(0, len(self.multi_part_as[str(j)])):
 
-                    AS_comb_skill_text = reformatted['active_skills'][MULTI_PART_AS[str(
+                    AS_comb_skill_text = self.reformatted['active_skills'][self.multi_part_as[str(
                         j)][repeated_skill]]['args']['skill_text']
                     if AS.get(j):
 
                         AS_curr_arg = AS[j]['args']
-                        AS_comb_skill_ids = AS[MULTI_PART_AS[str(
+                        AS_comb_skill_ids = AS[self.multi_part_as[str(
                             j)][repeated_skill]]['args']['skill_ids']
 
                         if AS_curr_arg.get('skill_text'):
@@ -2856,7 +3083,7 @@ def reformat_json(skill_data):
                                         if AS_comb_skill_ids[k] == j:
                                             repeat += 1
                                     AS_comb_skill_text += ' ' + str(repeat) + ' times'
-                                    MULTI_PART_AS[str(j)] = [MULTI_PART_AS[str(j)][0]]
+                                    self.multi_part_as[str(j)] = [self.multi_part_as[str(j)][0]]
                             else:
                                 AS_comb_skill_text += '; ' + AS_curr_skill_text
 
@@ -2866,11 +3093,11 @@ def reformat_json(skill_data):
                                         if AS_comb_skill_ids[k] == j:
                                             repeat += 1
                                     AS_comb_skill_text += ' ' + str(repeat) + ' times'
-                                    MULTI_PART_AS[str(j)] = [MULTI_PART_AS[str(j)][0]]
+                                    self.multi_part_as[str(j)] = [self.multi_part_as[str(j)][0]]
                     elif LS.get(j):
 
                         LS_curr_arg = LS[j]['args']
-                        AS_comb_skill_ids = AS[MULTI_PART_AS[str(
+                        AS_comb_skill_ids = AS[self.multi_part_as[str(
                             j)][repeated_skill]]['args']['skill_ids']
 
                         if LS_curr_arg.get('skill_text'):
@@ -2888,7 +3115,7 @@ def reformat_json(skill_data):
                                         if AS_comb_skill_ids[k] == j:
                                             repeat += 1
                                     AS_comb_skill_text += ' ' + str(repeat) + ' times'
-                                    MULTI_PART_AS[str(j)] = [MULTI_PART_AS[str(j)][0]]
+                                    self.multi_part_as[str(j)] = [self.multi_part_as[str(j)][0]]
                             else:
 
                                 AS_comb_skill_text += '; ' + LS_curr_skill_text
@@ -2899,33 +3126,47 @@ def reformat_json(skill_data):
                                         if AS_comb_skill_ids[k] == j:
                                             repeat += 1
                                     AS_comb_skill_text += ' ' + str(repeat) + ' times'
-                                    MULTI_PART_AS[str(j)] = [MULTI_PART_AS[str(j)][0]]
-                    reformatted['active_skills'][MULTI_PART_AS[str(
+                                    self.multi_part_as[str(j)] = [self.multi_part_as[str(j)][0]]
+                    self.reformatted['active_skills'][self.multi_part_as[str(
                         j)][repeated_skill]]['args']['skill_text'] = AS_comb_skill_text
-                    if 'times' in reformatted['active_skills'][MULTI_PART_AS[str(j)][repeated_skill]]['args']['skill_text']:
+                    if 'times' in self.reformatted['active_skills'][self.multi_part_as[str(j)][repeated_skill]]['args']['skill_text']:
                         break
 
-    print('Starting skill conversion of {count} skills'.format(count=len(skill_data["skill"])))
-    for i, c in enumerate(skill_data['skill']):
-        try:
-            process_lskill(i, c)
-        except Exception as ex:
-            reformatted['leader_skills'][i] = {
-                'args': {
-                    'skill_text': '',
-                    'params': [0, 0, 0, 0],
-                },
-            }
-            print('failed to process', i, c, ex)
-
-    for j, c in enumerate(skill_data['skill']):
-        try:
-            process_askill(j, c)
-        except Exception as ex:
-            reformatted['active_skills'][j] = {
-                'args': {'skill_text': ''},
-            }
-            print('failed to process', j, c, ex)
+
+def _convert_skill_shard(start, skills):
+    context = SkillReformatContext()
+    context.convert_skills(skills, start)
+    return context
+
+
+def reformat_json(skill_data, workers=1):
+    """Converts raw skill data; with workers > 1 the conversion is sharded across processes.
+
+    Combining multi-part skills needs every skill, so that step always runs in this process.
+    """
+    context = SkillReformatContext()
+    skills = skill_data['skill']
+
+    print('Starting skill conversion of {count} skills'.format(count=len(skills)))
+    if workers > 1:
+        # Contiguous shards, merged in order, so the results keep the serial ordering
+        shard_size = (len(skills) + workers - 1) // workers
+        shards = [(start, skills[start:start + shard_size])
+                  for start in range(0, len(skills), shard_size)]
+        with Pool(workers) as pool:
+            for shard_context in pool.starmap(_convert_skill_shard, shards):
+                context.merge(shard_context)
+    else:
+        context.convert_skills(skills)
+
+    context.combine_skills(skills)
+
+    reformatted = {}
+    reformatted['res'] = skill_data['res']
+    reformatted['version'] = skill_data['v']
+    reformatted['ckey'] = skill_data['ckey']
+    reformatted['active_skills'] = context.reformatted['active_skills']
+    reformatted['leader_skills'] = context.reformatted['leader_skills']
 
     # Do final trimming on parameter values now that all the math has completed
     for skill in reformatted['leader_skills'].values():
@@ -1,9 +1,13 @@
 import logging
 import random
+import time
+from typing import List
 
 import pymysql
 
 from .sql_item import SqlItem, _col_compare, _tbl_name_ref, process_col_mappings
+from .sql_item import collation_key, generate_bulk_insert_sql, generate_bulk_update_sql
+from .sql_item import generate_keyed_select_sql, object_to_sql_values, values_match
 
 
 logger = logging.getLogger('database')
@@ -149,3 +153,121 @@ class DbWrapper(object):
                 logger.info('item needed update: %s %s', type(item), key)
                 self.insert_item(item.update_sql())
         return key
+
+    def bulk_insert_or_update(self, items: List[SqlItem], batch_size: int=500):
+        """Set-based version of insert_or_update for a list of same-typed items.
+
+        The current rows for each batch are loaded with one keyed SELECT and diffed in memory,
+        matching keys the way the table collation would. New rows are written with a single
+        multi-row INSERT and changed rows with a single multi-row UPDATE. Items that need a
+        generated key from the database are still inserted one at a time, since the key has
+        to be returned, as are items whose key collides with an earlier one in the batch.
+
+        Returns the keys in the same order as items.
+        """
+        if not items:
+            return []
+        item_type = type(items[0])
+        if any(type(item) != item_type for item in items):
+            raise ValueError('bulk_insert_or_update requires items of a single type:', item_type)
+
+        keys = []
+        for start in range(0, len(items), batch_size):
+            keys.extend(self._bulk_insert_or_update_batch(items[start:start + batch_size]))
+        return keys
+
+    def _bulk_insert_or_update_batch(self, items: List[SqlItem]):
+        sample = items[0]
+        table = sample._table()
+        key_col = sample._key()
+        alt_lookup = sample.uses_alternate_key_lookup()
+        lookup_cols = sample.alternate_key_columns() if alt_lookup else [key_col]
+        update_cols = sample._update_columns() or []
+
+        keys = [None] * len(items)
+        lookups = {}  # type Map<int, Tuple>
+        deferred = []  # type List<int>
+        seen = set()
+        for idx, item in enumerate(items):
+            if not alt_lookup and item.uses_local_primary_key() and item.needs_insert():
+                logger.info('item needed insert: %s %s', type(item), item.key_value())
+                keys[idx] = self.insert_item(item.insert_sql())
+                continue
+            values = object_to_sql_values(item)
+            lookup = tuple(values[c] for c in lookup_cols)
+            if None in lookup:
+                # NULL never matches an IN clause; use the slow path
+                keys[idx] = self.insert_or_update(item)
+                continue
+            collated = tuple(map(collation_key, lookup))
+            if collated in seen:
+                # Depends on whatever the earlier item writes; use the slow path afterwards
+                deferred.append(idx)
+                continue
+            seen.add(collated)
+            lookups[idx] = lookup
+
+        if not lookups:
+            return keys
+
+        select_cols = [key_col] + [c for c in lookup_cols + update_cols if c != key_col]
+        select_cols = list(dict.fromkeys(select_cols))
+        sql = generate_keyed_select_sql(table, select_cols, lookup_cols, set(lookups.values()))
+        existing = {}
+        for row in self.fetch_data(sql):
+            lookup = tuple(collation_key(row[c]) for c in lookup_cols)
+            if lookup in existing:
+                raise ValueError('got too many results:', lookup, sql)
+            existing[lookup] = row
+
+        to_insert = []
+        to_update = []
+        for idx, lookup in lookups.items():
+            item = items[idx]
+            row = existing.get(tuple(map(collation_key, lookup)))
+            if row is None:
+                if alt_lookup:
+                    logger.info('item (alt) needed insert: %s %s', type(item), None)
+                    keys[idx] = self.insert_item(item.insert_sql())
+                elif not item.uses_local_primary_key():
+                    logger.info('item (fk) needed insert: %s %s', type(item), item.key_value())
+                    keys[idx] = item.key_value()
+                    to_insert.append(item)
+                else:
+                    # Matches insert_or_update, where the update would hit no rows
+                    logger.warning('item key not found, skipping: %s %s', type(item), item.key_value())
+                    keys[idx] = item.key_value()
+                continue
+
+            if alt_lookup:
+                item.set_key_value(row[key_col])
+            keys[idx] = item.key_value()
+
+            values = object_to_sql_values(item)
+            if not all(values_match(row[c], values.get(c)) for c in update_cols):
+                logger.info('item needed update: %s %s', type(item), keys[idx])
+                to_update.append(item)
+
+        tstamp = time.time() * 1000
+        if to_insert:
+            insert_cols = sample._insert_columns()
+            if hasattr(sample, 'tstamp'):
+                if 'tstamp' not in insert_cols:
+                    insert_cols = insert_cols + ['tstamp']
+                for item in to_insert:
+                    item.tstamp = tstamp
+            self.insert_item(generate_bulk_insert_sql(table, insert_cols, to_insert))
+
+        if to_update and update_cols:
+            cols = list(update_cols)
+            if hasattr(sample, 'tstamp'):
+                if 'tstamp' not in cols:
+                    cols = cols + ['tstamp']
+                for item in to_update:
+                    item.tstamp = tstamp
+            self.insert_item(generate_bulk_update_sql(table, key_col, cols, to_update))
+
+        for idx in deferred:
+            keys[idx] = self.insert_or_update(items[idx])
+
+        return keys
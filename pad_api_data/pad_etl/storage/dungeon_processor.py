@@ -3,6 +3,7 @@ from statistics import mean
 import time
 
 from . import dungeon as dbdungeon
+from ..common.name_matcher import NameMatcher
 from ..common.padguide_values import SpecialIcons
 from ..data import dungeon as datadungeon
 from ..processor import enemy_skillset
@@ -154,6 +155,11 @@ def make_tree_from_cards(cards):
     return tree
 
 
+def make_monster_name_matcher(cards=[], na_cards=[]) -> NameMatcher:
+    """Matches lowercased monster names to cards; build once and reuse across dungeons."""
+    return NameMatcher({x.name.lower(): x for x in cards + na_cards if x.card_id < 9999})
+
+
 def populate_dungeon(dungeon: dbdungeon.Dungeon,
                      jp_dungeon: datadungeon.Dungeon,
                      na_dungeon: datadungeon.Dungeon,
@@ -161,7 +167,8 @@ def populate_dungeon(dungeon: dbdungeon.Dungeon,
                      cards=[],
                      na_cards=[],
                      floor_text={},
-                     na_enemies=[]):
+                     na_enemies=[],
+                     monster_name_matcher: NameMatcher=None):
     dungeon.comment_us = VERSION
 
     # Most dungeons are this type
@@ -203,7 +210,8 @@ def populate_dungeon(dungeon: dbdungeon.Dungeon,
         print('na dungeon larger than jp; extending to match')
         jp_dungeon_floors.extend(na_dungeon_floors[len(jp_dungeon_floors):])
 
-    monster_name_to_id = {x.name.lower(): x for x in cards + na_cards if x.card_id < 9999}
+    if monster_name_matcher is None:
+        monster_name_matcher = make_monster_name_matcher(cards, na_cards)
     monster_id_to_card = {c.card_id: c for c in cards}
     enemy_id_to_enemy = {e.enemy_id: e for e in na_enemies}
     for idx in range(expected_floor_count):
@@ -213,7 +221,7 @@ def populate_dungeon(dungeon: dbdungeon.Dungeon,
                            floor_to_waves[idx + 1],
                            monster_id_to_card,
                            floor_text.get(idx + 1, ''),
-                           monster_name_to_id,
+                           monster_name_matcher,
                            enemy_id_to_enemy)
 
     dungeon.icon_seq = 0
@@ -233,7 +241,7 @@ def update_sub_dungeon(sub_dungeon: dbdungeon.SubDungeon,
                        waves,
                        monster_id_to_card,
                        floor_text,
-                       monster_name_to_id,
+                       monster_name_matcher: NameMatcher,
                        enemy_id_to_enemy
                        ):
     sub_dungeon.order_idx = jp_dungeon_floor.floor_number
@@ -276,13 +284,9 @@ def update_sub_dungeon(sub_dungeon: dbdungeon.SubDungeon,
         elif 'magic stone' in floor_text:
             reward_value = SpecialIcons.MagicStone.value
         else:
-            matched_monsters = set()
-            for m_name in monster_name_to_id.keys():
-                if m_name in floor_text:
-                    matched_monsters.add(m_name)
-            if matched_monsters:
-                best_match = max(matched_monsters, key=len)
-                reward_value = monster_name_to_id[best_match].card_id
+            best_match = monster_name_matcher.longest_match(floor_text)
+            if best_match is not None:
+                reward_value = monster_name_matcher[best_match].card_id
 
         if reward_value is None:
             reward_value = SpecialIcons.RedX.value
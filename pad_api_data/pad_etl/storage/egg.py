@@ -30,9 +30,12 @@ class EggMonster(SimpleSqlItem):
     def uses_alternate_key_lookup(self):
         return True
 
+    def alternate_key_columns(self):
+        return ['tet_seq', 'order_idx']
+
     def exists_sql(self):
         return sql_item.key_and_cols_compare(
-            self, cols=['tet_seq', 'order_idx'], include_key=False)
+            self, cols=self.alternate_key_columns(), include_key=False)
         # TODO: add unique key to enforce
 
 
@@ -100,9 +103,12 @@ class EggTitle(SimpleSqlItem):
     def uses_alternate_key_lookup(self):
         return True
 
+    def alternate_key_columns(self):
+        return ['pad_machine_row', 'pad_machine_type', 'order_idx', 'server', 'tec_seq']
+
     def exists_sql(self):
         return sql_item.key_and_cols_compare(
-            self, cols=['pad_machine_row', 'pad_machine_type', 'order_idx', 'server', 'tec_seq'], include_key=False)
+            self, cols=self.alternate_key_columns(), include_key=False)
         # TODO: add unique key to enforce
 
 
@@ -136,9 +142,12 @@ class EggTitleName(SimpleSqlItem):
         self.tet_seq = tet_seq  # FK to EggTitle (injected x3)
         self.tstamp = tstamp or (int(time.time()) * 1000)
 
+    def alternate_key_columns(self):
+        return ['tet_seq', 'language']
+
     def exists_sql(self):
         return sql_item.key_and_cols_compare(
-            self, cols=['tet_seq', 'language'], include_key=False)
+            self, cols=self.alternate_key_columns(), include_key=False)
         # TODO: add unique key to enforce
 
     def uses_alternate_key_lookup(self):
@@ -221,7 +230,7 @@ class EggLoader(object):
 
             for egg_monster in egg_title.resolved_egg_monsters:
                 egg_monster.tet_seq = tet_seq
-                self.save_egg_monster(egg_monster)
+            self.db_wrapper.bulk_insert_or_update(egg_title.resolved_egg_monsters)
 
     def save_egg_title_name(self, egg_title_name):
         self.db_wrapper.insert_or_update(egg_title_name)
@@ -0,0 +1,109 @@
+"""
+Tracks what the last processor run already wrote to the database.
+
+Stores a hash for each merged entity (card, event, egg machine) in a local JSON file.
+On the next run only entities whose hash changed need to be diffed against MySQL. The
+work that depends on the clock or on the DB (hiding expired egg machines, the series
+back-fill) isn't tracked here and runs every time.
+
+Entities are only recorded once they've been processed successfully, so anything that
+failed (e.g. an event with no dungeon mapping yet) is retried on the next run.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Callable, Dict, Iterable, List
+
+from ..common import pad_util
+
+logger = logging.getLogger('processor')
+
+# Bump this when the hashed content or the processing logic changes, to force a full run.
+STATE_VERSION = 1
+
+
+def _encode_default(o):
+    if isinstance(o, (set, frozenset)):
+        return sorted(o, key=repr)
+    if isinstance(o, pad_util.JsonSlotsEncodable) or hasattr(o, '__dict__'):
+        return pad_util.json_default(o)
+    return str(o)
+
+
+def hash_entity(*values) -> str:
+    """Stable content hash of some data objects, via their JSON dump."""
+    dump = json.dumps(values, sort_keys=True, default=_encode_default, ensure_ascii=False)
+    return hashlib.sha1(dump.encode('utf-8')).hexdigest()
+
+
+class IncrementalState(object):
+    def __init__(self, state_file: str):
+        self.state_file = state_file
+
+        self.entities = {}  # type: Dict[str, Dict[str, str]]
+
+        # Hashes seen this run that haven't been recorded yet
+        self.pending = {}  # type: Dict[str, Dict[str, str]]
+
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            logger.info('No incremental state at %s, doing a full run', self.state_file)
+            return
+        with open(self.state_file) as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            logger.info('Incremental state version changed, doing a full run')
+            return
+        self.entities = state['entities']
+
+    def filter_changed(self, namespace: str, items: Iterable,
+                       hash_fn: Callable[..., str], key_fn: Callable[..., str]=None) -> List:
+        """Returns the items whose hash differs from the last recorded run.
+
+        If key_fn is not provided the hash itself is used as the key, for entities
+        that have no natural identity.
+        """
+        previous = self.entities.get(namespace, {})
+        current = {}
+        pending = {}
+        changed = []
+        for item in items:
+            digest = hash_fn(item)
+            key = str(key_fn(item)) if key_fn else digest
+            if previous.get(key) == digest:
+                current[key] = digest
+            else:
+                pending[key] = digest
+                changed.append(item)
+
+        # Entities that are no longer in the input are dropped from the state
+        self.entities[namespace] = current
+        self.pending[namespace] = pending
+        logger.info('%s: %d of %d changed since the last run',
+                    namespace, len(changed), len(current) + len(pending))
+        return changed
+
+    def mark_processed(self, namespace: str, keys: Iterable[str]=None):
+        """Records pending hashes as written; all of them in the namespace if keys is None."""
+        pending = self.pending.get(namespace, {})
+        keys = list(pending.keys()) if keys is None else [str(k) for k in keys]
+        for key in keys:
+            if key in pending:
+                self.entities.setdefault(namespace, {})[key] = pending.pop(key)
+
+    def save(self):
+        state = {
+            'version': STATE_VERSION,
+            'entities': self.entities,
+        }
+
+        state_dir = os.path.dirname(os.path.abspath(self.state_file))
+        os.makedirs(state_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=state_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
@@ -69,6 +69,9 @@ class MonsterItem(SqlItem):
     def is_valid(self):
         return True
 
+    def uses_local_primary_key(self):
+        return False
+
     def _table(self):
         return 'monster_list'
 
@@ -147,6 +150,9 @@ class MonsterInfoItem(SqlItem):
         self.tsr_seq = 42  # This is an unused series; should be replaced by the updater
         self.tstamp = int(time.time()) * 1000
 
+    def uses_local_primary_key(self):
+        return False
+
     def _table(self):
         return 'monster_info_list'
 
@@ -179,6 +185,9 @@ class MonsterPriceItem(SqlItem):
         self.sell_price = card.sell_mp
         self.tstamp = int(time.time()) * 1000
 
+    def uses_local_primary_key(self):
+        return False
+
     def _table(self):
         return 'monster_price_list'
 
@@ -354,6 +363,9 @@ class MonsterAddInfoItem(SqlItem):
         self.sub_type = TYPE_MAP[card.type_3_id]
         self.tstamp = int(time.time()) * 1000
 
+    def uses_local_primary_key(self):
+        return False
+
     def _table(self):
         return 'monster_add_info_list'
 
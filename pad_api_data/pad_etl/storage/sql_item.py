@@ -5,6 +5,8 @@ import time
 
 from enum import Enum
 
+from ..common import pad_util
+
 
 def object_to_sql_params(obj):
     d = obj if type(obj) == dict else obj.__dict__
@@ -19,6 +21,13 @@ def object_to_sql_params(obj):
     return new_d
 
 
+def object_to_sql_values(obj):
+    """Like object_to_sql_params, but leaves the values unformatted."""
+    d = obj if type(obj) == dict else obj.__dict__
+    d = dict(d)
+    return process_col_mappings(type(obj), d, reverse=True)
+
+
 def value_to_sql_param(v):
     if v is None:
         return 'NULL'
@@ -37,6 +46,37 @@ def value_to_sql_param(v):
         return None
 
 
+def collation_key(v):
+    """Normalises a value so that Python equality behaves like MySQL '='.
+
+    The tables use case insensitive, PAD SPACE collations, so strings are compared
+    lowercased and without trailing spaces. Numbers compare by value.
+    """
+    if isinstance(v, str):
+        return v.rstrip(' ').lower()
+    elif isinstance(v, bool):
+        return int(v)
+    elif isinstance(v, (int, float, decimal.Decimal)):
+        return decimal.Decimal(str(v))
+    else:
+        return v
+
+
+def values_match(db_value, item_value):
+    """Approximates the '=' / 'is NULL' comparison done by key_and_cols_compare, in memory."""
+    if db_value is None or item_value is None:
+        return db_value is None and item_value is None
+    numeric_types = (int, float, decimal.Decimal)
+    if isinstance(db_value, numeric_types) and isinstance(item_value, numeric_types + (str,)):
+        try:
+            return decimal.Decimal(str(db_value)) == decimal.Decimal(str(item_value))
+        except decimal.InvalidOperation:
+            return False
+    if isinstance(db_value, str) and isinstance(item_value, str):
+        return collation_key(db_value) == collation_key(item_value)
+    return value_to_sql_param(db_value) == value_to_sql_param(item_value)
+
+
 def _col_compare(col):
     return col + ' = ' + _col_value_ref(col)
 
@@ -60,6 +100,45 @@ def generate_insert_sql(table_name, cols, item):
     return sql.format(**object_to_sql_params(item))
 
 
+def generate_bulk_insert_sql(table_name, cols, items):
+    """Multi-row version of generate_insert_sql."""
+    sql = 'INSERT INTO {}'.format(_tbl_name_ref(table_name))
+    sql += ' (' + ', '.join(map(_col_name_ref, cols)) + ')'
+    row_template = '(' + ', '.join(map(_col_value_ref, cols)) + ')'
+    sql += ' VALUES ' + ', '.join(row_template.format(**object_to_sql_params(i)) for i in items)
+    return sql
+
+
+def generate_bulk_update_sql(table_name, key_col, cols, items):
+    """Multi-row UPDATE of cols, picking each row's new value with a CASE on key_col.
+
+    Unlike INSERT ... ON DUPLICATE KEY UPDATE this never tries to insert, so it works
+    under strict mode when the table has NOT NULL columns that aren't being written.
+    """
+    params = [object_to_sql_params(i) for i in items]
+    key_ref = _col_name_ref(key_col)
+    sql = 'UPDATE {} SET '.format(_tbl_name_ref(table_name))
+    sql += ', '.join('{} = CASE {} {} END'.format(
+        _col_name_ref(c), key_ref,
+        ' '.join('WHEN {} THEN {}'.format(p[key_col], p[c]) for p in params)) for c in cols)
+    sql += ' WHERE {} IN ({})'.format(key_ref, ', '.join(p[key_col] for p in params))
+    return sql
+
+
+def generate_keyed_select_sql(table_name, cols, key_cols, key_values):
+    """Selects cols for every row whose key_cols match one of the key_values tuples."""
+    sql = 'SELECT {} FROM {}'.format(', '.join(map(_col_name_ref, cols)), _tbl_name_ref(table_name))
+    if len(key_cols) == 1:
+        sql += ' WHERE {} IN ({})'.format(
+            _col_name_ref(key_cols[0]),
+            ', '.join(value_to_sql_param(v[0]) for v in key_values))
+    else:
+        sql += ' WHERE ({}) IN ({})'.format(
+            ', '.join(map(_col_name_ref, key_cols)),
+            ', '.join('(' + ', '.join(map(value_to_sql_param, v)) + ')' for v in key_values))
+    return sql
+
+
 # This could maybe move to a class method on SqlItem?
 # Fix usage in load_x_object in db_util.
 def process_col_mappings(obj_type, d, reverse=False):
@@ -96,6 +175,8 @@ def full_columns(o: 'SqlItem', remove_cols=[], add_cols=[]):
 def dump_helper(x):
     if isinstance(x, Enum):
         return str(x)
+    elif isinstance(x, pad_util.JsonSlotsEncodable):
+        return x.to_dict()
     elif hasattr(x, '__dict__'):
         return vars(x)
     else:
@@ -144,6 +225,10 @@ class SqlItem(object):
         """
         return False
 
+    def alternate_key_columns(self):
+        """Columns that identify the row when uses_alternate_key_lookup is true."""
+        return []
+
     def exists_sql(self):
         return key_and_cols_compare(self)
 
@@ -1,4 +1,11 @@
 <?php
+	// Base URL of a running padguide_data_server.py, e.g. "http://127.0.0.1:8081".
+	// When set, table requests are forwarded to it instead of starting python per request.
+	define('DATA_SERVER_URL', '');
+
+	// Directory where serve_padguide_data.py caches encoded responses; disabled if empty.
+	define('RESPONSE_CACHE_DIR', '');
+
 	function fix_table_name($tbl_name) {
 	    $pieces = preg_split('/(?=[A-Z])/', $tbl_name);
 	    $name = $pieces[0];
@@ -8,7 +15,30 @@
 	    return $name;
 	}
 
+	function forward_to_data_server() {
+		$url = DATA_SERVER_URL . "/api/" . basename($_SERVER['SCRIPT_NAME']);
+		if (array_key_exists("plain", $_GET)) {
+			$url = $url . "?plain";
+		}
+
+		$opts = ['http' => [
+			'method' => 'POST',
+			'header' => 'Content-Type: application/x-www-form-urlencoded',
+			'content' => http_build_query($_POST),
+		]];
+		$result = file_get_contents($url, false, stream_context_create($opts));
+		if ($result === false) {
+			return false;
+		}
+		print($result);
+		return true;
+	}
+
 	function serve($tbl_name, $args = []) {
+		if (DATA_SERVER_URL && forward_to_data_server()) {
+			return;
+		}
+
 		$base_path = "/home/tactical0retreat/rpad-cogs-utils/pad_api_data";
 		$script = $base_path . "/padguide/serve_padguide_data.py";
 		$db_config = $base_path . "/db_config.json";
@@ -32,6 +62,10 @@
 			$cmd = $cmd . " --plain";
 		}
 
+		if (RESPONSE_CACHE_DIR) {
+			$cmd = $cmd . " --cache_dir=" . RESPONSE_CACHE_DIR;
+		}
+
 		if (array_key_exists('timelimit', $args)) {
 			$cmd = $cmd . " --timelimit";
         }
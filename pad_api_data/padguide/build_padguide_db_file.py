@@ -1,5 +1,6 @@
 import argparse
 import json
+from multiprocessing import Pool
 import shutil
 
 import pymysql
@@ -59,11 +60,55 @@ TBL_TRUNCATE = [
 ]
 
 
-def encrypt_cols(row):
-    fixed_row = {}
-    for key, value in row.items():
-        fixed_row[key] = encoding.encode(value) if key in ENCRYPTED_COLUMNS else value
-    return fixed_row
+# Rows are read, converted, and inserted this many at a time
+BATCH_SIZE = 5000
+
+# Tables with more rows than this are converted in the worker pool, if there is one
+PARALLEL_MIN_ROWS = 20000
+
+
+def convert_rows(src_tbl, rows):
+    """Fixes up a batch of MySQL rows and encrypts the ENCRYPTED_COLUMNS cells in one call."""
+    fixed_rows = [fix_row(src_tbl, row) for row in rows]
+    cells = [(row, key) for row in fixed_rows for key in row if key in ENCRYPTED_COLUMNS]
+    encrypted_values = encoding.encode_many([row[key] for row, key in cells])
+    for (row, key), value in zip(cells, encrypted_values):
+        row[key] = value
+    return fixed_rows
+
+
+def generate_insert_param_sql(table_name, cols):
+    sql = 'INSERT INTO {}'.format(db_util._tbl_name_ref(table_name))
+    sql += ' (' + ', '.join(map(db_util._col_name_ref, cols)) + ')'
+    sql += ' VALUES (' + ', '.join('?' * len(cols)) + ')'
+    return sql
+
+
+def fetch_batches(cursor):
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        yield rows
+
+
+def insert_rows(sqlite_conn, dest_tbl, dest_cols, rows):
+    """Inserts converted rows with one executemany per run of rows sharing the same columns.
+
+    Only the columns that also exist in the destination table are written.
+    """
+    batch_cols = None
+    batch_values = []
+    for row in rows:
+        insert_cols = tuple(c for c in row.keys() if c in dest_cols)
+        if insert_cols != batch_cols:
+            if batch_values:
+                sqlite_conn.executemany(generate_insert_param_sql(dest_tbl, batch_cols), batch_values)
+            batch_cols = insert_cols
+            batch_values = []
+        batch_values.append([row[c] for c in insert_cols])
+    if batch_values:
+        sqlite_conn.executemany(generate_insert_param_sql(dest_tbl, batch_cols), batch_values)
 
 
 def parse_args():
@@ -73,6 +118,8 @@ def parse_args():
     inputGroup = parser.add_argument_group("Input")
     inputGroup.add_argument("--db_config", required=True, help="JSON database info")
     inputGroup.add_argument("--base_db", required=True, help="Base SQLite file to work with")
+    inputGroup.add_argument("--workers", type=int, default=1,
+                            help="Processes used to encrypt rows of large tables")
 
     outputGroup = parser.add_argument_group("Output")
     outputGroup.add_argument("--output_file", required=True, help="SQLite file to write to")
@@ -104,13 +151,21 @@ def do_main(args):
     sqlite_conn = lite.connect(output_file, detect_types=lite.PARSE_DECLTYPES, isolation_level=None)
     sqlite_conn.row_factory = lite.Row
     sqlite_conn.execute('pragma foreign_keys=OFF')
+    # The output is rebuilt from scratch on failure, so skip the journal and fsyncs
+    sqlite_conn.execute('pragma journal_mode=OFF')
+    sqlite_conn.execute('pragma synchronous=OFF')
+
+    pool = Pool(args.workers) if args.workers > 1 else None
 
+    sqlite_conn.execute('BEGIN')
     for dest_tbl in TBL_TRUNCATE:
         print('truncating', dest_tbl)
         dest_truncate_sql = 'DELETE FROM {}'.format(dest_tbl)
         sqlite_conn.execute(dest_truncate_sql)
+    sqlite_conn.execute('COMMIT')
 
     for src_tbl, dest_tbl in TBL_MAPPING.items():
+        sqlite_conn.execute('BEGIN')
         dest_truncate_sql = 'DELETE FROM {}'.format(dest_tbl)
         sqlite_conn.execute(dest_truncate_sql)
 
@@ -120,20 +175,27 @@ def do_main(args):
 
         with mysql_conn.cursor() as cursor:
             src_select_sql = 'SELECT * FROM {}'.format(src_tbl)
-            cursor.execute(src_select_sql)
+            row_count = cursor.execute(src_select_sql)
             src_cols = set([desc[0].lower() for desc in cursor.description])
 
             skipped_src_cols = src_cols - dest_cols
             skipped_dest_cols = dest_cols - src_cols
             print("for", src_tbl, 'skipping', skipped_src_cols)
             print("for", dest_tbl, 'skipping', skipped_dest_cols)
-            for row in cursor:
-                fixed_row = fix_row(src_tbl, row)
-                encrypted_row = encrypt_cols(fixed_row)
-                insert_cols = set(encrypted_row.keys()).intersection(map(str.upper, dest_cols))
-                insert_sql = db_util.generate_insert_sql(dest_tbl, insert_cols, encrypted_row)
-                sqlite_conn.execute(insert_sql)
 
+            insert_dest_cols = set(map(str.upper, dest_cols))
+            batches = fetch_batches(cursor)
+            if pool and row_count > PARALLEL_MIN_ROWS:
+                converted_batches = pool.starmap(convert_rows, ((src_tbl, rows) for rows in batches))
+            else:
+                converted_batches = (convert_rows(src_tbl, rows) for rows in batches)
+            for rows in converted_batches:
+                insert_rows(sqlite_conn, dest_tbl, insert_dest_cols, rows)
+        sqlite_conn.execute('COMMIT')
+
+    if pool:
+        pool.close()
+        pool.join()
     sqlite_conn.close()
     mysql_conn.close()
 
@@ -2,30 +2,91 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
+KEY = "201302DNTMYQUEST".encode('utf-8')
+BLOCK_SIZE = 16
 
-def encode(plain_text):
-    backend = default_backend()
-    key = "201302DNTMYQUEST".encode('utf-8')
-    iv = bytes([0] * 16)
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=backend)
-    encryptor = cipher.encryptor()
 
-    padder = padding.PKCS7(128).padder()
-    padded_data = padder.update(plain_text.encode('utf-8')) + padder.finalize()
+def _xor(a, b):
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
 
-    msg_encrypted = encryptor.update(padded_data) + encryptor.finalize()
-    return msg_encrypted.hex()
 
+def _pad(data):
+    pad_len = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return data + bytes([pad_len]) * pad_len
 
-def decode(hex_text):
-    backend = default_backend()
-    key = "201302DNTMYQUEST".encode('utf-8')
-    iv = bytes([0] * 16)
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=backend)
-    decryptor = cipher.decryptor()
-    hex_array = bytearray.fromhex(hex_text)
-    msg_bytes = decryptor.update(bytes(hex_array)) + decryptor.finalize()
+
+def _unpad(data):
     unpadder = padding.PKCS7(128).unpadder()
-    msg_bytes = unpadder.update(msg_bytes) + unpadder.finalize()
-    msg_string = msg_bytes.decode('utf-8')
-    return msg_string
+    return unpadder.update(data) + unpadder.finalize()
+
+
+class PadGuideCodec(object):
+    """AES-CBC with a zero IV, as used by PadGuide for encoded columns and responses.
+
+    The key schedule is set up once. decode_many decrypts a whole list in one ECB call, since
+    CBC decryption only needs the cipher blocks, which are all known up front.
+    """
+
+    def __init__(self, key: bytes=KEY):
+        self.cbc = Cipher(algorithms.AES(key), modes.CBC(bytes(BLOCK_SIZE)),
+                          backend=default_backend())
+        self.ecb = Cipher(algorithms.AES(key), modes.ECB(), backend=default_backend())
+
+    def encode(self, plain_text):
+        encryptor = self.cbc.encryptor()
+        msg_encrypted = encryptor.update(_pad(plain_text.encode('utf-8'))) + encryptor.finalize()
+        return msg_encrypted.hex()
+
+    def decode(self, hex_text):
+        decryptor = self.cbc.decryptor()
+        msg_bytes = decryptor.update(bytes.fromhex(hex_text)) + decryptor.finalize()
+        return _unpad(msg_bytes).decode('utf-8')
+
+    def encode_many(self, plain_texts):
+        # CBC encryption is sequential within a value, so this is just a loop over the
+        # cached cipher; chaining blocks across values in Python is slower
+        cbc = self.cbc
+        results = []
+        for plain_text in plain_texts:
+            encryptor = cbc.encryptor()
+            msg_encrypted = encryptor.update(_pad(plain_text.encode('utf-8'))) + encryptor.finalize()
+            results.append(msg_encrypted.hex())
+        return results
+
+    def decode_many(self, hex_texts):
+        encrypted = [bytes.fromhex(t) for t in hex_texts]
+        for idx, e in enumerate(encrypted):
+            # A partial block would shift every later value out of alignment
+            if not e or len(e) % BLOCK_SIZE:
+                raise ValueError('value {} is not a whole number of blocks: {!r}'.format(
+                    idx, hex_texts[idx]))
+        decryptor = self.ecb.decryptor()
+        decrypted = decryptor.update(b''.join(encrypted)) + decryptor.finalize()
+
+        results = []
+        offset = 0
+        for e in encrypted:
+            # CBC: each plain block is the decrypted block xor the previous cipher block
+            msg_bytes = _xor(decrypted[offset:offset + len(e)], bytes(BLOCK_SIZE) + e[:-BLOCK_SIZE])
+            offset += len(e)
+            results.append(_unpad(msg_bytes).decode('utf-8'))
+        return results
+
+
+_default_codec = PadGuideCodec()
+
+
+def encode(plain_text):
+    return _default_codec.encode(plain_text)
+
+
+def decode(hex_text):
+    return _default_codec.decode(hex_text)
+
+
+def encode_many(plain_texts):
+    return _default_codec.encode_many(plain_texts)
+
+
+def decode_many(hex_texts):
+    return _default_codec.decode_many(hex_texts)
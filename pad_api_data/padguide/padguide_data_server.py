@@ -0,0 +1,206 @@
+"""
+Long-lived replacement for serve.php shelling out to serve_padguide_data.py.
+
+Keeps a small pool of MySQL connections open and serves the api/*.jsp table
+endpoints over WSGI. Responses are byte-identical to what serve.php returns.
+Only the endpoints that exist in api/ are served: the ones that require serve.php
+read their table, the rest are static files returned as-is.
+
+Run standalone (threaded wsgiref server), or point any WSGI container at `application`
+after calling `configure`.
+"""
+import argparse
+import json
+import os
+import queue
+import re
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import make_server, WSGIServer
+
+from response_cache import ResponseCache, cache_key
+from serve_padguide_data import connect, extract_tstamp, format_response, load_file_json
+from serve_padguide_data import load_from_connection
+
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api')
+
+# Per-endpoint arguments, copied from the matching api/*.jsp files.
+# Endpoints not listed here serve their table with no extra args.
+ENDPOINT_ARGS = {
+    'getTimestamp': {'map_key': 'table', 'map_value': 'tstamp'},
+    'scheduleList': {'limit_tstamp': True},
+    'getNewestDB': {'raw_file': os.path.join(API_DIR, 'getNewestDB.json')},
+}
+
+_JSP_PATH_RE = re.compile(r'^/(?:api/)?(\w+)\.jsp$')
+
+
+def load_endpoints(api_dir: str):
+    """Returns the table endpoint names and the static endpoint bodies found in api_dir."""
+    table_endpoints = set()
+    static_endpoints = {}
+    for file_name in sorted(os.listdir(api_dir)):
+        endpoint, ext = os.path.splitext(file_name)
+        if ext != '.jsp':
+            continue
+        with open(os.path.join(api_dir, file_name), 'rb') as f:
+            contents = f.read()
+        if b"require 'serve.php'" in contents:
+            table_endpoints.add(endpoint)
+        else:
+            static_endpoints[endpoint] = contents
+    return table_endpoints, static_endpoints
+
+
+def fix_table_name(endpoint):
+    """Python version of fix_table_name in serve.php (camelCase -> snake_case)."""
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', endpoint).lower()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serves PadGuide database data", add_help=False)
+
+    inputGroup = parser.add_argument_group("Input")
+    inputGroup.add_argument("--db_config", required=True, help="JSON database info")
+    inputGroup.add_argument("--host", default='127.0.0.1', help="Interface to listen on")
+    inputGroup.add_argument("--port", type=int, default=8081, help="Port to listen on")
+    inputGroup.add_argument("--pool_size", type=int, default=4, help="Number of MySQL connections")
+    inputGroup.add_argument("--no_cache", action='store_true', help="Disable the response cache")
+    inputGroup.add_argument("--cache_entries", type=int, default=256,
+                            help="Max responses held in memory")
+    inputGroup.add_argument("--cache_dir", help="Optional directory to persist cached responses")
+
+    helpGroup = parser.add_argument_group("Help")
+    helpGroup.add_argument("-h", "--help", action="help",
+                           help="Displays this help message and exits.")
+    return parser.parse_args()
+
+
+class ConnectionPool(object):
+    """Fixed-size pool of MySQL connections, reconnected lazily if they drop."""
+
+    def __init__(self, db_config, size: int):
+        self.db_config = db_config
+        self.connections = queue.Queue()
+        for _ in range(size):
+            self.connections.put(None)
+
+    def acquire(self):
+        connection = self.connections.get()
+        if connection is None:
+            # Autocommit, otherwise a pooled connection keeps serving its first snapshot
+            connection = connect(self.db_config, autocommit=True)
+        else:
+            connection.ping(reconnect=True)
+        return connection
+
+    def release(self, connection, broken=False):
+        if broken:
+            try:
+                connection.close()
+            except Exception:
+                pass
+            connection = None
+        self.connections.put(connection)
+
+
+class PadGuideDataServer(object):
+    def __init__(self, pool: ConnectionPool, cache: ResponseCache=None, api_dir: str=API_DIR):
+        self.pool = pool
+        self.cache = cache
+        self.table_endpoints, self.static_endpoints = load_endpoints(api_dir)
+
+    def render(self, endpoint, data_arg=None, plain=False):
+        endpoint_args = ENDPOINT_ARGS.get(endpoint, {})
+        no_items = endpoint_args.get('no_items', False)
+        if 'raw_file' in endpoint_args:
+            data = load_file_json(endpoint_args['raw_file'])
+            return format_response(data, no_items, plain) + '\n'
+
+        connection = self.pool.acquire()
+        try:
+            response = self.render_table(connection, fix_table_name(endpoint),
+                                         data_arg, plain, endpoint_args)
+        except Exception:
+            self.pool.release(connection, broken=True)
+            raise
+        self.pool.release(connection)
+        return response
+
+    def render_table(self, connection, db_table, data_arg, plain, endpoint_args):
+        no_items = endpoint_args.get('no_items', False)
+        limit_tstamp = endpoint_args.get('limit_tstamp', False)
+
+        key = None
+        # Time-limited responses depend on the current time, so they can't be cached
+        if self.cache and not limit_tstamp:
+            client_tstamp = extract_tstamp(data_arg) if data_arg else None
+            table_version = self.cache.table_version(connection, db_table)
+            key = cache_key(db_table, client_tstamp, table_version, plain, no_items)
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+
+        data = load_from_connection(connection, db_table, data_arg,
+                                    endpoint_args.get('map_key'),
+                                    endpoint_args.get('map_value'),
+                                    limit_tstamp)
+        response = format_response(data, no_items, plain) + '\n'
+        if self.cache:
+            self.cache.put(key, response)
+        return response
+
+    def __call__(self, environ, start_response):
+        match = _JSP_PATH_RE.match(environ.get('PATH_INFO', ''))
+        endpoint = match.group(1) if match else None
+        if endpoint in self.static_endpoints:
+            body = self.static_endpoints[endpoint]
+            start_response('200 OK', [('Content-Type', 'text/html; charset=UTF-8'),
+                                      ('Content-Length', str(len(body)))])
+            return [body]
+        if endpoint not in self.table_endpoints:
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'not found']
+
+        get_args = parse_qs(environ.get('QUERY_STRING', ''), keep_blank_values=True)
+        post_args = {}
+        if environ.get('REQUEST_METHOD') == 'POST':
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            post_args = parse_qs(environ['wsgi.input'].read(length).decode('utf-8'),
+                                 keep_blank_values=True)
+        data_arg = post_args.get('data', [None])[0]
+
+        body = self.render(endpoint, data_arg, plain='plain' in get_args).encode('utf-8')
+        start_response('200 OK', [('Content-Type', 'text/html; charset=UTF-8'),
+                                  ('Content-Length', str(len(body)))])
+        return [body]
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+application = None
+
+
+def configure(db_config, pool_size=4, cache: ResponseCache=None):
+    global application
+    application = PadGuideDataServer(ConnectionPool(db_config, pool_size), cache)
+    return application
+
+
+def main(args):
+    with open(args.db_config) as f:
+        db_config = json.load(f)
+
+    cache = None if args.no_cache else ResponseCache(args.cache_entries, args.cache_dir)
+    app = configure(db_config, args.pool_size, cache)
+    httpd = make_server(args.host, args.port, app, server_class=ThreadingWSGIServer)
+    print('serving on {}:{}'.format(args.host, args.port))
+    httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args)
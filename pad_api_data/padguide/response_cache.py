@@ -0,0 +1,129 @@
+"""
+Cache for fully encoded PadGuide table responses.
+
+Entries are keyed on the table, the client tstamp and the table version (the tstamp
+stored for the table in get_timestamp). When the processor moves that tstamp, every
+entry for the table stops matching and ages out of the cache.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+
+def table_to_internal_name(db_table):
+    """Inverse of the mapping in timestamp_processor (monster_list -> MONSTER)."""
+    if not db_table.lower().endswith('_list'):
+        return None
+    return db_table[:-len('_list')].upper()
+
+
+def load_table_versions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT internal_table, tstamp FROM get_timestamp')
+        return {row['internal_table'].upper(): int(row['tstamp'] or 0) for row in cursor}
+
+
+def cache_key(db_table, client_tstamp, table_version, plain=False, no_items=False):
+    """Builds the cache key, or None if the response can't be cached.
+
+    Any client tstamp newer than the table version selects zero rows, so those all share
+    a single bucket; otherwise the exact tstamp is used.
+    """
+    if table_version is None:
+        return None
+    if client_tstamp is None:
+        tstamp_bucket = -1
+    else:
+        tstamp_bucket = min(client_tstamp, table_version + 1)
+    return (db_table.lower(), tstamp_bucket, table_version, plain, no_items)
+
+
+class ResponseCache(object):
+    def __init__(self, max_entries: int=256, cache_dir: str=None, version_ttl: float=5):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.version_ttl = version_ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.versions = {}
+        self.versions_loaded_at = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def table_version(self, connection, db_table):
+        """Returns the get_timestamp value for a table, refreshing at most every version_ttl."""
+        internal_name = table_to_internal_name(db_table)
+        if internal_name is None:
+            return None
+        if time.time() - self.versions_loaded_at > self.version_ttl:
+            versions = load_table_versions(connection)
+            with self.lock:
+                self.versions = versions
+                self.versions_loaded_at = time.time()
+        return self.versions.get(internal_name)
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        value = self._read_file(key)
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    def put(self, key, value: str):
+        if key is None:
+            return
+        self._store(key, value)
+        self._write_file(key, value)
+
+    def _store(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _file_prefix(self, key):
+        return '{}-{}-'.format(key[0], key[2])
+
+    def _file_path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, self._file_prefix(key) + digest + '.cache')
+
+    def _read_file(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._file_path(key), encoding='utf-8', newline='') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_file(self, key, value):
+        if not self.cache_dir:
+            return
+        # Write to a temp file and rename so concurrent readers never see partial data
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(value)
+        os.replace(tmp_path, self._file_path(key))
+
+        # Drop files left over from older versions of this table
+        table_prefix = key[0] + '-'
+        current_prefix = self._file_prefix(key)
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.startswith(table_prefix) and not file_name.startswith(current_prefix):
+                try:
+                    os.remove(os.path.join(self.cache_dir, file_name))
+                except FileNotFoundError:
+                    pass
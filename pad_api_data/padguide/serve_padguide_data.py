@@ -5,6 +5,7 @@ import time
 from encoding import encode, decode
 from extract_utils import dump_table
 import pymysql
+from response_cache import ResponseCache, cache_key
 
 
 def parse_args():
@@ -25,6 +26,7 @@ def parse_args():
 
     inputGroup.add_argument("--timelimit", default=False, action='store_true',
                             help="Limits the timestamp field to 1m")
+    inputGroup.add_argument("--cache_dir", help="Directory of cached encoded responses")
 
     return parser.parse_args()
 
@@ -56,14 +58,17 @@ def map_table(db_table, cursor, map_key, map_value):
     return result
 
 
-def load_from_db(db_config, db_table, data_arg, map_key=None, map_value=None, limit_tstamp=False):
-    connection = pymysql.connect(host=db_config['host'],
-                                 user=db_config['user'],
-                                 password=db_config['password'],
-                                 db=db_config['db'],
-                                 charset=db_config['charset'],
-                                 cursorclass=pymysql.cursors.DictCursor)
+def connect(db_config, autocommit=False):
+    return pymysql.connect(host=db_config['host'],
+                           user=db_config['user'],
+                           password=db_config['password'],
+                           db=db_config['db'],
+                           charset=db_config['charset'],
+                           cursorclass=pymysql.cursors.DictCursor,
+                           autocommit=autocommit)
+
 
+def build_select_sql(db_table, data_arg, limit_tstamp=False):
     sql = 'SELECT * FROM {}'.format(db_table)
     if data_arg:
         tstamp = extract_tstamp(data_arg)
@@ -78,17 +83,55 @@ def load_from_db(db_config, db_table, data_arg, map_key=None, map_value=None, li
             sql += ' AND close_timestamp > UNIX_TIMESTAMP()'
 
         sql += ' ORDER BY tstamp ASC'
+    return sql
 
+
+def load_from_connection(connection, db_table, data_arg, map_key=None, map_value=None, limit_tstamp=False):
+    sql = build_select_sql(db_table, data_arg, limit_tstamp)
     with connection.cursor() as cursor:
         cursor.execute(sql)
 
         if map_key and map_value:
-            data = map_table(db_table, cursor, map_key, map_value)
+            return map_table(db_table, cursor, map_key, map_value)
         else:
-            data = dump_table(db_table, cursor)
+            return dump_table(db_table, cursor)
 
-    connection.close()
-    return data
+
+def load_from_db(db_config, db_table, data_arg, map_key=None, map_value=None, limit_tstamp=False):
+    connection = connect(db_config)
+    try:
+        return load_from_connection(connection, db_table, data_arg, map_key, map_value, limit_tstamp)
+    finally:
+        connection.close()
+
+
+def format_response(data, no_items=False, plain=False):
+    """Returns the response text, exactly as main() prints it (minus the newline)."""
+    if no_items:
+        data = data['items']
+
+    if plain:
+        return json.dumps(data, indent=4)
+    else:
+        return encode_data_response(json.dumps(data))
+
+
+def load_response_cached(db_config, cache_dir, args):
+    connection = connect(db_config)
+    try:
+        cache = ResponseCache(cache_dir=cache_dir, version_ttl=0)
+        client_tstamp = extract_tstamp(args.data_arg) if args.data_arg else None
+        table_version = cache.table_version(connection, args.db_table)
+        key = cache_key(args.db_table, client_tstamp, table_version, args.plain, args.no_items)
+        response = cache.get(key)
+        if response is None:
+            data = load_from_connection(connection, args.db_table, args.data_arg,
+                                        args.map_key, args.map_value, args.timelimit)
+            response = format_response(data, args.no_items, args.plain)
+            cache.put(key, response)
+        return response
+    finally:
+        connection.close()
 
 
 def main(args):
@@ -97,18 +140,15 @@ def main(args):
     elif args.db_config and args.db_table:
         with open(args.db_config) as f:
             db_config = json.load(f)
+        if args.cache_dir and not args.timelimit:
+            print(load_response_cached(db_config, args.cache_dir, args))
+            return
         data = load_from_db(db_config, args.db_table, args.data_arg,
                             args.map_key, args.map_value, args.timelimit)
     else:
         raise RuntimeError('Incorrect arguments')
 
-    if args.no_items:
-        data = data['items']
-
-    if args.plain:
-        print(json.dumps(data, indent=4))
-    else:
-        print(encode_data_response(json.dumps(data)))
+    print(format_response(data, args.no_items, args.plain))
 
 
 if __name__ == "__main__":
@@ -16,12 +16,14 @@ from pad_etl.data import database
 from pad_etl.processor import skill_info, merged_data
 from pad_etl.storage import egg
 from pad_etl.storage import egg_processor
+from pad_etl.storage import incremental_state
 from pad_etl.storage import monster
 from pad_etl.storage import monster_skill
 from pad_etl.storage import skill_data
 from pad_etl.storage import timestamp_processor
 
 from pad_etl.storage.db_util import DbWrapper
+from pad_etl.storage.incremental_state import IncrementalState
 from pad_etl.storage.news import NewsItem
 from pad_etl.storage.schedule_item import ScheduleItem
 
@@ -61,6 +63,12 @@ def parse_args():
                             help="Should we run dev processes")
     inputGroup.add_argument("--input_dir", required=True,
                             help="Path to a folder where the input data is")
+    inputGroup.add_argument("--snapshot_dir", required=False,
+                            help="Caches parsed databases here, reused if the input is unchanged")
+    inputGroup.add_argument("--state_file", required=False,
+                            help="Enables incremental mode; only data changed since the run that wrote this file is diffed")
+    inputGroup.add_argument("--skill_workers", type=int, default=1,
+                            help="Number of processes used to convert skills")
 
     outputGroup = parser.add_argument_group("Output")
     outputGroup.add_argument("--output_dir", required=True,
@@ -219,8 +227,12 @@ def find_dungeon_id(pad_id_to_dungeon_seq, pad_id_ignore, en_name_to_dungeon_id,
     return None
 
 
-def database_diff_events(db_wrapper, database, cross_server_dungeons):
+def database_diff_events(db_wrapper, database, cross_server_dungeons, state: IncrementalState=None):
     filtered_events = filter_events(database.bonuses)
+    state_namespace = 'events_{}'.format(database.pg_server)
+    if state:
+        filtered_events = state.filter_changed(
+            state_namespace, filtered_events, incremental_state.hash_entity)
 
     dungeon_id_to_csd = {csd.dungeon_id: csd for csd in cross_server_dungeons}
     en_name_to_event_id, jp_name_to_event_id = load_event_lookups(db_wrapper)
@@ -230,6 +242,7 @@ def database_diff_events(db_wrapper, database, cross_server_dungeons):
     schedule_events = []
     unmatched_events = []
     debug_events = []
+    processed_events = []
 
     for merged_event in filtered_events:
         if merged_event.bonus.dungeon_floor_id:
@@ -272,6 +285,8 @@ def database_diff_events(db_wrapper, database, cross_server_dungeons):
         schedule_item = ScheduleItem(merged_event, event_id, dungeon_seq)
         if not schedule_item.is_valid():
             fail_logger.debug('skipping item: %s - %s', repr(merged_event), repr(schedule_item))
+            # Invalid items won't change without new data, no need to retry them
+            processed_events.append(merged_event)
             continue
         else:
             debug_events.append((schedule_item, merged_event))
@@ -290,14 +305,33 @@ def database_diff_events(db_wrapper, database, cross_server_dungeons):
             db_wrapper.insert_item(se.insert_sql(next_id))
             next_id += 1
 
+    if state:
+        processed_events.extend(de[1] for de in debug_events)
+        state.mark_processed(state_namespace,
+                             map(incremental_state.hash_entity, processed_events))
+
     print('dumping all events\n')
     for de in debug_events:
         print(repr(de[0]), repr(de[1]))
 
 
 
-def database_diff_cards(db_wrapper, jp_database, na_database):
-    combined_cards = merged_data.build_ownable_cross_server_cards(jp_database, na_database)
+def card_hash(csc: merged_data.CrossServerCard, calc_skills) -> str:
+    """Hash of everything database_diff_cards reads for a card, including computed skill text."""
+    jp_card = csc.jp_card
+    skills = [s for s in [jp_card.active_skill, jp_card.leader_skill] if s]
+    calc_skill_values = [calc_skills.get(s.skill_id) for s in skills]
+    return incremental_state.hash_entity(jp_card, csc.na_card, calc_skill_values)
+
+
+def database_diff_cards(db_wrapper, jp_database, na_database, state: IncrementalState=None):
+    all_combined_cards = merged_data.build_ownable_cross_server_cards(jp_database, na_database)
+    combined_cards = all_combined_cards
+    if state:
+        combined_cards = state.filter_changed(
+            'cards', all_combined_cards,
+            lambda csc: card_hash(csc, jp_database.calc_skills),
+            lambda csc: csc.monster_no)
 
     def insert_or_update(item: monster.SqlItem):
         # Check if the item exists by key
@@ -315,20 +349,20 @@ def database_diff_cards(db_wrapper, jp_database, na_database):
             db_wrapper.insert_item(item.insert_sql())
 
     # Base monster
-    for csc in combined_cards:
-        insert_or_update(monster.MonsterItem(csc.jp_card.card, csc.na_card.card))
+    db_wrapper.bulk_insert_or_update(
+        [monster.MonsterItem(csc.jp_card.card, csc.na_card.card) for csc in combined_cards])
 
     # Monster info
-    for csc in combined_cards:
-        insert_or_update(monster.MonsterInfoItem(csc.jp_card.card, csc.na_card.card))
+    db_wrapper.bulk_insert_or_update(
+        [monster.MonsterInfoItem(csc.jp_card.card, csc.na_card.card) for csc in combined_cards])
 
     # Additional monster info
-    for csc in combined_cards:
-        insert_or_update(monster.MonsterAddInfoItem(csc.jp_card.card))
+    db_wrapper.bulk_insert_or_update(
+        [monster.MonsterAddInfoItem(csc.jp_card.card) for csc in combined_cards])
 
     # Monster prices
-    for csc in combined_cards:
-        insert_or_update(monster.MonsterPriceItem(csc.jp_card.card))
+    db_wrapper.bulk_insert_or_update(
+        [monster.MonsterPriceItem(csc.jp_card.card) for csc in combined_cards])
 
     # Awakenings
     next_awakening_id = db_wrapper.get_single_value(
@@ -366,10 +400,11 @@ def database_diff_cards(db_wrapper, jp_database, na_database):
     # 1) Pull the list of monster_no -> series_id from the DB.
     # 2) For monsters with tsr_seq = 42, find the series of it's ancestor
     # 3) If that monster has a series != 42, apply it and save.
+    # The series fixes depend on other cards' series in the DB, so they always look at every card.
     monster_no_to_series_id = db_wrapper.load_to_key_value(
         'monster_no', 'tsr_seq', 'monster_info_list')  # type Map<int, int>
 
-    for csc in combined_cards:
+    for csc in all_combined_cards:
         if monster_no_to_series_id[csc.monster_no] != 42:
             continue
         ancestor_id = csc.jp_card.card.ancestor_id
@@ -392,7 +427,7 @@ def database_diff_cards(db_wrapper, jp_database, na_database):
         'monster_no', 'tsr_seq', 'monster_info_list')  # type Map<int, int>
 
     group_id_to_cards = defaultdict(list)  # type DefaultDict<GroupId, List[CrossServerCard]>
-    for csc in combined_cards:
+    for csc in all_combined_cards:
         group_id_to_cards[csc.jp_card.card.group_id].append(csc)
 
     group_id_to_series_id = {}  # type Map<int, int
@@ -411,7 +446,7 @@ def database_diff_cards(db_wrapper, jp_database, na_database):
         if series_id is not None:
             group_id_to_series_id[group_id] = series_id
 
-    for csc in combined_cards:
+    for csc in all_combined_cards:
         series_id = monster_no_to_series_id[csc.monster_no]
         if series_id != 42:
             continue
@@ -575,18 +610,28 @@ def database_diff_cards(db_wrapper, jp_database, na_database):
             db_wrapper.insert_item(monster_skill.get_update_monster_skill_ids(
                 merged_card, ts_seq_leader, ts_seq_skill))
 
+    if state:
+        state.mark_processed('cards')
 
-def database_update_egg_machines(db_wrapper, jp_database, na_database):
+
+def database_update_egg_machines(db_wrapper, jp_database, na_database, state: IncrementalState=None):
     loader = egg.EggLoader(db_wrapper)
     loader.hide_outdated_machines()
 
+    egg_machines = jp_database.egg_machines + na_database.egg_machines
+    if state:
+        egg_machines = state.filter_changed(
+            'egg_machines', egg_machines, incremental_state.hash_entity)
+
     processor = egg_processor.EggProcessor()
-    for em_json in jp_database.egg_machines + na_database.egg_machines:
+    for em_json in egg_machines:
         if em_json['end_timestamp'] < time.time():
             print('Skipping machine; looks closed', em_json['clean_name'])
-            continue
-        egg_title_list = processor.convert_from_json(em_json)
-        loader.save_egg_title_list(egg_title_list)
+        else:
+            egg_title_list = processor.convert_from_json(em_json)
+            loader.save_egg_title_list(egg_title_list)
+        if state:
+            state.mark_processed('egg_machines', [incremental_state.hash_entity(em_json)])
 
 
 def database_update_news(db_wrapper):
@@ -632,14 +677,14 @@ def load_data(args):
 
     logger.info('Loading data')
     jp_database = database.Database('jp', input_dir)
-    jp_database.load_database()
+    jp_database.load_database(snapshot_dir=args.snapshot_dir)
 
     na_database = database.Database('na', input_dir)
-    na_database.load_database()
+    na_database.load_database(snapshot_dir=args.snapshot_dir)
 
     if not args.skipintermediate:
         logger.info('Storing intermediate data')
-        calc_skills = skill_info.reformat_json_info(jp_database.raw_skills)
+        calc_skills = skill_info.reformat_json_info(jp_database.raw_skills, args.skill_workers)
         jp_database.calc_skills = calc_skills
         jp_database.save_all(output_dir, args.pretty)
         na_database.save_all(output_dir, args.pretty)
@@ -651,21 +696,9 @@ def load_data(args):
     db_wrapper = DbWrapper(dry_run)
     db_wrapper.connect(db_config)
 
-    cross_server_dungeons = merged_data.build_cross_server_dungeons(jp_database, na_database)
-    logger.info('Starting JP event diff')
-    database_diff_events(db_wrapper, jp_database, cross_server_dungeons)
-
-    logger.info('Starting NA event diff')
-    database_diff_events(db_wrapper, na_database, cross_server_dungeons)
-
-    logger.info('Starting card diff')
-    database_diff_cards(db_wrapper, jp_database, na_database)
-
-    logger.info('Starting egg machine update')
-    try:
-        database_update_egg_machines(db_wrapper, jp_database, na_database)
-    except Exception as ex:
-        print('updating egg machines failed', str(ex))
+    # Always runs; with a state file only the changed entities are diffed
+    state = IncrementalState(args.state_file) if args.state_file else None
+    load_diffs(db_wrapper, jp_database, na_database, state)
 
     logger.info('Starting news update')
     try:
@@ -676,9 +709,31 @@ def load_data(args):
     logger.info('Starting tstamp update')
     timestamp_processor.update_timestamps(db_wrapper)
 
+    # Nothing was written in a dry run, so the state must not advance
+    if state and not dry_run:
+        state.save()
+
     print('done')
 
 
+def load_diffs(db_wrapper, jp_database, na_database, state: IncrementalState=None):
+    cross_server_dungeons = merged_data.build_cross_server_dungeons(jp_database, na_database)
+    logger.info('Starting JP event diff')
+    database_diff_events(db_wrapper, jp_database, cross_server_dungeons, state)
+
+    logger.info('Starting NA event diff')
+    database_diff_events(db_wrapper, na_database, cross_server_dungeons, state)
+
+    logger.info('Starting card diff')
+    database_diff_cards(db_wrapper, jp_database, na_database, state)
+
+    logger.info('Starting egg machine update')
+    try:
+        database_update_egg_machines(db_wrapper, jp_database, na_database, state)
+    except Exception as ex:
+        print('updating egg machines failed', str(ex))
+
+
 if __name__ == '__main__':
     args = parse_args()
     load_data(args)
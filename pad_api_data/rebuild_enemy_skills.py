@@ -4,10 +4,12 @@ Regenerates the flattened enemy skill list for all monsters.
 
 import argparse
 import logging
+from multiprocessing import Pool
 import os
 
 from pad_etl.data import database
 from pad_etl.processor import debug_utils
+from pad_etl.processor import enemy_skillset as ess
 from pad_etl.processor import enemy_skillset_processor
 from pad_etl.processor import enemy_skillset_dump
 from pad_etl.processor import merged_data
@@ -26,6 +28,10 @@ def parse_args():
                             help="Process only this card")
     inputGroup.add_argument("--interactive", required=False,
                             help="Lets you specify a card id on the command line")
+    inputGroup.add_argument("--workers", type=int, default=1,
+                            help="Number of processes to shard cards across")
+    inputGroup.add_argument("--snapshot_dir", required=False,
+                            help="Caches parsed databases here, reused if the input is unchanged")
 
     outputGroup = parser.add_argument_group("Output")
     outputGroup.add_argument("--output_dir", required=True,
@@ -89,9 +95,11 @@ def run(args):
 
     raw_input_dir = os.path.join(args.input_dir, 'raw')
     na_db = database.Database('na', raw_input_dir)
-    na_db.load_database(skip_skills=True, skip_bonus=True, skip_extra=True)
+    na_db.load_database(skip_skills=True, skip_bonus=True, skip_extra=True,
+                        snapshot_dir=args.snapshot_dir)
     jp_db = database.Database('jp', raw_input_dir)
-    jp_db.load_database(skip_skills=True, skip_bonus=True, skip_extra=True)
+    jp_db.load_database(skip_skills=True, skip_bonus=True, skip_extra=True,
+                        snapshot_dir=args.snapshot_dir)
 
     combined_cards = merged_data.build_cross_server_cards(jp_db, na_db)
 
@@ -99,24 +107,41 @@ def run(args):
     if args.interactive:
         fixed_card_id = input("enter a card id:").strip()
 
-    count = 0
-    for csc in combined_cards:
-        merged_card = csc.na_card
-        card = merged_card.card
-        if fixed_card_id and card.card_id != int(fixed_card_id):
-            continue
-        try:
-            count += 1
+    merged_cards = [csc.na_card for csc in combined_cards]
+    if fixed_card_id:
+        merged_cards = [mc for mc in merged_cards if mc.card.card_id == int(fixed_card_id)]
+
+    if args.workers > 1:
+        # Workers get their own copy of the enemy skill lookup; the output files are per-monster
+        # so they never collide.
+        with Pool(args.workers, initializer=_init_worker,
+                  initargs=(args.output_dir, ess.enemy_skill_map)) as pool:
+            results = pool.imap_unordered(process_card_safe, merged_cards, chunksize=16)
+            for count, _ in enumerate(results, 1):
+                if count % 100 == 0:
+                    print('processed {} of {}'.format(count, len(merged_cards)))
+    else:
+        for count, merged_card in enumerate(merged_cards, 1):
             if count % 100 == 0:
-                print('processing {} of {}'.format(count, len(combined_cards)))
-            process_card(merged_card)
+                print('processing {} of {}'.format(count, len(merged_cards)))
+            process_card_safe(merged_card)
 
-        except Exception as ex:
-            print('failed to process', card.name)
-            print(ex)
-            if 'unsupported operation' not in str(ex):
-                import traceback
-                traceback.print_exc()
+
+def _init_worker(output_dir, enemy_skill_map):
+    enemy_skillset_dump.set_data_dir(output_dir)
+    ess.enemy_skill_map = enemy_skill_map
+
+
+def process_card_safe(merged_card: merged_data.MergedCard):
+    card = merged_card.card
+    try:
+        process_card(merged_card)
+    except Exception as ex:
+        print('failed to process', card.name)
+        print(ex)
+        if 'unsupported operation' not in str(ex):
+            import traceback
+            traceback.print_exc()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,69 @@
+"""
+Compares pad_util.parse_skill_multiplier against a golden fixture.
+
+The fixture (testdata/skill_multipliers.json) holds one case per line, either
+[skill_type, other_fields, hp, atk, rcv, shield] or [skill_type, other_fields, error_type].
+It was generated from the if/elif chain that preceded the per-type handler registry, so
+any difference reported here is a behavior change in the multiplier parsing.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from pad_etl.common import pad_util
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Runs the skill multiplier test.", add_help=False)
+    inputGroup = parser.add_argument_group("Input")
+    inputGroup.add_argument("--fixture_file",
+                            default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                 'testdata', 'skill_multipliers.json'),
+                            help="Path to the golden multiplier cases")
+
+    helpGroup = parser.add_argument_group("Help")
+    helpGroup.add_argument("-h", "--help", action="help",
+                           help="Displays this help message and exits.")
+    return parser.parse_args()
+
+
+def compute_case(skill_type, other_fields):
+    try:
+        multipliers = pad_util.parse_skill_multiplier(
+            skill_type, other_fields, len(other_fields))
+        return [multipliers.hp, multipliers.atk, multipliers.rcv, multipliers.shield]
+    except Exception as ex:
+        return [type(ex).__name__]
+
+
+def run_test(args):
+    with open(args.fixture_file) as f:
+        cases = json.load(f)
+
+    failures = []
+    # Run everything twice, the second pass is served from the multiplier cache
+    for _ in range(2):
+        for case in cases:
+            skill_type, other_fields, expected = case[0], case[1], case[2:]
+            actual = compute_case(skill_type, other_fields)
+            if actual != expected:
+                failures.append((skill_type, other_fields, expected, actual))
+
+    print('checked', len(cases), 'cases')
+    if not failures:
+        return
+
+    fail_count = len(failures)
+    disp_count = min(fail_count, 10)
+    print('encountered', fail_count, 'errors, displaying the first', disp_count)
+    for skill_type, other_fields, expected, actual in failures[:disp_count]:
+        print('skill {} {}:\n  expected {}\n  actual   {}'.format(
+            skill_type, other_fields, expected, actual))
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    run_test(args)
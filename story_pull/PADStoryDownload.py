@@ -3,7 +3,6 @@ import json
 import os
 import re
 import sys
-import urllib.request
 
 from collections import defaultdict
 
@@ -19,11 +18,20 @@ inputGroup.add_argument("--tool_dir", required=True, help="Path to decoder tool"
 
 outputGroup = parser.add_argument_group("Output")
 outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
+outputGroup.add_argument("--download_workers", type=int, default=8,
+                         help="Number of concurrent downloads")
 
 helpGroup = parser.add_argument_group("Help")
 helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
 args = parser.parse_args()
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'image_pull'))
+import PADAssetDownloader
+
+# Inserted last so the tool_dir PADTextureTool takes precedence over the image_pull one
+sys.path.insert(0, args.tool_dir)
+import PADTextureTool
+
 server = args.server.lower()
 
 extras = []
@@ -35,23 +43,13 @@ elif args.server == 'jp':
 
 output_dir = args.output_dir
 
-def download_file(url, file_path):
-    response_object = urllib.request.urlopen(url)
-    with response_object as response:
-        file_data = response.read()
-        with open(file_path, "wb") as f:
-            f.write(file_data)
-
-
 def decode_file(in_file, out_file):
-    cmd = 'python3 {}/PADTextureTool.py {} --outfile {}'.format(args.tool_dir, in_file, out_file)
-    print('running', cmd)
-    os.system(cmd)
+    PADTextureTool.decodeFile(in_file, out_file)
 
 def decode_image(in_file, out_dir):
-    cmd = 'python3 {}/PADTextureTool.py {} --outdir {}'.format(args.tool_dir, in_file, out_dir)
-    print('running', cmd)
-    os.system(cmd)
+    settings = PADTextureTool.Settings()
+    settings.setOutputDirectory(out_dir)
+    PADTextureTool.processFile(in_file, settings)
 
 
 print('Found', len(extras), 'extras total')
@@ -73,7 +71,12 @@ os.makedirs(raw_text_dir, exist_ok=True)
 os.makedirs(fixed_image_dir, exist_ok=True)
 os.makedirs(fixed_text_dir, exist_ok=True)
 
+downloader = PADAssetDownloader.AssetDownloader(
+    os.path.join(output_dir, 'download_manifest_{}.json'.format(server)),
+    workers=args.download_workers)
 
+download_jobs = []
+story_files = []
 for extra in extras:
     raw_file_name = extra.file_name
     if raw_file_name.startswith('st_') and raw_file_name.endswith('.txt'):
@@ -90,18 +93,32 @@ for extra in extras:
         print('skipping', raw_file_name)
         continue
 
-    if not os.path.exists(raw_file_path):
-        print('downloading', extra.url, 'to', raw_file_path)
-        download_file(extra.url, raw_file_path)
+    version = PADAssetDownloader.asset_version(extra)
+    if downloader.is_stale(extra.url, raw_file_path, version):
+        download_jobs.append((extra.url, raw_file_path, version))
     else:
         print('raw file exists', raw_file_path)
 
-    if not os.path.exists(fixed_file_path):
+    story_files.append((raw_file_path, fixed_file_path, fixed_file_dir, do_decode_file))
+
+print('downloading', len(download_jobs), 'files')
+updated_jobs, _ = downloader.download_all(download_jobs)
+updated_files = set(job[1] for job in updated_jobs)
+
+for raw_file_path, fixed_file_path, fixed_file_dir, do_decode_file in story_files:
+    if not os.path.exists(raw_file_path):
+        print('Error, download failed:', raw_file_path)
+        continue
+
+    if not os.path.exists(fixed_file_path) or raw_file_path in updated_files:
         print('decoding', raw_file_path, 'to', fixed_file_path)
-        if do_decode_file:
-            decode_file(raw_file_path, fixed_file_path)
-        else:
-            decode_image(raw_file_path, fixed_file_dir)
+        try:
+            if do_decode_file:
+                decode_file(raw_file_path, fixed_file_path)
+            else:
+                decode_image(raw_file_path, fixed_file_dir)
+        except Exception as ex:
+            print('failed to decode', raw_file_path, ex)
     else:
         print('fixed file exists', fixed_file_path)
     
@@ -18,6 +18,7 @@ from __future__ import (absolute_import, division, print_function)
 import argparse
 import io
 import itertools
+import multiprocessing
 import os
 import png
 import re
@@ -153,7 +154,10 @@ class TextureWriter(object):
 		return [conversionTable[(packedPixelValue & bitMask) >> bitShift] for packedPixelValue in texture.packedPixels for bitShift, bitMask, conversionTable in zippedChannelInfo]
 	
 	@classmethod
-	def exportToImageFile(cls, texture, outputFilePath):
+	def exportToImageFile(cls, texture, outputFilePath, trimmingEnabled=None, blackeningEnabled=None):
+		# Per-call settings override the class-wide ones
+		trimmingEnabled = cls.trimmingEnabled if trimmingEnabled is None else trimmingEnabled
+		blackeningEnabled = cls.blackeningEnabled if blackeningEnabled is None else blackeningEnabled
 		binaryFileData = bytes()
 		if texture.encoding == RAW:
 			binaryFileData = texture.buffer
@@ -164,9 +168,9 @@ class TextureWriter(object):
 			flatPixelArray = cls.unpackPixels(texture, targetBitDepth)
 			
 			if texture.encoding.hasAlpha:
-				if cls.trimmingEnabled:
+				if trimmingEnabled:
 					width, height, flatPixelArray = cls.trimTransparentEdges(flatPixelArray, width, height, texture.encoding.channels)
-				if cls.blackeningEnabled:
+				if blackeningEnabled:
 					flatPixelArray = cls.blackenTransparentPixels(flatPixelArray, width, height, texture.encoding.channels)
 			
 			if any(flatPixelArray):
@@ -398,64 +402,106 @@ def getSettingsFromCommandLine():
 	
 	return settings
 
-def getOutputFileName(suggestedFileName):
-	outputFileName = suggestedFileName
-	# If the file is a "monster file" then pad the ID out with extra zeroes.
-	try:
-		prefix, id, suffix = getOutputFileName.monsterFileNameRegex.match(suggestedFileName).groups()
-		outputFileName = prefix + id.zfill(5) + suffix
-	except AttributeError:
-		pass
+# This class picks output file names, avoiding collisions with files it has already named.
+class OutputFileNamer(object):
+	monsterFileNameRegex = re.compile(r'^(MONS_)(\d+)(\..+)$', flags=re.IGNORECASE)
 	
-	# If we've already written a file with this name then add a number to the file name to prevent collisions.
-	try:
-		getOutputFileName.filesWritten[outputFileName] += 1
-		outputFileWithoutExtension, outputFileExtension = os.path.splitext(outputFileName)
-		outputFileName = "{} ({}){}".format(outputFileWithoutExtension, getOutputFileName.filesWritten[outputFileName], outputFileExtension)
-	except KeyError:
-		getOutputFileName.filesWritten[outputFileName] = 0
+	def __init__(self):
+		super(OutputFileNamer, self).__init__()
+		self.filesWritten = dict()
 	
-	return outputFileName
+	def getOutputFileName(self, suggestedFileName):
+		outputFileName = suggestedFileName
+		# If the file is a "monster file" then pad the ID out with extra zeroes.
+		try:
+			prefix, id, suffix = self.monsterFileNameRegex.match(suggestedFileName).groups()
+			outputFileName = prefix + id.zfill(5) + suffix
+		except AttributeError:
+			pass
+		
+		# If we've already written a file with this name then add a number to the file name to prevent collisions.
+		try:
+			self.filesWritten[outputFileName] += 1
+			outputFileWithoutExtension, outputFileExtension = os.path.splitext(outputFileName)
+			outputFileName = "{} ({}){}".format(outputFileWithoutExtension, self.filesWritten[outputFileName], outputFileExtension)
+		except KeyError:
+			self.filesWritten[outputFileName] = 0
+		
+		return outputFileName
 
-getOutputFileName.filesWritten = dict()
-getOutputFileName.monsterFileNameRegex = re.compile(r'^(MONS_)(\d+)(\..+)$', flags=re.IGNORECASE)
+def readInputFile(inputFilePath):
+	if zipfile.is_zipfile(inputFilePath):
+		with zipfile.ZipFile(inputFilePath, 'r') as apkFile:
+			return apkFile.read('assets/DATA001.BIN')
+	
+	with open(inputFilePath, 'rb') as binaryFile:
+		return binaryFile.read()
 
-def main():
-	settings = getSettingsFromCommandLine()
+def decodeFile(inputFilePath, outputFilePath):
+	"""Decodes a single file in 'file decoder' mode."""
+	fileContents = readInputFile(inputFilePath)
+	print("\nDecoding {} to {}... ".format(inputFilePath, outputFilePath))
+	TextureReader.extractFileFromBinaryBlob(fileContents, outputFilePath)
+	return outputFilePath
+
+def processFile(inputFilePath, settings, outputFileNamer=None):
+	"""Extracts the textures from one file, returning the paths that were written."""
+	outputFileNamer = outputFileNamer or OutputFileNamer()
+	outputDirectoryPath = (settings.outputDirectory or os.path.dirname(inputFilePath))
+	fileContents = readInputFile(inputFilePath)
 	
-	TextureWriter.enableTrimming(settings.trimmingEnabled)
-	TextureWriter.enableOptimization(settings.blackeningEnabled)
+	print("\nReading {}... ".format(inputFilePath))
+	textures = list(TextureReader.extractTexturesFromBinaryBlob(fileContents, inputFilePath))
+	print("{} texture{} found.\n".format(str(len(textures)) if any(textures) else "No", "" if len(textures) == 1 else "s"))
 	
-	for inputFilePath in settings.inputFiles:
-		outputDirectoryPath = (settings.outputDirectory or os.path.dirname(inputFilePath))
-		
-		if zipfile.is_zipfile(inputFilePath):
-			with zipfile.ZipFile(inputFilePath, 'r') as apkFile:
-				fileContents = apkFile.read('assets/DATA001.BIN')
+	outputFilePaths = []
+	for texture in textures:
+		outputFileName = outputFileNamer.getOutputFileName(texture.name)
 		
-		else:
-			with open(inputFilePath, 'rb') as binaryFile:
-				fileContents = binaryFile.read()
+		print("  Writing {} ({} x {})...".format(outputFileName, texture.width, texture.height))
+		if texture.encoding in [PVRTC2BPP, PVRTC4BPP]:
+			print("  Warning: {} is encoded using PVR texture compression. This format is not yet supported by the Puzzle & Dragons Texture Tool.".format(outputFileName))
+		print("")
+		outputFilePath = os.path.join(outputDirectoryPath, outputFileName)
+		TextureWriter.exportToImageFile(texture, outputFilePath, settings.trimmingEnabled, settings.blackeningEnabled)
+		outputFilePaths.append(outputFilePath)
+	
+	return outputFilePaths
 
-		if settings.outputFile:
-			print("\nDecoding {} to {}... ".format(inputFilePath, settings.outputFile))
-			TextureReader.extractFileFromBinaryBlob(fileContents, settings.outputFile)
-			return
+def _processFileInWorker(inputFilePath, settings):
+	return processFile(inputFilePath, settings)
 
-		
-		print("\nReading {}... ".format(inputFilePath))
-		textures = list(TextureReader.extractTexturesFromBinaryBlob(fileContents, inputFilePath))
-		print("{} texture{} found.\n".format(str(len(textures)) if any(textures) else "No", "" if len(textures) == 1 else "s"))
-		
-		for texture in textures:
-			outputFileName = getOutputFileName(texture.name)
-			
-			print("  Writing {} ({} x {})...".format(outputFileName, texture.width, texture.height))
-			if texture.encoding in [PVRTC2BPP, PVRTC4BPP]:
-				print("  Warning: {} is encoded using PVR texture compression. This format is not yet supported by the Puzzle & Dragons Texture Tool.".format(outputFileName))
-			print("")
-			outputFilePath = os.path.join(outputDirectoryPath, outputFileName)
-			TextureWriter.exportToImageFile(texture, outputFilePath)
+def processFiles(inputFilePaths, settings, workers=1):
+	"""Extracts the textures from many files in this process, or across a pool of workers.
+	
+	Returns a list with the paths written for each input file, in order. When run serially,
+	output names are de-duplicated across all the files; each worker process only
+	de-duplicates names within a single file.
+	"""
+	if workers > 1:
+		with multiprocessing.Pool(workers) as pool:
+			return pool.starmap(_processFileInWorker, [(path, settings) for path in inputFilePaths])
+	
+	outputFileNamer = OutputFileNamer()
+	return [processFile(path, settings, outputFileNamer) for path in inputFilePaths]
+
+def decodeFiles(inputAndOutputFilePaths, workers=1):
+	"""Decodes many (input, output) file pairs in 'file decoder' mode."""
+	if workers > 1:
+		with multiprocessing.Pool(workers) as pool:
+			return pool.starmap(decodeFile, inputAndOutputFilePaths)
+	
+	return [decodeFile(inputFilePath, outputFilePath) for inputFilePath, outputFilePath in inputAndOutputFilePaths]
+
+def main():
+	settings = getSettingsFromCommandLine()
+	
+	if settings.outputFile:
+		# The output file names a single destination, so only the first input is decoded
+		decodeFiles([(settings.inputFiles[0], settings.outputFile)])
+		return
+	
+	processFiles(settings.inputFiles, settings)
 
 if __name__ == "__main__":
 	main()
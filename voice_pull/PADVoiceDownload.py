@@ -3,12 +3,14 @@ import json
 import os
 import re
 import sys
-import urllib.request
 
 from collections import defaultdict
 
 import padtools
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'image_pull'))
+import PADAssetDownloader
+
 parser = argparse.ArgumentParser(
     description="Downloads P&D voices (and fixed them)", add_help=False)
 
@@ -18,6 +20,8 @@ inputGroup.add_argument("--data_dir", required=True, help="Path to processed pad
 
 outputGroup = parser.add_argument_group("Output")
 outputGroup.add_argument("--output_dir", help="Path to a folder where output should be saved")
+outputGroup.add_argument("--download_workers", type=int, default=8,
+                         help="Number of concurrent downloads")
 
 helpGroup = parser.add_argument_group("Help")
 helpGroup.add_argument("-h", "--help", action="help", help="Displays this help message and exits.")
@@ -34,14 +38,6 @@ elif args.server == 'jp':
 
 output_dir = args.output_dir
 
-def download_file(url, file_path):
-    response_object = urllib.request.urlopen(url)
-    with response_object as response:
-        file_data = response.read()
-        with open(file_path, "wb") as f:
-            f.write(file_data)
-
-
 print('Found', len(extras), 'extras total')
 
 raw_dir = os.path.join(output_dir, 'raw')
@@ -54,7 +50,11 @@ fixed_dir = os.path.join(fixed_dir, server)
 os.makedirs(raw_dir, exist_ok=True)
 os.makedirs(fixed_dir, exist_ok=True)
 
+downloader = PADAssetDownloader.AssetDownloader(
+    os.path.join(output_dir, 'download_manifest_{}.json'.format(server)),
+    workers=args.download_workers)
 
+download_jobs = []
 for extra in extras:
     raw_file_name = extra.file_name
     if not raw_file_name.startswith('padv') or not raw_file_name.endswith('.wav'):
@@ -62,12 +62,16 @@ for extra in extras:
         continue
 
     raw_file_path = os.path.join(raw_dir, raw_file_name)    
-    if os.path.exists(raw_file_path):
+    version = PADAssetDownloader.asset_version(extra)
+    if not downloader.is_stale(extra.url, raw_file_path, version):
         print('file exists', raw_file_path)
         continue
 
-    print('downloading', extra.url, 'to', raw_file_path)
-    download_file(extra.url, raw_file_path)
+    download_jobs.append((extra.url, raw_file_path, version))
+
+print('downloading', len(download_jobs), 'files')
+updated_jobs, _ = downloader.download_all(download_jobs)
+updated_files = set(job[1] for job in updated_jobs)
 
 data_file_path = os.path.join(args.data_dir, '{}_raw_cards.json'.format(server))
 with open(data_file_path) as f:
@@ -88,7 +92,7 @@ for file_name in os.listdir(raw_dir):
     in_file = os.path.join(raw_dir, file_name)
     for card_id in voice_id_to_card_id[file_id]:
         out_file = os.path.join(fixed_dir, '{}.wav'.format(card_id))
-        if os.path.exists(out_file):
+        if os.path.exists(out_file) and in_file not in updated_files:
             continue
 
         cmd = 'sox -t ima -r 44100 -e ima-adpcm -v .5 {} {}'.format(in_file, out_file)